@@ -0,0 +1,307 @@
+"""
+run_benchmarks.py: Microbenchmarks of the OrderBook and MatchEngine hot paths.
+
+Every case runs in-process, without the message bus, on a book pre-filled with a given number of resting
+orders. Each case is timed with the garbage collector paused on several fresh books, keeping the best
+and the median run, then run again on a fresh book under tracemalloc to measure the memory it allocates:
+the peak of the memory allocated while it runs, and the memory still allocated after it (net retained,
+negative when the case frees more than it allocates). Results are saved as JSON, and a previous result
+file can be compared against to catch regressions, on the best run time.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --depths 10,1000,100000,1000000 --output results.json
+    python -m benchmarks.run_benchmarks --output new.json --compare results.json
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from engine.instruments.instrument import Instrument
+from engine.match_engine.match_engine import MatchEngine
+from engine.message_bus.local_message_bus import LocalMessageBus
+from engine.orders.order import Order
+from engine.requests.add_order_request import AddOrderRequest
+from engine.requests.cancel_order_request import CancelOrderRequest
+from engine.requests.order_book_snapshot_request import OrderBookSnapshotRequest
+
+# Resting orders are spread over up to MAX_LEVELS price levels per side, bids at and below BEST_BID
+# and asks at and above BEST_ASK (in ticks of 0.01, inside the price band used by the ladder book)
+BEST_BID = 99999
+BEST_ASK = 100000
+MAX_LEVELS = 1000
+
+
+def make_engine(book_type: str) -> MatchEngine:
+    instrument = Instrument(tick_size=0.01, reference_price=1000.0, price_band=0.5)
+    return MatchEngine(LocalMessageBus(sink=lambda event: None), instrument, book_type=book_type)
+
+
+def fill_book(engine: MatchEngine, orders: int, sides=("buy", "sell")) -> None:
+    """
+    Rests orders of quantity 1 round-robin over the sides and over min(orders, MAX_LEVELS) levels per side,
+    with order_ids from 1 to orders.
+    """
+    book = engine.order_book
+    levels = max(1, min(orders // len(sides), MAX_LEVELS))
+    for i in range(orders):
+        side = sides[i % len(sides)]
+        level = (i // len(sides)) % levels
+        price = BEST_BID - level if side == "buy" else BEST_ASK + level
+        book.add_order(Order.trusted(i + 1, side, 1, price))
+    book.pop_changed_levels()
+
+
+def case_add_order(book_type: str, depth: int, ops: int, cancel_ratio: float) -> Callable:
+    engine = make_engine(book_type)
+    fill_book(engine, depth)
+    levels = max(1, min(depth // 2, MAX_LEVELS))
+    rng = random.Random(1)
+    orders = [Order.trusted(depth + i + 1, "buy", 1, BEST_BID - rng.randrange(levels)) for i in range(ops)]
+    add_order = engine.order_book.add_order
+    return lambda: [add_order(order) for order in orders]
+
+
+def case_delete_order(book_type: str, depth: int, ops: int, cancel_ratio: float) -> Callable:
+    engine = make_engine(book_type)
+    fill_book(engine, depth + ops)
+    order_ids = random.Random(1).sample(range(1, depth + ops + 1), ops)
+    delete_order = engine.order_book.delete_order
+    return lambda: [delete_order(order_id) for order_id in order_ids]
+
+
+def case_remove_best_bid(book_type: str, depth: int, ops: int, cancel_ratio: float) -> Callable:
+    engine = make_engine(book_type)
+    fill_book(engine, depth + ops, sides=("buy",))
+    remove_best_bid = engine.order_book.remove_best_bid
+    return lambda: [remove_best_bid() for _ in range(ops)]
+
+
+def case_remove_best_ask(book_type: str, depth: int, ops: int, cancel_ratio: float) -> Callable:
+    engine = make_engine(book_type)
+    fill_book(engine, depth + ops, sides=("sell",))
+    remove_best_ask = engine.order_book.remove_best_ask
+    return lambda: [remove_best_ask() for _ in range(ops)]
+
+
+def case_cross_limit(book_type: str, depth: int, ops: int, cancel_ratio: float) -> Callable:
+    # Every incoming buy crosses the spread and fills one resting ask
+    engine = make_engine(book_type)
+    fill_book(engine, depth + ops, sides=("sell",))
+    orders = [Order.trusted(depth + ops + i + 1, "buy", 1, BEST_ASK + MAX_LEVELS) for i in range(ops)]
+    process_limit_order = engine.process_limit_order
+    return lambda: [process_limit_order(order) for order in orders]
+
+
+def case_market_order(book_type: str, depth: int, ops: int, cancel_ratio: float) -> Callable:
+    # Every incoming market buy sweeps ten resting asks
+    engine = make_engine(book_type)
+    fill_book(engine, depth + 10 * ops, sides=("sell",))
+    requests = [AddOrderRequest(depth + 10 * ops + i + 1, "buy", 10, None) for i in range(ops)]
+    process = engine.process
+    return lambda: [process(request) for request in requests]
+
+
+def case_mixed_flow(book_type: str, depth: int, ops: int, cancel_ratio: float) -> Callable:
+    # Passive adds and cancels of resting orders, cancel_ratio of the requests being cancels
+    engine = make_engine(book_type)
+    fill_book(engine, depth)
+    levels = max(1, min(depth // 2, MAX_LEVELS))
+    rng = random.Random(1)
+    live = list(range(1, depth + 1))
+    requests = []
+    for i in range(ops):
+        if live and rng.random() < cancel_ratio:
+            order_id = live.pop(rng.randrange(len(live)))
+            requests.append(CancelOrderRequest(order_id, "buy", 1, 1.0))
+        else:
+            order_id = depth + i + 1
+            side = rng.choice(("buy", "sell"))
+            ticks = BEST_BID - rng.randrange(levels) if side == "buy" else BEST_ASK + rng.randrange(levels)
+            requests.append(AddOrderRequest(order_id, side, 1, ticks / 100))
+            live.append(order_id)
+    process = engine.process
+    return lambda: [process(request) for request in requests]
+
+
+def case_snapshot(book_type: str, depth: int, ops: int, cancel_ratio: float) -> Callable:
+    engine = make_engine(book_type)
+    fill_book(engine, depth)
+    request = OrderBookSnapshotRequest()
+    process = engine.process
+    return lambda: [process(request) for _ in range(ops)]
+
+
+def case_snapshot_top10(book_type: str, depth: int, ops: int, cancel_ratio: float) -> Callable:
+    engine = make_engine(book_type)
+    fill_book(engine, depth)
+    request = OrderBookSnapshotRequest(depth=10)
+    process = engine.process
+    return lambda: [process(request) for _ in range(ops)]
+
+
+CASES: Dict[str, Callable] = {
+    "add_order": case_add_order,
+    "delete_order": case_delete_order,
+    "remove_best_bid": case_remove_best_bid,
+    "remove_best_ask": case_remove_best_ask,
+    "cross_limit": case_cross_limit,
+    "market_order": case_market_order,
+    "mixed_flow": case_mixed_flow,
+    "snapshot": case_snapshot,
+    "snapshot_top10": case_snapshot_top10,
+}
+
+# Cases whose result depends on the cancel ratio, the others are run once per depth
+CANCEL_RATIO_CASES = ("mixed_flow",)
+
+
+def measure(case: Callable, book_type: str, depth: int, ops: int, cancel_ratio: float, repeat: int = 5) -> Dict:
+    """
+    Times one case on repeat fresh setups, then measures its allocations on one more.
+
+    Returns:
+        Dict: ns_per_op of the best run and median_ns_per_op, the peak bytes allocated per op during the
+        run, and the net bytes and memory blocks still allocated per op after it.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    timings = []
+    try:
+        for _ in range(repeat):
+            # Free the previous setup before building the next one
+            run = None
+            gc.collect()
+            run = case(book_type, depth, ops, cancel_ratio)
+            start = time.perf_counter_ns()
+            run()
+            timings.append(time.perf_counter_ns() - start)
+
+        run = None
+        gc.collect()
+        run = case(book_type, depth, ops, cancel_ratio)
+        blocks = sys.getallocatedblocks()
+        tracemalloc.start()
+        run()
+        allocated, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        blocks = sys.getallocatedblocks() - blocks
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    timings.sort()
+    return {
+        "ns_per_op": timings[0] / ops,
+        "median_ns_per_op": timings[len(timings) // 2] / ops,
+        "peak_bytes_per_op": peak / ops,
+        "retained_bytes_per_op": allocated / ops,
+        "retained_blocks_per_op": blocks / ops,
+    }
+
+
+def run_suite(cases: List[str], depths: List[int], cancel_ratios: List[float], ops: int, book_type: str, repeat: int = 5) -> List[Dict]:
+    results = []
+    for name in cases:
+        for depth in depths:
+            for cancel_ratio in (cancel_ratios if name in CANCEL_RATIO_CASES else [0.0]):
+                case_ops = ops if not name.startswith("snapshot") else max(1, min(ops, 100))
+                result = {"case": name, "book_type": book_type, "depth": depth, "cancel_ratio": cancel_ratio, "ops": case_ops, "repeat": repeat}
+                try:
+                    result.update(measure(CASES[name], book_type, depth, case_ops, cancel_ratio, repeat))
+                except Exception as error:
+                    result["error"] = f"{type(error).__name__}: {error}"
+                results.append(result)
+                print(format_result(result), flush=True)
+    return results
+
+
+def format_result(result: Dict) -> str:
+    label = f"{result['case']:<16} {result['book_type']:<11} depth {result['depth']:>8} cancel {result['cancel_ratio']:.2f}"
+    if "error" in result:
+        return f"{label}  ERROR {result['error']}"
+    return (f"{label}  {result['ns_per_op']:>10.0f} ns/op (median {result['median_ns_per_op']:>10.0f}) {result['peak_bytes_per_op']:>8.1f} peak B/op"
+            f" {result['retained_blocks_per_op']:>7.2f} net retained blocks/op")
+
+
+def result_key(result: Dict):
+    return result["case"], result["book_type"], result["depth"], result["cancel_ratio"]
+
+
+def compare(results: List[Dict], baseline: List[Dict], threshold: float) -> bool:
+    """
+    Prints the change of every case against a baseline run, comparing the best run times.
+
+    Returns:
+        bool: True if no case got slower by more than the threshold.
+    """
+    previous = {result_key(result): result for result in baseline}
+    passed = True
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None or "error" in result or "error" in old:
+            continue
+        change = result["ns_per_op"] / old["ns_per_op"] - 1
+        regression = change > threshold
+        passed = passed and not regression
+        print(f"{format_result(result)}  {change:+7.1%}{'  REGRESSION' if regression else ''}")
+    return passed
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmarks of the OrderBook and MatchEngine hot paths")
+    parser.add_argument("--cases", type=str, default=",".join(CASES), help=f"Comma separated cases [ {' | '.join(CASES)} ]")
+    parser.add_argument("--depths", type=str, default="10,1000,100000", help="Comma separated numbers of resting orders, up to 1000000")
+    parser.add_argument("--cancel-ratios", type=str, default="0.0,0.5,0.9", help="Comma separated shares of cancels in the mixed flow")
+    parser.add_argument("--ops", type=int, default=10000, help="Operations per case")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case on fresh setups, the best one is reported")
+    parser.add_argument("--book-type", type=str, default="price_level", choices=["price_level", "ladder"], help="The order book implementation")
+    parser.add_argument("--output", type=str, help="Save the results to this JSON file")
+    parser.add_argument("--compare", type=str, help="Compare against the results of a previous run saved as JSON")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown counted as a regression by --compare (0.1 for 10%%)")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    results = run_suite(
+        args.cases.split(","),
+        [int(depth) for depth in args.depths.split(",")],
+        [float(ratio) for ratio in args.cancel_ratios.split(",")],
+        args.ops,
+        args.book_type,
+        args.repeat,
+    )
+
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump({
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.time(),
+                "results": results,
+            }, stream, indent=2)
+
+    if args.compare:
+        with open(args.compare) as stream:
+            baseline = json.load(stream)["results"]
+        print()
+        if not compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+class DepthUpdate:
+    """
+    Represents a change of one price level of the order book (level 2 market data).
+
+    Updates of a symbol are numbered by a sequence that increases by one per update, and snapshots
+    carry the sequence of the last update they include, so a consumer can apply exactly the updates
+    that follow its snapshot and detect any gap.
+
+    Attributes:
+        side (str): The side of the level, either "buy" or "sell".
+        price (int): The price of the level in ticks.
+        quantity (int): The new aggregate quantity at the level, 0 once the level is gone.
+        sequence (int): The sequence number of the update within its symbol.
+        symbol (str): Symbol of the instrument.
+    """
+
+    __slots__ = ("side", "price", "quantity", "sequence", "symbol")
+
+    def __init__(self, side: str, price: int, quantity: int, sequence: int, symbol: str = "DEFAULT"):
+        """
+        Initialize a new DepthUpdate instance.
+
+        Args:
+            side (str): The side of the level, either "buy" or "sell".
+            price (int): The price of the level in ticks.
+            quantity (int): The new aggregate quantity at the level, 0 once the level is gone.
+            sequence (int): The sequence number of the update within its symbol.
+            symbol (str): Symbol of the instrument.
+
+        Raises:
+            TypeError: if any argument has an incorrect type.
+            ValueError: if the side is unknown.
+        """
+        if side not in ("buy", "sell"):
+            raise ValueError("side must be 'buy' or 'sell'")
+
+        if not isinstance(price, int) or not isinstance(quantity, int) or not isinstance(sequence, int):
+            raise TypeError("price, quantity and sequence must be integers")
+
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.sequence = sequence
+        self.symbol = symbol
+
+    @classmethod
+    def trusted(cls, side: str, price: int, quantity: int, sequence: int, symbol: str = "DEFAULT") -> "DepthUpdate":
+        """
+        Create a new DepthUpdate without type checks, for events built by the engine itself.
+
+        Args:
+            side (str): The side of the level, either "buy" or "sell".
+            price (int): The price of the level in ticks.
+            quantity (int): The new aggregate quantity at the level.
+            sequence (int): The sequence number of the update within its symbol.
+            symbol (str): Symbol of the instrument.
+
+        Returns:
+            DepthUpdate: The new instance.
+        """
+        instance = cls.__new__(cls)
+        instance.side = side
+        instance.price = price
+        instance.quantity = quantity
+        instance.sequence = sequence
+        instance.symbol = symbol
+        return instance
@@ -0,0 +1,29 @@
+from typing import Dict
+
+
+class EngineStatsEvent:
+    """
+    Represents the latency histograms and counters of a MatchEngine, in answer to an EngineStatsRequest
+
+    Attributes:
+        shard (int): The shard of the engine.
+        stats (Dict): The statistics of the engine (see MatchEngine.stats_summary), empty sections left out.
+        symbol (str): Symbol of the request that asked for them.
+    """
+
+    __slots__ = ("shard", "stats", "symbol")
+
+    def __init__(self, shard: int, stats: Dict, symbol: str = "DEFAULT"):
+
+        """
+        Initialize a new EngineStatsEvent
+
+        Args:
+            shard (int): The shard of the engine.
+            stats (Dict): The statistics of the engine.
+            symbol (str): Symbol of the request that asked for them.
+        """
+
+        self.shard = shard
+        self.stats = stats
+        self.symbol = symbol
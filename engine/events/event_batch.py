@@ -0,0 +1,23 @@
+from typing import List
+
+
+class EventBatch:
+    """
+    Represents a batch of events published as a single message on the message bus
+
+    Attributes:
+        events (List): The events in the order they were emitted.
+    """
+
+    __slots__ = ("events",)
+
+    def __init__(self, events: List):
+
+        """
+        Initialize a new EventBatch instance.
+
+        Args:
+            events (List): The events in the order they were emitted.
+        """
+
+        self.events = events
@@ -0,0 +1,77 @@
+class ExecutionEvent:
+    """
+    Represents one match between an incoming order and a resting order: the trade and the fill of both
+    orders in a single message.
+
+    Attributes:
+        aggressor_id (int): Unique identifier of the incoming order.
+        resting_id (int): Unique identifier of the resting order it matched.
+        price (int): Execution price in ticks, the price of the resting order.
+        quantity (int): Executed quantity.
+        aggressor_remaining (int): Quantity of the incoming order left to match after this execution.
+        resting_remaining (int): Quantity of the resting order left in the book after this execution, 0 when it is filled.
+        sequence (int): Sequence number of the execution in the instrument's book, without gaps.
+        symbol (str): Symbol of the instrument.
+    """
+
+    __slots__ = ("aggressor_id", "resting_id", "price", "quantity", "aggressor_remaining", "resting_remaining", "sequence", "symbol")
+
+    def __init__(self, aggressor_id: int, resting_id: int, price: int, quantity: int, aggressor_remaining: int, resting_remaining: int, sequence: int, symbol: str = "DEFAULT"):
+        """
+        Initialize a new ExecutionEvent instance.
+
+        Args:
+            aggressor_id (int): Unique identifier of the incoming order.
+            resting_id (int): Unique identifier of the resting order it matched.
+            price (int): Execution price in ticks.
+            quantity (int): Executed quantity.
+            aggressor_remaining (int): Quantity of the incoming order left to match.
+            resting_remaining (int): Quantity of the resting order left in the book.
+            sequence (int): Sequence number of the execution in the instrument's book.
+            symbol (str): Symbol of the instrument.
+
+        Raises:
+            TypeError: if any argument has an incorrect type.
+        """
+        for name, value in (("aggressor_id", aggressor_id), ("resting_id", resting_id), ("price", price), ("quantity", quantity),
+                            ("aggressor_remaining", aggressor_remaining), ("resting_remaining", resting_remaining), ("sequence", sequence)):
+            if not isinstance(value, int):
+                raise TypeError(f"{name} must be an integer")
+
+        self.aggressor_id = aggressor_id
+        self.resting_id = resting_id
+        self.price = price
+        self.quantity = quantity
+        self.aggressor_remaining = aggressor_remaining
+        self.resting_remaining = resting_remaining
+        self.sequence = sequence
+        self.symbol = symbol
+
+    @classmethod
+    def trusted(cls, aggressor_id: int, resting_id: int, price: int, quantity: int, aggressor_remaining: int, resting_remaining: int, sequence: int, symbol: str = "DEFAULT") -> "ExecutionEvent":
+        """
+        Create a new ExecutionEvent without type checks, for events built by the engine itself.
+
+        Args:
+            aggressor_id (int): Unique identifier of the incoming order.
+            resting_id (int): Unique identifier of the resting order it matched.
+            price (int): Execution price in ticks.
+            quantity (int): Executed quantity.
+            aggressor_remaining (int): Quantity of the incoming order left to match.
+            resting_remaining (int): Quantity of the resting order left in the book.
+            sequence (int): Sequence number of the execution in the instrument's book.
+            symbol (str): Symbol of the instrument.
+
+        Returns:
+            ExecutionEvent: The new instance.
+        """
+        instance = cls.__new__(cls)
+        instance.aggressor_id = aggressor_id
+        instance.resting_id = resting_id
+        instance.price = price
+        instance.quantity = quantity
+        instance.aggressor_remaining = aggressor_remaining
+        instance.resting_remaining = resting_remaining
+        instance.sequence = sequence
+        instance.symbol = symbol
+        return instance
@@ -0,0 +1,32 @@
+class OrderAmendedEvent:
+    """
+    Represents a successfully amended order response
+
+    Attributes:
+        order_id (int): Unique identifier for the order.
+        side (str): Order side, either "buy" or "sell".
+        quantity (int): Remaining quantity of the order after the amendment.
+        price (int): Price level of the order after the amendment, in ticks.
+        symbol (str): Symbol of the instrument.
+    """
+
+    __slots__ = ("order_id", "side", "quantity", "price", "symbol")
+
+    def __init__(self, order_id: int, side: str, quantity: int, price: int, symbol: str = "DEFAULT"):
+
+        """
+        Initialize a new OrderAmendedEvent
+
+        Args:
+            order_id (int): Unique identifier for the order.
+            side (str): Order side, either "buy" or "sell".
+            quantity (int): Remaining quantity of the order after the amendment.
+            price (int): Price level of the order after the amendment, in ticks.
+            symbol (str): Symbol of the instrument.
+        """
+
+        self.order_id = order_id
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.symbol = symbol
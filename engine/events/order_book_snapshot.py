@@ -1,19 +1,33 @@
+from typing import List, Tuple
+
+
 class OrderBookSnapshot:
     """
-    Represents a snapshot of the current order book
+    Represents a snapshot of the current order book, aggregated by price level
 
     Attributes:
-        snapshot (str): A string representing the current order book.
+        bids (List[Tuple[int, int]]): (price in ticks, aggregate quantity) of the bid levels, best price first.
+        asks (List[Tuple[int, int]]): (price in ticks, aggregate quantity) of the ask levels, best price first.
+        sequence (int): The sequence number of the last DepthUpdate reflected in the snapshot.
+        symbol (str): Symbol of the instrument.
     """
 
-    def __init__(self, snapshot: str):
+    __slots__ = ("bids", "asks", "sequence", "symbol")
+
+    def __init__(self, bids: List[Tuple[int, int]], asks: List[Tuple[int, int]], sequence: int, symbol: str = "DEFAULT"):
 
         """
         Initialize a new instnce of OrderBookSnapshot.
 
         Args:
-            snapshot (str): A string representing the current order book.
-        
+            bids (List[Tuple[int, int]]): (price in ticks, aggregate quantity) of the bid levels, best price first.
+            asks (List[Tuple[int, int]]): (price in ticks, aggregate quantity) of the ask levels, best price first.
+            sequence (int): The sequence number of the last DepthUpdate reflected in the snapshot.
+            symbol (str): Symbol of the instrument.
+
         """
 
-        self.snapshot = snapshot
\ No newline at end of file
+        self.bids = bids
+        self.asks = asks
+        self.sequence = sequence
+        self.symbol = symbol
@@ -4,18 +4,33 @@ class OrderCancelEvent:
 
     Attributes:
         order_id (int): Unique identifier for the order.
+        side (str): Order side, either "buy" or "sell".
+        quantity (int): Quantity of the order that was cancelled.
+        price (int): Price level of the order in ticks, or None for a market order.
+        symbol (str): Symbol of the instrument.
+        reason (str): Why the order was cancelled: "requested" by its owner, "expired", "unfilled" for the
+            remainder of a market or IOC order, "fill or kill" for a FOK order that could not fill.
     """
 
-    def __init__(self, order_id: int, side: str, quantity: int, price: float):
+    __slots__ = ("order_id", "side", "quantity", "price", "symbol", "reason")
+
+    def __init__(self, order_id: int, side: str, quantity: int, price: int, symbol: str = "DEFAULT", reason: str = "requested"):
 
         """
         Initialize a new OrderCancelEvent
 
         Args:
             order_id (int): Unique identifier for the order.
+            side (str): Order side, either "buy" or "sell".
+            quantity (int): Quantity of the order that was cancelled.
+            price (int): Price level of the order in ticks, or None for a market order.
+            symbol (str): Symbol of the instrument.
+            reason (str): Why the order was cancelled.
         """
 
         self.order_id = order_id
         self.side = side
         self.quantity = quantity
-        self.price = price
\ No newline at end of file
+        self.price = price
+        self.symbol = symbol
+        self.reason = reason
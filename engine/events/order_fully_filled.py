@@ -4,20 +4,42 @@ class OrderFullyFilled:
 
     Attributes:
         order_id (int): Unique identifier for the order.
+        symbol (str): Symbol of the instrument.
     """
 
-    def __init__(self, order_id: int):
+    __slots__ = ("order_id", "symbol")
+
+    def __init__(self, order_id: int, symbol: str = "DEFAULT"):
 
         """
         Initialize a new OrderFullyFilled instance.
 
         Args:
             order_id (int): Unique identifier for the order.
+            symbol (str): Symbol of the instrument.
         
         Raises:
             TypeError: if any argument has an incorrect type.
         """
         if not isinstance(order_id, int):
-            raise TypeError("price must be a float")
+            raise TypeError("order_id must be an integer")
+
+        self.order_id = order_id
+        self.symbol = symbol
+
+    @classmethod
+    def trusted(cls, order_id: int, symbol: str = "DEFAULT") -> "OrderFullyFilled":
+        """
+        Create a new OrderFullyFilled without type checks, for events built by the engine itself.
 
-        self.order_id = order_id
\ No newline at end of file
+        Args:
+            order_id (int): Unique identifier for the order.
+            symbol (str): Symbol of the instrument.
+
+        Returns:
+            OrderFullyFilled: The new instance.
+        """
+        instance = cls.__new__(cls)
+        instance.order_id = order_id
+        instance.symbol = symbol
+        return instance
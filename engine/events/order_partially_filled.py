@@ -7,25 +7,49 @@ class OrderPartiallyFilled:
     Attributes:
         order_id (int): Unique identifier for the order.
         remaining_quantity (int): Remaining trade quantity after partial fill.
+        symbol (str): Symbol of the instrument.
     """
 
-    def __init__(self, order_id: int, remaining_quantity: int):
+    __slots__ = ("order_id", "remaining_quantity", "symbol")
+
+    def __init__(self, order_id: int, remaining_quantity: int, symbol: str = "DEFAULT"):
         """
         Initialize a new OrderFullyFilled instance.
 
         Args:
             order_id (int): Unique identifier for the order.
             remaining_quantity (int): The remaining quantity after the partial fill.
+            symbol (str): Symbol of the instrument.
         
         Raises:
             TypeError: if any argument has an incorrect type.
         """
 
         if not isinstance(order_id, int):
-            raise TypeError("price must be a float")
+            raise TypeError("order_id must be an integer")
         
         if not isinstance(remaining_quantity, int):
             raise TypeError("remaining quantity must be an integer")
         
         self.order_id = order_id
         self.remaining_quantity = remaining_quantity
+        self.symbol = symbol
+
+    @classmethod
+    def trusted(cls, order_id: int, remaining_quantity: int, symbol: str = "DEFAULT") -> "OrderPartiallyFilled":
+        """
+        Create a new OrderPartiallyFilled without type checks, for events built by the engine itself.
+
+        Args:
+            order_id (int): Unique identifier for the order.
+            remaining_quantity (int): The remaining quantity after the partial fill.
+            symbol (str): Symbol of the instrument.
+
+        Returns:
+            OrderPartiallyFilled: The new instance.
+        """
+        instance = cls.__new__(cls)
+        instance.order_id = order_id
+        instance.remaining_quantity = remaining_quantity
+        instance.symbol = symbol
+        return instance
@@ -0,0 +1,26 @@
+class OrderRejectedEvent:
+    """
+    Represents a request that the engine could not accept
+
+    Attributes:
+        order_id (int): Unique identifier of the order the request referred to.
+        reason (str): Human readable reason for the rejection.
+        symbol (str): Symbol of the instrument.
+    """
+
+    __slots__ = ("order_id", "reason", "symbol")
+
+    def __init__(self, order_id: int, reason: str, symbol: str = "DEFAULT"):
+
+        """
+        Initialize a new OrderRejectedEvent
+
+        Args:
+            order_id (int): Unique identifier of the order the request referred to.
+            reason (str): Human readable reason for the rejection.
+            symbol (str): Symbol of the instrument.
+        """
+
+        self.order_id = order_id
+        self.reason = reason
+        self.symbol = symbol
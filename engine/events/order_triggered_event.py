@@ -0,0 +1,35 @@
+class OrderTriggeredEvent:
+    """
+    Represents a stop order triggered by a trade, about to enter matching
+
+    Attributes:
+        order_id (int): Unique identifier for the order.
+        side (str): Order side, either "buy" or "sell".
+        quantity (int): Quantity of the order.
+        price (int): Limit price of the order in ticks, or None for a stop-market order.
+        stop_price (int): Stop price of the order in ticks.
+        symbol (str): Symbol of the instrument.
+    """
+
+    __slots__ = ("order_id", "side", "quantity", "price", "stop_price", "symbol")
+
+    def __init__(self, order_id: int, side: str, quantity: int, price: int, stop_price: int, symbol: str = "DEFAULT"):
+
+        """
+        Initialize a new OrderTriggeredEvent
+
+        Args:
+            order_id (int): Unique identifier for the order.
+            side (str): Order side, either "buy" or "sell".
+            quantity (int): Quantity of the order.
+            price (int): Limit price of the order in ticks, or None for a stop-market order.
+            stop_price (int): Stop price of the order in ticks.
+            symbol (str): Symbol of the instrument.
+        """
+
+        self.order_id = order_id
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.stop_price = stop_price
+        self.symbol = symbol
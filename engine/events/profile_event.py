@@ -0,0 +1,26 @@
+class ProfileEvent:
+    """
+    Represents a profile of the matching engine process being started or saved
+
+    Attributes:
+        status (str): "started" or "stopped".
+        path (str): The file the profile is saved to, with its stage timers in path + ".stages.json".
+        symbol (str): Symbol of the request that started or stopped the profile.
+    """
+
+    __slots__ = ("status", "path", "symbol")
+
+    def __init__(self, status: str, path: str, symbol: str = "DEFAULT"):
+
+        """
+        Initialize a new ProfileEvent
+
+        Args:
+            status (str): "started" or "stopped".
+            path (str): The file the profile is saved to.
+            symbol (str): Symbol of the request that started or stopped the profile.
+        """
+
+        self.status = status
+        self.path = path
+        self.symbol = symbol
@@ -5,27 +5,50 @@ class TradeEvent:
     Represents a trade event that has occured.
 
     Attributes:
-        price (float): Trade price level.
+        price (int): Trade price level in ticks.
         quantity (int): Trade quantity.
+        symbol (str): Symbol of the instrument.
     """
 
-    def __init__(self, price: float, quantity: int):
+    __slots__ = ("price", "quantity", "symbol")
+
+    def __init__(self, price: int, quantity: int, symbol: str = "DEFAULT"):
         """
         Initialize a new TradeEvent instance.
 
         Args:
-            price (float): Order price level
+            price (int): Order price level in ticks
             quantity (int): Order quantity.
+            symbol (str): Symbol of the instrument.
 
         Raises:
             TypeError: if any argument has an incorrect type.
         """
-        if not isinstance(price, float):
-            raise TypeError("price must be a float")
+        if not isinstance(price, int):
+            raise TypeError("price must be an integer number of ticks")
         
         if not isinstance(quantity, int):
             raise TypeError("quantity must be an integer")
 
         self.price = price
         self.quantity = quantity
+        self.symbol = symbol
+
+    @classmethod
+    def trusted(cls, price: int, quantity: int, symbol: str = "DEFAULT") -> "TradeEvent":
+        """
+        Create a new TradeEvent without type checks, for events built by the engine itself.
 
+        Args:
+            price (int): Trade price level in ticks.
+            quantity (int): Trade quantity.
+            symbol (str): Symbol of the instrument.
+
+        Returns:
+            TradeEvent: The new instance.
+        """
+        instance = cls.__new__(cls)
+        instance.price = price
+        instance.quantity = quantity
+        instance.symbol = symbol
+        return instance
@@ -0,0 +1,34 @@
+import asyncio
+from typing import List, Set
+
+
+class ClientSession:
+    """
+    Represents the connection of one client to the OrderGateway.
+
+    Attributes:
+        session_id (int): Unique identifier of the session within the gateway.
+        writer (asyncio.StreamWriter): The stream the client's events are written to.
+        account (str): The account the client's orders are placed for, bound when the client connected.
+        order_ids (Set[int]): The order_ids the client submitted that may still rest in a book.
+        outbox (List[bytes]): Encoded event frames waiting for the next coalesced write.
+        closed (bool): Whether the connection is closed. Events of its orders are then discarded.
+    """
+
+    __slots__ = ("session_id", "writer", "account", "order_ids", "outbox", "closed")
+
+    def __init__(self, session_id: int, writer: asyncio.StreamWriter, account: str = ""):
+        """
+        Initialize a new ClientSession.
+
+        Args:
+            session_id (int): Unique identifier of the session within the gateway.
+            writer (asyncio.StreamWriter): The stream the client's events are written to.
+            account (str): The account the client's orders are placed for.
+        """
+        self.session_id = session_id
+        self.writer = writer
+        self.account = account
+        self.order_ids: Set[int] = set()
+        self.outbox: List[bytes] = []
+        self.closed = False
@@ -0,0 +1,86 @@
+import socket
+from typing import Iterable, Optional, Tuple, Union
+from ..message_bus.binary_codec import BinaryCodec, FRAME_HEADER
+
+
+class GatewayClient:
+    """
+    Represents a blocking client connection to an OrderGateway, for tools and tests.
+
+    Attributes:
+        sock (socket.socket): The connection to the gateway.
+        codec (BinaryCodec): The codec of the gateway protocol.
+        _buffer (bytearray): Bytes received and not decoded yet.
+    """
+
+    def __init__(self, address: Union[Tuple[str, int], str], codec: BinaryCodec = None):
+        """
+        Connects to an OrderGateway.
+
+        Args:
+            address (Union[Tuple[str, int], str]): A (host, port) pair for TCP, or the path of a Unix socket.
+            codec (BinaryCodec): The codec of the gateway protocol.
+        """
+        if isinstance(address, str):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.connect(address)
+        self.codec = codec if codec is not None else BinaryCodec()
+        self._buffer = bytearray()
+
+    def send(self, *requests) -> None:
+        """
+        Sends requests to the gateway, in one write.
+
+        Args:
+            *requests: The requests to send.
+        """
+        self.send_all(requests)
+
+    def send_all(self, requests: Iterable) -> None:
+        """
+        Sends requests to the gateway, in one write.
+
+        Args:
+            requests (Iterable): The requests to send.
+        """
+        parts = []
+        for request in requests:
+            payload = self.codec.encode(request)
+            parts.append(FRAME_HEADER.pack(len(payload)))
+            parts.append(payload)
+        self.sock.sendall(b"".join(parts))
+
+    def receive(self, timeout: float = None) -> Optional[object]:
+        """
+        Receives the next event from the gateway.
+
+        Args:
+            timeout (float): The longest time to wait in seconds, or None to wait forever.
+
+        Returns:
+            The event, or None if the gateway closed the connection.
+
+        Raises:
+            socket.timeout: if no event arrives in time. Bytes already received are kept for the next call.
+        """
+        self.sock.settimeout(timeout)
+        buffer = self._buffer
+        while True:
+            if len(buffer) >= FRAME_HEADER.size:
+                (length,) = FRAME_HEADER.unpack_from(buffer)
+                end = FRAME_HEADER.size + length
+                if len(buffer) >= end:
+                    message = self.codec.decode(bytes(buffer[FRAME_HEADER.size:end]))
+                    del buffer[:end]
+                    return message
+
+            data = self.sock.recv(1 << 16)
+            if not data:
+                return None
+            buffer += data
+
+    def close(self) -> None:
+        self.sock.close()
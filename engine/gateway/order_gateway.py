@@ -0,0 +1,403 @@
+import asyncio
+import multiprocessing
+import queue
+import socket
+import struct
+import threading
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Set
+from ..message_bus.message_bus import MessageBus
+from ..message_bus.binary_codec import BinaryCodec, FRAME_HEADER
+from ..router.symbol_router import SymbolRouter
+# requests
+from ..requests.add_order_request import AddOrderRequest
+from ..requests.cancel_order_request import CancelOrderRequest
+from ..requests.amend_order_request import AmendOrderRequest
+from ..requests.order_book_snapshot_request import OrderBookSnapshotRequest
+# events
+from ..events.order_cancel_event import OrderCancelEvent
+from ..events.order_rejected_event import OrderRejectedEvent
+from ..events.order_book_snapshot import OrderBookSnapshot
+from ..events.execution_event import ExecutionEvent
+from ..events.event_batch import EventBatch
+from .client_session import ClientSession
+
+# Requests clients may send, engine administration (stats, profiling) stays off the public gateway
+CLIENT_REQUEST_TYPES = (AddOrderRequest, CancelOrderRequest, AmendOrderRequest, OrderBookSnapshotRequest)
+
+
+class OrderGateway(multiprocessing.Process):
+    """
+    Represents the order entry gateway: an asyncio process that accepts client connections over TCP
+    and/or a Unix socket and connects them to the MatchEngine shards through the MessageBus.
+
+    Clients speak the framing of BinaryCodec.write in both directions: every message is a 4 byte
+    little-endian length followed by the BinaryCodec encoding of a request (client to gateway) or an
+    event (gateway to client). Requests are validated before they are forwarded to the request channel
+    of the shard owning their symbol (see SymbolRouter). A request that fails validation is answered
+    with an OrderRejectedEvent and never reaches an engine.
+
+    Every connection is bound to an account when it is accepted, by the accounts callable (for example
+    from the peer address, or the peer credentials of a Unix socket), and to the "" account without one.
+    The orders of a client are placed for that account only: an AddOrderRequest naming another account
+    is rejected, and one naming none is stamped with it, so a client cannot spend the risk limits of
+    another account (see RiskManager).
+
+    The gateway reads the event stream through its own subscription and routes each event back to the
+    client it concerns: order events by the order_id the client submitted, book snapshots to the
+    clients that asked for them, in order, and executions to the owners of both orders that matched.
+    Market data without an owner (depth updates) is not sent on order entry connections.
+
+    A client owns an order_id from its AddOrderRequest until an execution leaves nothing of the order or
+    it is cancelled. Other clients cannot cancel or amend it meanwhile, even after the owner disconnected.
+    The engines never accept an order_id twice (see OrderIdFilter), so an order that left the book only
+    stops being tracked, and an AddOrderRequest reusing its order_id is rejected by the engine. Only an
+    AddOrderRequest that the engine rejected gives its order_id back. The engine does not acknowledge an
+    accepted order, so an add stays pending until any other event of its order_id arrives, and the
+    gateway counts the cancels and amends forwarded for a pending order_id: each is answered by exactly
+    one event, which tells the reject of the add from the rejects of the requests behind it.
+
+    Writes are coalesced: the events of one batch read off the bus are gathered per client and written
+    with a single call. Each connection has its own backpressure. While more than high_water bytes
+    wait to be sent to a client, the gateway stops reading that client's requests. A client that lets
+    more than max_buffer bytes pile up is disconnected, so one slow client cannot hold back the others
+    or exhaust the gateway's memory. When a request channel is full, the gateway waits for room before
+    forwarding, which pushes back on every client.
+
+    The gateway must be created before the engines are started, since it adds its event subscription
+    to the message bus.
+
+    Attributes:
+        message_bus (MessageBus): The message bus of the engines.
+        router (SymbolRouter): Assigns symbols to shards.
+        host (str): The TCP address to listen on.
+        port (int): The TCP port to listen on, or None to not listen on TCP.
+        unix_path (str): The path of the Unix socket to listen on, or None.
+        codec (BinaryCodec): The codec of the client protocol.
+        symbols (Set[str]): The symbols clients may trade, or None to leave unknown symbols to the engines.
+        accounts (Callable): Maps the StreamWriter of a new connection to the account of its session, or None to refuse it.
+        high_water (int): Pending output bytes above which a client's requests are no longer read.
+        max_buffer (int): Pending output bytes above which a client is disconnected.
+        max_frame (int): The largest request frame accepted, larger frames close the connection.
+        subscription (Subscription): The event subscription of the gateway.
+        sessions (Dict[int, ClientSession]): The connected clients, keyed by session_id.
+        owners (Dict[int, ClientSession]): The session owning every live order_id.
+        _pending (Dict[int, int]): The number of rejects still to come if the add was rejected, per order_id whose add is pending.
+        _snapshot_waiters (Dict[str, Deque[ClientSession]]): The sessions waiting for a snapshot, per symbol.
+        _dirty (Set[ClientSession]): Sessions with events waiting to be written.
+        _next_session_id (int): The session_id of the next connection.
+    """
+
+    def __init__(self, message_bus: MessageBus, router: SymbolRouter = None, host: str = "127.0.0.1", port: int = None, unix_path: str = None, symbols: Iterable[str] = None,
+                 accounts: Callable[[asyncio.StreamWriter], Optional[str]] = None, subscriber: str = "gateway", high_water: int = 1 << 20, max_buffer: int = 16 << 20, max_frame: int = 1 << 16):
+        """
+        Initialize a new OrderGateway.
+
+        Args:
+            message_bus (MessageBus): The message bus of the engines.
+            router (SymbolRouter): Assigns symbols to shards, hash-based over the bus shards by default.
+            host (str): The TCP address to listen on.
+            port (int): The TCP port to listen on, or None to not listen on TCP.
+            unix_path (str): The path of the Unix socket to listen on, or None.
+            symbols (Iterable[str]): The symbols clients may trade, or None to leave unknown symbols to the engines.
+            accounts (Callable): Maps the StreamWriter of a new connection to the account of its session, or to
+                None to refuse the connection. Must be picklable. None binds every session to the "" account.
+            subscriber (str): The name of the gateway's event subscription.
+            high_water (int): Pending output bytes above which a client's requests are no longer read.
+            max_buffer (int): Pending output bytes above which a client is disconnected.
+            max_frame (int): The largest request frame accepted.
+
+        Raises:
+            ValueError: if there is nothing to listen on, or the router and the message bus disagree on the number of shards.
+        """
+        super().__init__()
+        if port is None and unix_path is None:
+            raise ValueError("the gateway needs a TCP port or a Unix socket path to listen on")
+
+        if router is None:
+            router = SymbolRouter(message_bus.shards)
+        if router.num_shards != message_bus.shards:
+            raise ValueError("router and message bus must have the same number of shards")
+
+        self.message_bus = message_bus
+        self.router = router
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.codec = BinaryCodec()
+        self.symbols = set(symbols) if symbols is not None else None
+        self.accounts = accounts
+        self.high_water = high_water
+        self.max_buffer = max_buffer
+        self.max_frame = max_frame
+        self.subscription = message_bus.subscribe("event", name=subscriber, policy="block", maxsize=0)
+        self.sessions: Dict[int, ClientSession] = {}
+        self.owners: Dict[int, ClientSession] = {}
+        self._pending: Dict[int, int] = {}
+        self._snapshot_waiters: Dict[str, Deque[ClientSession]] = defaultdict(deque)
+        self._dirty: Set[ClientSession] = set()
+        self._next_session_id = 1
+
+    def run(self) -> None:
+        """
+        Run the gateway process. Overrides the multiprocessing.Process.run() function
+        """
+        asyncio.run(self.serve())
+
+    async def serve(self) -> None:
+        """
+        Listens for clients and routes events to them until cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        servers = []
+        if self.port is not None:
+            servers.append(await asyncio.start_server(self._serve_client, self.host, self.port))
+        if self.unix_path is not None:
+            servers.append(await asyncio.start_unix_server(self._serve_client, self.unix_path))
+
+        # The bus is read with blocking calls, so a thread hands the events over to the event loop
+        threading.Thread(target=self._pump_events, args=(loop,), name="gateway-events", daemon=True).start()
+
+        await asyncio.gather(*(server.serve_forever() for server in servers))
+
+    def _pump_events(self, loop: asyncio.AbstractEventLoop, batch_size: int = 1024) -> None:
+        subscription = self.subscription
+        while True:
+            events = [subscription.get()]
+            while len(events) < batch_size:
+                try:
+                    events.append(subscription.get_nowait())
+                except queue.Empty:
+                    break
+            loop.call_soon_threadsafe(self.dispatch, events)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            # Writes are coalesced by the gateway already, do not delay them further
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        writer.transport.set_write_buffer_limits(high=self.high_water)
+
+        account = self.accounts(writer) if self.accounts is not None else ""
+        if account is None:
+            writer.close()
+            return
+
+        session = ClientSession(self._next_session_id, writer, account)
+        self._next_session_id += 1
+        self.sessions[session.session_id] = session
+
+        buffer = bytearray()
+        try:
+            while not session.closed:
+                # Stop reading requests from a client that does not keep up with its events
+                if writer.transport.get_write_buffer_size() > self.high_water:
+                    await writer.drain()
+
+                data = await reader.read(1 << 16)
+                if not data:
+                    break
+                buffer += data
+
+                # Forward every complete frame of the chunk
+                offset = 0
+                while len(buffer) - offset >= FRAME_HEADER.size:
+                    (length,) = FRAME_HEADER.unpack_from(buffer, offset)
+                    if length > self.max_frame:
+                        raise ConnectionError(f"frame of {length} bytes exceeds the limit of {self.max_frame}")
+                    end = offset + FRAME_HEADER.size + length
+                    if end > len(buffer):
+                        break
+                    await self.submit(session, bytes(buffer[offset + FRAME_HEADER.size:end]))
+                    offset = end
+                del buffer[:offset]
+                self.flush()
+        except ConnectionError:
+            pass
+        finally:
+            self.close_session(session)
+
+    async def submit(self, session: ClientSession, payload: bytes) -> bool:
+        """
+        Validates a request of a client and forwards it to the shard owning its symbol.
+
+        Args:
+            session (ClientSession): The client that sent the request.
+            payload (bytes): The encoded request.
+
+        Returns:
+            bool: True if the request was forwarded, False if it was rejected.
+        """
+        try:
+            request = self.codec.decode(payload)
+        except (ValueError, TypeError, struct.error, UnicodeDecodeError, IndexError) as error:
+            self.reject(session, 0, f"malformed request: {error}")
+            return False
+
+        reason = self.validate(session, request)
+        if reason is not None:
+            self.reject(session, getattr(request, "order_id", 0), reason, getattr(request, "symbol", "DEFAULT"))
+            return False
+
+        if isinstance(request, AddOrderRequest):
+            request.account = session.account
+            self.owners[request.order_id] = session
+            session.order_ids.add(request.order_id)
+            self._pending[request.order_id] = 1
+        elif isinstance(request, (CancelOrderRequest, AmendOrderRequest)):
+            if request.order_id in self._pending:
+                self._pending[request.order_id] += 1
+        elif isinstance(request, OrderBookSnapshotRequest):
+            self._snapshot_waiters[request.symbol].append(session)
+
+        channel = self.message_bus.subscribe("request", self.router.shard_for(request.symbol))
+        while True:
+            try:
+                channel.put_nowait(request)
+                return True
+            except queue.Full:
+                # Wait for the engine to make room, without blocking the other clients' events
+                await asyncio.sleep(0.0005)
+
+    def validate(self, session: ClientSession, request) -> str:
+        """
+        Checks a decoded request of a client.
+
+        Args:
+            session (ClientSession): The client that sent the request.
+            request: The decoded request.
+
+        Returns:
+            str: Why the request is rejected, or None if it may be forwarded.
+        """
+        if type(request) not in CLIENT_REQUEST_TYPES:
+            return f"{type(request).__name__} is not accepted by the gateway"
+
+        if self.symbols is not None and request.symbol not in self.symbols:
+            return f"unknown symbol {request.symbol}"
+
+        if isinstance(request, AddOrderRequest):
+            if request.quantity <= 0:
+                return "quantity must be positive"
+            if request.account and request.account != session.account:
+                return "account does not match the session"
+            if request.order_id in self.owners:
+                return "order_id is already in use"
+        elif isinstance(request, (CancelOrderRequest, AmendOrderRequest)):
+            if self.owners.get(request.order_id) is not session:
+                return "order_id not found in order book"
+
+        return None
+
+    def dispatch(self, events: List) -> None:
+        """
+        Routes events read off the bus to the clients they concern, then writes them out.
+
+        Args:
+            events (List): The events in the order they were published, batches included.
+        """
+        owners = self.owners
+        pending = self._pending
+        for event in events:
+            if type(event) is EventBatch:
+                self.dispatch(event.events)
+                continue
+
+            if type(event) is ExecutionEvent:
+                # Both sides of the match get the report, once if a client traded with itself
+                aggressor = owners.get(event.aggressor_id)
+                resting = owners.get(event.resting_id)
+                if pending:
+                    pending.pop(event.aggressor_id, None)
+                    pending.pop(event.resting_id, None)
+                if aggressor is not None and event.aggressor_remaining == 0:
+                    del owners[event.aggressor_id]
+                    aggressor.order_ids.discard(event.aggressor_id)
+                if resting is not None and event.resting_remaining == 0:
+                    del owners[event.resting_id]
+                    resting.order_ids.discard(event.resting_id)
+                payload = None
+                for session in (aggressor, resting) if resting is not aggressor else (aggressor,):
+                    if session is not None and not session.closed:
+                        if payload is None:
+                            payload = self.codec.encode(event)
+                        session.outbox.append(FRAME_HEADER.pack(len(payload)))
+                        session.outbox.append(payload)
+                        self._dirty.add(session)
+                continue
+
+            order_id = getattr(event, "order_id", None)
+            if order_id is not None:
+                session = owners.get(order_id)
+                if order_id in pending:
+                    if type(event) is not OrderRejectedEvent:
+                        del pending[order_id]
+                    elif pending[order_id] > 1:
+                        pending[order_id] -= 1
+                    else:
+                        # The engine rejected the add itself, the order_id was never accepted and is free again
+                        del pending[order_id]
+                        if session is not None:
+                            del owners[order_id]
+                            session.order_ids.discard(order_id)
+                if session is not None and isinstance(event, OrderCancelEvent):
+                    # The order left the book, the engine rejects any reuse of its order_id
+                    del owners[order_id]
+                    session.order_ids.discard(order_id)
+            elif isinstance(event, OrderBookSnapshot):
+                waiters = self._snapshot_waiters.get(event.symbol)
+                session = waiters.popleft() if waiters else None
+            else:
+                continue
+
+            if session is not None and not session.closed:
+                payload = self.codec.encode(event)
+                session.outbox.append(FRAME_HEADER.pack(len(payload)))
+                session.outbox.append(payload)
+                self._dirty.add(session)
+
+        self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the pending events of every client with one call per client, and disconnects the
+        clients whose output backlog exceeds max_buffer.
+        """
+        for session in self._dirty:
+            if session.closed:
+                continue
+            session.writer.write(b"".join(session.outbox))
+            session.outbox.clear()
+            if session.writer.transport.get_write_buffer_size() > self.max_buffer:
+                self.close_session(session)
+        self._dirty.clear()
+
+    def reject(self, session: ClientSession, order_id: int, reason: str, symbol: str = "DEFAULT") -> None:
+        """
+        Answers a client's request with an OrderRejectedEvent, written with the next flush.
+
+        Args:
+            session (ClientSession): The client that sent the request.
+            order_id (int): The order_id of the request, 0 if it has none.
+            reason (str): Why the request was rejected.
+            symbol (str): The symbol of the request.
+        """
+        payload = self.codec.encode(OrderRejectedEvent(order_id, reason, symbol))
+        session.outbox.append(FRAME_HEADER.pack(len(payload)))
+        session.outbox.append(payload)
+        self._dirty.add(session)
+
+    def close_session(self, session: ClientSession) -> None:
+        """
+        Closes the connection of a client. Its resting orders keep their owner, so their order_ids
+        stay reserved until they are filled or cancelled.
+
+        Args:
+            session (ClientSession): The client to disconnect.
+        """
+        if session.closed:
+            return
+        session.closed = True
+        session.outbox.clear()
+        self.sessions.pop(session.session_id, None)
+        session.writer.close()
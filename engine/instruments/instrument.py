@@ -0,0 +1,101 @@
+import math
+from decimal import Decimal
+from typing import Tuple
+
+
+class Instrument:
+    """
+    Represents a tradable instrument and its price grid.
+
+    Inside the engine every price is a fixed-point integer number of ticks. Prices are only converted
+    to and from floats at the edges, when requests come in and when events are displayed.
+
+    Attributes:
+        symbol (str): The instrument's symbol.
+        tick_size (float): The minimum price increment of the instrument.
+        reference_price (float): Reference price the price band is centred on, if the instrument has one.
+        price_band (float): Half-width of the price band as a fraction of the reference price (0.2 for ±20%).
+    """
+
+    def __init__(self, symbol: str = "DEFAULT", tick_size: float = 0.01, reference_price: float = None, price_band: float = None):
+        """
+        Initialize a new Instrument instance.
+
+        Args:
+            symbol (str): The instrument's symbol.
+            tick_size (float): The minimum price increment of the instrument.
+            reference_price (float): Reference price the price band is centred on.
+            price_band (float): Half-width of the price band as a fraction of the reference price.
+
+        Raises:
+            TypeError: if any argument has an incorrect type.
+            ValueError: if the tick size is not positive.
+        """
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+
+        if not isinstance(tick_size, (int, float)):
+            raise TypeError("tick_size must be a float")
+
+        if tick_size <= 0:
+            raise ValueError("tick_size must be positive")
+
+        if (reference_price is None) != (price_band is None):
+            raise ValueError("reference_price and price_band must be given together")
+
+        if price_band is not None and not 0 <= price_band < 1:
+            raise ValueError("price_band must be a fraction between 0 and 1")
+
+        self.symbol = symbol
+        self.tick_size = tick_size
+        self.reference_price = reference_price
+        self.price_band = price_band
+        self._ticks_per_unit = 1 / tick_size
+        self._decimals = max(0, -Decimal(str(tick_size)).as_tuple().exponent)
+
+    def to_ticks(self, price: float) -> int:
+        """
+        Converts a price to an integer number of ticks.
+
+        Args:
+            price (float): The price to convert.
+
+        Returns:
+            int: The price in ticks.
+
+        Raises:
+            ValueError: if the price is not a multiple of the tick size.
+        """
+        scaled = price * self._ticks_per_unit
+        ticks = round(scaled)
+        if abs(scaled - ticks) > 1e-6:
+            raise ValueError("price is not a multiple of the tick size")
+        return ticks
+
+    def to_price(self, ticks: int) -> float:
+        """
+        Converts an integer number of ticks back to a price.
+
+        Args:
+            ticks (int): The price in ticks.
+
+        Returns:
+            float: The price.
+        """
+        return round(ticks * self.tick_size, self._decimals)
+
+    def price_band_ticks(self) -> Tuple[int, int]:
+        """
+        Gets the lowest and highest prices of the instrument's price band, in ticks.
+
+        Returns:
+            Tuple[int, int]: The (min_price, max_price) of the band in ticks, both inclusive.
+
+        Raises:
+            ValueError: if the instrument has no price band.
+        """
+        if self.price_band is None:
+            raise ValueError("instrument has no price band")
+
+        reference = self.to_ticks(self.reference_price)
+        return math.ceil(reference * (1 - self.price_band)), math.floor(reference * (1 + self.price_band))
@@ -0,0 +1,228 @@
+import os
+import struct
+import time
+import zlib
+from typing import Dict, Iterator, Tuple
+from ..message_bus.binary_codec import BinaryCodec
+
+# Every record starts with the length of its body, a CRC-32 of the body and the sequence number.
+# The body is the message encoded with the codec.
+_RECORD_HEADER = struct.Struct("<IIQ")
+
+
+class Journal:
+    """
+    Represents an append-only binary log of the requests (and optionally the events) of a MatchEngine.
+
+    Records are numbered by a sequence that increases by one per record, encoded with BinaryCodec and
+    checksummed, so a record torn by a crash is detected and dropped when the journal is read back.
+
+    Writes go through a large user-space buffer and are made durable by group commit: the buffer is
+    flushed and fsynced once sync_every records are pending or the oldest pending record is older than
+    sync_interval seconds, whichever comes first, and whenever the engine goes idle. A crash can lose
+    at most the records of one commit group, and no record costs a syscall of its own.
+
+    The file is opened on the first append, so a Journal can be created before the engine process is
+    started and is opened in that process.
+
+    Attributes:
+        path (str): The path of the journal file.
+        sync_every (int): The number of pending records that triggers a commit.
+        sync_interval (float): The longest time in seconds a record stays pending before a commit.
+        record_events (bool): Whether the engine also journals the events it emits.
+        buffer_size (int): The size of the write buffer in bytes.
+        codec (BinaryCodec): The codec used to encode records.
+        sequence (int): The sequence number of the last appended record.
+        _file: The journal file, or None until the first append.
+        _pending (int): The number of records appended since the last commit.
+        _pending_since (float): When the oldest pending record was appended.
+    """
+
+    def __init__(self, path: str, sync_every: int = 1024, sync_interval: float = 0.001, record_events: bool = False, buffer_size: int = 1 << 20, codec: BinaryCodec = None):
+        """
+        Initialize a new Journal.
+
+        Args:
+            path (str): The path of the journal file. An existing journal is appended to.
+            sync_every (int): The number of pending records that triggers a commit.
+            sync_interval (float): The longest time in seconds a record stays pending before a commit.
+            record_events (bool): Whether the engine also journals the events it emits.
+            buffer_size (int): The size of the write buffer in bytes.
+            codec (BinaryCodec): The codec used to encode records.
+
+        Raises:
+            ValueError: if sync_every is not positive.
+        """
+        if sync_every < 1:
+            raise ValueError("sync_every must be at least 1")
+
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.record_events = record_events
+        self.buffer_size = buffer_size
+        self.codec = codec if codec is not None else BinaryCodec()
+        self.sequence = 0
+        self._file = None
+        self._pending = 0
+        self._pending_since = 0.0
+
+        # Statistics
+        self._records = 0
+        self._bytes = 0
+        self._syncs = 0
+        self._write_time = 0.0
+        self._sync_time = 0.0
+        self._max_sync_time = 0.0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_file"] = None
+        return state
+
+    def open(self) -> None:
+        """
+        Opens the journal file for appending, continuing the sequence of the records already in it.
+        """
+        if self._file is not None:
+            return
+        if os.path.exists(self.path):
+            self.sequence, valid_size = self._scan(self.path)
+            if os.path.getsize(self.path) > valid_size:
+                # Drop a record torn by a crash, so that new records follow the last valid one
+                os.truncate(self.path, valid_size)
+        self._file = open(self.path, "ab", buffering=self.buffer_size)
+
+    @staticmethod
+    def _scan(path: str) -> Tuple[int, int]:
+        """
+        Finds the end of the valid records of a journal file.
+
+        Returns:
+            Tuple[int, int]: The sequence number of the last valid record and the size of the valid records in bytes.
+        """
+        sequence = size = 0
+        with open(path, "rb") as stream:
+            while True:
+                header = stream.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                length, checksum, record_sequence = _RECORD_HEADER.unpack(header)
+                body = stream.read(length)
+                if len(body) < length or zlib.crc32(body) != checksum:
+                    break
+                sequence = record_sequence
+                size += _RECORD_HEADER.size + length
+        return sequence, size
+
+    def append(self, message) -> int:
+        """
+        Appends a message to the journal, committing the pending records if the group commit policy says so.
+
+        Args:
+            message: The request or event to journal.
+
+        Returns:
+            int: The sequence number of the record.
+        """
+        if self._file is None:
+            self.open()
+
+        start = time.perf_counter()
+        body = self.codec.encode(message)
+        self.sequence += 1
+        self._file.write(_RECORD_HEADER.pack(len(body), zlib.crc32(body), self.sequence))
+        self._file.write(body)
+
+        self._records += 1
+        self._bytes += _RECORD_HEADER.size + len(body)
+        if self._pending == 0:
+            self._pending_since = start
+        self._pending += 1
+        self._write_time += time.perf_counter() - start
+
+        if self._pending >= self.sync_every or start - self._pending_since >= self.sync_interval:
+            self.sync()
+        return self.sequence
+
+    @property
+    def pending(self) -> int:
+        """
+        Returns:
+            int: The number of records appended but not yet committed.
+        """
+        return self._pending
+
+    def sync(self) -> None:
+        """
+        Commits the pending records: flushes the write buffer and fsyncs the file.
+        """
+        if self._file is None or self._pending == 0:
+            return
+
+        start = time.perf_counter()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        elapsed = time.perf_counter() - start
+
+        self._pending = 0
+        self._syncs += 1
+        self._sync_time += elapsed
+        self._max_sync_time = max(self._max_sync_time, elapsed)
+
+    def close(self) -> None:
+        """
+        Commits the pending records and closes the journal file.
+        """
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Reports the throughput and cost of the journal in this process.
+
+        Returns:
+            Dict[str, float]: The number of records, bytes and commits, the average number of records per
+            commit, the average time spent per record (encoding, buffering and its share of the commits)
+            and the average and longest commit, in microseconds.
+        """
+        busy = self._write_time + self._sync_time
+        return {
+            "records": self._records,
+            "bytes": self._bytes,
+            "syncs": self._syncs,
+            "records_per_sync": self._records / self._syncs if self._syncs else 0.0,
+            "records_per_second": self._records / busy if busy else 0.0,
+            "latency_per_record_us": busy / self._records * 1e6 if self._records else 0.0,
+            "sync_avg_us": self._sync_time / self._syncs * 1e6 if self._syncs else 0.0,
+            "sync_max_us": self._max_sync_time * 1e6,
+        }
+
+    @staticmethod
+    def read(path: str, codec: BinaryCodec = None, after: int = 0) -> Iterator[Tuple[int, object]]:
+        """
+        Streams the records of a journal file. Reading stops at the first truncated or corrupt record,
+        which is where a crash interrupted the last write.
+
+        Args:
+            path (str): The path of the journal file.
+            codec (BinaryCodec): The codec the records were encoded with.
+            after (int): Only records with a higher sequence number are returned.
+
+        Returns:
+            Iterator[Tuple[int, object]]: (sequence, message) pairs in journal order.
+        """
+        codec = codec if codec is not None else BinaryCodec()
+        with open(path, "rb") as stream:
+            while True:
+                header = stream.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    return
+                length, checksum, sequence = _RECORD_HEADER.unpack(header)
+                body = stream.read(length)
+                if len(body) < length or zlib.crc32(body) != checksum:
+                    return
+                if sequence > after:
+                    yield sequence, codec.decode(body)
@@ -0,0 +1,318 @@
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+from ..orders.order import Order
+from ..orders.stop_loss_order import StopLossOrder
+from ..order_book.order_book import OrderBook
+from ..order_book.order_id_filter import OrderIdFilter
+from ..risk.risk_manager import RiskManager
+from ..requests.add_order_request import TIME_IN_FORCE
+
+# File header: magic, sequence number of the last journal record reflected in the snapshot, number of books
+_MAGIC = b"MESNAP06"
+_FILE_HEADER = struct.Struct("<8sQI")
+
+# Book header: length of the symbol, sequence number of the last depth update, sequence number of the last
+# execution, number of resting orders, number of pending stops, presence flag and price in ticks of the last trade, time and tick of the expiry
+# wheel, number of scheduled expiries, number of accounts of the orders. The symbol follows, then the
+# accounts, each prefixed with its length
+_BOOK_HEADER = struct.Struct("<IQQQQBqdqQI")
+
+# Length of a string
+_LENGTH = struct.Struct("<I")
+
+# Resting order: order_id, side, quantity, price in ticks, index of its account
+_ORDER = struct.Struct("<qBqqI")
+
+# Pending stop: order_id, side, quantity, stop price, presence flag and limit price in ticks, time in force,
+# index of its account
+_STOP = struct.Struct("<qBqqBqBI")
+
+# Scheduled expiry: order_id, deadline in ticks of the expiry wheel
+_EXPIRY = struct.Struct("<qq")
+
+# Order id filter, after the books: number of exact order_ids, number of Bloom filter generations
+_FILTER_HEADER = struct.Struct("<QI")
+
+# Exact order_id of the order id filter
+_ORDER_ID = struct.Struct("<q")
+
+# Bloom filter generation: log2 of its number of 64 bit words, number of order_ids, followed by its words
+_GENERATION = struct.Struct("<IQ")
+
+# Account positions, after the order id filter: number of positions, then each position: length of the
+# symbol, length of the account, position, followed by the symbol and the account
+_POSITION_COUNT = struct.Struct("<Q")
+_POSITION = struct.Struct("<IIq")
+
+_SIDES = {"buy": 0, "sell": 1}
+_SIDE_NAMES = ("buy", "sell")
+_TIME_IN_FORCE = {name: code for code, name in enumerate(TIME_IN_FORCE)}
+
+
+class SnapshotStore:
+    """
+    Writes and loads point-in-time binary snapshots of the order books of a MatchEngine.
+
+    A snapshot holds every resting order of every book in price-time priority, every pending stop in
+    trigger priority and every scheduled expiry in expiry order, together with the depth update and
+    execution sequences, last trade price and expiry clock of each book and the sequence number of the last journal record it
+    reflects, the order ids the engine remembers to reject duplicates (see OrderIdFilter) and the
+    positions of the accounts (see RiskManager).
+    On restart the engine loads the latest snapshot and replays only the journal records after it.
+
+    Snapshots are written by a forked child process that works on a copy-on-write image of the books,
+    so the engine keeps matching while the snapshot is encoded and written. A snapshot is written to a
+    temporary file, fsynced and renamed, so a crash never leaves a partial snapshot behind.
+
+    Attributes:
+        directory (str): The directory holding the snapshot files.
+        every (int): The number of journal records between two snapshots.
+        keep (int): The number of most recent snapshots to keep.
+        last_sequence (int): The journal sequence of the last snapshot started.
+        _child (int): The process id of the child writing a snapshot, or None.
+    """
+
+    def __init__(self, directory: str, every: int = 1000000, keep: int = 2):
+        """
+        Initialize a new SnapshotStore.
+
+        Args:
+            directory (str): The directory holding the snapshot files, created if needed.
+            every (int): The number of journal records between two snapshots.
+            keep (int): The number of most recent snapshots to keep.
+
+        Raises:
+            ValueError: if every or keep is not positive.
+        """
+        if every < 1 or keep < 1:
+            raise ValueError("every and keep must be at least 1")
+
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self.last_sequence = 0
+        self._child = None
+
+    def due(self, journal_sequence: int) -> bool:
+        """
+        Checks whether enough journal records were written since the last snapshot.
+
+        Args:
+            journal_sequence (int): The sequence number of the last journal record.
+
+        Returns:
+            bool: True if a snapshot should be taken.
+        """
+        return journal_sequence - self.last_sequence >= self.every
+
+    def write_in_background(self, books: Dict[str, OrderBook], journal_sequence: int, order_ids: OrderIdFilter = None, risk: RiskManager = None) -> bool:
+        """
+        Writes a snapshot from a forked child process, unless the previous one is still being written.
+        Platforms without fork write the snapshot in the calling process.
+
+        Args:
+            books (Dict[str, OrderBook]): The order books keyed by symbol.
+            journal_sequence (int): The sequence number of the last journal record reflected in the books.
+            order_ids (OrderIdFilter): The order ids of the engine, or None.
+            risk (RiskManager): The account exposures of the engine, or None.
+
+        Returns:
+            bool: True if the snapshot was started.
+        """
+        if self._child is not None:
+            pid, _ = os.waitpid(self._child, os.WNOHANG)
+            if pid == 0:
+                return False
+            self._child = None
+
+        self.last_sequence = journal_sequence
+        if not hasattr(os, "fork"):
+            self.write(books, journal_sequence, order_ids, risk)
+            return True
+
+        pid = os.fork()
+        if pid == 0:
+            # Child: write the copy-on-write image of the books and leave without running any cleanup
+            # inherited from the engine process
+            status = 0
+            try:
+                self.write(books, journal_sequence, order_ids, risk)
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+
+        self._child = pid
+        return True
+
+    def wait(self) -> None:
+        """
+        Waits for the snapshot being written in the background, if any.
+        """
+        if self._child is not None:
+            os.waitpid(self._child, 0)
+            self._child = None
+
+    def write(self, books: Dict[str, OrderBook], journal_sequence: int, order_ids: OrderIdFilter = None, risk: RiskManager = None) -> str:
+        """
+        Writes a snapshot of the books and prunes the oldest snapshots.
+
+        Args:
+            books (Dict[str, OrderBook]): The order books keyed by symbol.
+            journal_sequence (int): The sequence number of the last journal record reflected in the books.
+            order_ids (OrderIdFilter): The order ids of the engine, or None.
+            risk (RiskManager): The account exposures of the engine, or None.
+
+        Returns:
+            str: The path of the snapshot file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"snapshot-{journal_sequence:020d}.bin")
+        temporary = path + ".tmp"
+
+        with open(temporary, "wb", buffering=1 << 20) as stream:
+            stream.write(_FILE_HEADER.pack(_MAGIC, journal_sequence, len(books)))
+            for symbol, book in books.items():
+                name = symbol.encode("utf-8")
+                last_price = book.stops.last_price
+                expiries = book.expiries.entries()
+                orders, stops = book.get_bids() + book.get_asks(), book.stops.get_stops()
+                accounts: Dict[str, int] = {}
+                for order in orders + stops:
+                    if order.account not in accounts:
+                        accounts[order.account] = len(accounts)
+                stream.write(_BOOK_HEADER.pack(len(name), book.sequence, book.execution_sequence, len(book), len(book.stops), last_price is not None, last_price or 0,
+                                               book.expiries.now, book.expiries.current, len(expiries), len(accounts)))
+                stream.write(name)
+                for account in accounts:
+                    data = account.encode("utf-8")
+                    stream.write(_LENGTH.pack(len(data)) + data)
+                pack = _ORDER.pack
+                stream.write(b"".join([pack(order.order_id, _SIDES[order.side], order.quantity, order.price, accounts[order.account]) for order in orders]))
+                stream.write(b"".join([
+                    _STOP.pack(stop.order_id, _SIDES[stop.side], stop.quantity, stop.stop_price, stop.price is not None, stop.price or 0,
+                               _TIME_IN_FORCE[stop.time_in_force], accounts[stop.account])
+                    for stop in stops
+                ]))
+                stream.write(b"".join([_EXPIRY.pack(order_id, deadline) for order_id, deadline in expiries]))
+            exact, generations = order_ids.state() if order_ids is not None else ([], [])
+            stream.write(_FILTER_HEADER.pack(len(exact), len(generations)))
+            stream.write(b"".join([_ORDER_ID.pack(order_id) for order_id in exact]))
+            for word_bits, count, words in generations:
+                stream.write(_GENERATION.pack(word_bits, count))
+                stream.write(words)
+            positions = list(risk.positions()) if risk is not None else []
+            stream.write(_POSITION_COUNT.pack(len(positions)))
+            for symbol, account, position in positions:
+                symbol_data, account_data = symbol.encode("utf-8"), account.encode("utf-8")
+                stream.write(_POSITION.pack(len(symbol_data), len(account_data), position) + symbol_data + account_data)
+            stream.flush()
+            os.fsync(stream.fileno())
+
+        os.replace(temporary, path)
+        for old in self.snapshots()[:-self.keep]:
+            os.remove(old)
+        return path
+
+    def snapshots(self) -> List[str]:
+        """
+        Lists the snapshot files of the directory.
+
+        Returns:
+            List[str]: The paths of the snapshots, oldest first.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(name for name in os.listdir(self.directory) if name.startswith("snapshot-") and name.endswith(".bin"))
+        return [os.path.join(self.directory, name) for name in names]
+
+    def latest(self) -> Optional[str]:
+        """
+        Returns:
+            Optional[str]: The path of the most recent snapshot, or None if there is none.
+        """
+        snapshots = self.snapshots()
+        return snapshots[-1] if snapshots else None
+
+    @staticmethod
+    def load(path: str) -> Tuple[int, Dict[str, Tuple[int, int, List[Order], List[StopLossOrder], Optional[int], Tuple[float, int, List[Tuple[int, int]]]]], Tuple[List[int], List[Tuple[int, int, bytes]]], List[Tuple[str, str, int]]]:
+        """
+        Reads a snapshot file.
+
+        Args:
+            path (str): The path of the snapshot file.
+
+        Returns:
+            Tuple[int, Dict[str, Tuple[int, int, List[Order], List[StopLossOrder], Optional[int], Tuple[float, int, List[Tuple[int, int]]]]], Tuple[List[int], List[Tuple[int, int, bytes]]], List[Tuple[str, str, int]]]:
+            The journal sequence of the snapshot, for every symbol the depth update and execution sequences of
+            its book, its resting orders in price-time priority, its pending stops in trigger priority, its last trade
+            price and the (time, tick, expiries) of its expiry wheel (see TimerWheel.restore), the state of
+            the order id filter (see OrderIdFilter.restore) and the (symbol, account, position) of every
+            account with a position.
+
+        Raises:
+            ValueError: if the file is not a snapshot.
+        """
+        with open(path, "rb") as stream:
+            data = stream.read()
+
+        magic, journal_sequence, count = _FILE_HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an order book snapshot")
+
+        offset = _FILE_HEADER.size
+        books = {}
+        for _ in range(count):
+            length, sequence, execution_sequence, order_count, stop_count, has_last_price, last_price, now, current, expiry_count, account_count = _BOOK_HEADER.unpack_from(data, offset)
+            offset += _BOOK_HEADER.size
+            symbol = str(data[offset:offset + length], "utf-8")
+            offset += length
+            accounts = []
+            for _ in range(account_count):
+                (length,) = _LENGTH.unpack_from(data, offset)
+                offset += _LENGTH.size
+                accounts.append(str(data[offset:offset + length], "utf-8"))
+                offset += length
+            end = offset + order_count * _ORDER.size
+            orders = [
+                Order.trusted(order_id, _SIDE_NAMES[side], quantity, price, accounts[account])
+                for order_id, side, quantity, price, account in _ORDER.iter_unpack(data[offset:end])
+            ]
+            offset = end
+            end = offset + stop_count * _STOP.size
+            stops = [
+                StopLossOrder.trusted(order_id, _SIDE_NAMES[side], quantity, stop_price, price if has_price else None, TIME_IN_FORCE[time_in_force], accounts[account])
+                for order_id, side, quantity, stop_price, has_price, price, time_in_force, account in _STOP.iter_unpack(data[offset:end])
+            ]
+            offset = end
+            end = offset + expiry_count * _EXPIRY.size
+            expiries = list(_EXPIRY.iter_unpack(data[offset:end]))
+            offset = end
+            books[symbol] = (sequence, execution_sequence, orders, stops, last_price if has_last_price else None, (now, current, expiries))
+
+        exact_count, generation_count = _FILTER_HEADER.unpack_from(data, offset)
+        offset += _FILTER_HEADER.size
+        end = offset + exact_count * _ORDER_ID.size
+        exact = [order_id for (order_id,) in _ORDER_ID.iter_unpack(data[offset:end])]
+        offset = end
+        generations = []
+        for _ in range(generation_count):
+            word_bits, count = _GENERATION.unpack_from(data, offset)
+            offset += _GENERATION.size
+            end = offset + (8 << word_bits)
+            generations.append((word_bits, count, data[offset:end]))
+            offset = end
+
+        (position_count,) = _POSITION_COUNT.unpack_from(data, offset)
+        offset += _POSITION_COUNT.size
+        positions = []
+        for _ in range(position_count):
+            symbol_length, account_length, position = _POSITION.unpack_from(data, offset)
+            offset += _POSITION.size
+            symbol = str(data[offset:offset + symbol_length], "utf-8")
+            offset += symbol_length
+            positions.append((symbol, str(data[offset:offset + account_length], "utf-8"), position))
+            offset += account_length
+
+        return journal_sequence, books, (exact, generations), positions
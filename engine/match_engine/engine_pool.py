@@ -0,0 +1,139 @@
+import os
+from typing import Dict, List
+from ..instruments.instrument import Instrument
+from ..message_bus.message_bus import MessageBus
+from ..router.symbol_router import SymbolRouter
+from ..journal.journal import Journal
+from ..journal.snapshot_store import SnapshotStore
+from .match_engine import MatchEngine
+
+
+class EnginePool:
+    """
+    Runs one MatchEngine process per shard of the message bus, each hosting the instruments the
+    router assigns to it. Every shard must be assigned at least one instrument.
+
+    Requests are submitted to the request channel of the shard that owns their symbol. Every symbol
+    is served by a single engine, so the events of a symbol keep the order in which they were produced
+    in the merged event stream, while different symbols are matched on different cores.
+
+    With a journal_dir, every engine journals its requests to its own file in that directory, and
+    with a snapshot_dir as well, snapshots its books to its own subdirectory of it. With a stats_dir,
+    every engine collects its statistics and writes them to its own file in that directory on exit.
+
+    Attributes:
+        message_bus (MessageBus): The message bus shared by all engines.
+        router (SymbolRouter): Assigns symbols to shards.
+        engines (List[MatchEngine]): The engine of each shard.
+    """
+
+    def __init__(self, message_bus: MessageBus, instruments: List[Instrument], router: SymbolRouter = None, journal_dir: str = None, journal_options: Dict = None, snapshot_dir: str = None, snapshot_options: Dict = None, stats_dir: str = None, **engine_options):
+        """
+        Initialize a new EnginePool.
+
+        Args:
+            message_bus (MessageBus): The message bus shared by all engines.
+            instruments (List[Instrument]): Every instrument traded by the pool.
+            router (SymbolRouter): Assigns symbols to shards, hash-based over the bus shards by default.
+            journal_dir (str): The directory of the journal of each shard, or None to run without journals.
+            journal_options (Dict): sync_every, sync_interval and record_events of the journals.
+            snapshot_dir (str): The directory of the book snapshots, used together with journal_dir.
+            snapshot_options (Dict): every and keep of the snapshot stores.
+            stats_dir (str): The directory of the statistics file of each shard, or None to not write them.
+            **engine_options: book_type, batch_size, max_batch_latency, stats, profile_dir, timer_resolution,
+                session_close, expiry_batch, order_id_window, order_id_capacity, risk and batch_executions of
+                each MatchEngine.
+
+        Raises:
+            ValueError: if the router and the message bus disagree on the number of shards, or a shard gets no instrument.
+        """
+        if router is None:
+            router = SymbolRouter(message_bus.shards)
+        if router.num_shards != message_bus.shards:
+            raise ValueError("router and message bus must have the same number of shards")
+
+        shard_instruments: Dict[int, List[Instrument]] = {shard: [] for shard in range(router.num_shards)}
+        for instrument in instruments:
+            shard_instruments[router.shard_for(instrument.symbol)].append(instrument)
+        # An engine without instruments would trade a default instrument the pool was never given
+        empty = [shard for shard, hosted in shard_instruments.items() if not hosted]
+        if empty:
+            raise ValueError(f"the router assigns no instrument to shards {empty}")
+
+        if stats_dir is not None:
+            os.makedirs(stats_dir, exist_ok=True)
+            engine_options["stats"] = True
+
+        self.message_bus = message_bus
+        self.router = router
+        self.engines = [
+            MatchEngine(message_bus, instruments=shard_instruments[shard], shard=shard, journal=self.journal_for(journal_dir, shard, journal_options),
+                        snapshots=self.snapshots_for(snapshot_dir, shard, snapshot_options),
+                        stats_path=os.path.join(stats_dir, f"shard-{shard}.stats.json") if stats_dir is not None else None, **engine_options)
+            for shard in range(router.num_shards)
+        ]
+
+    @staticmethod
+    def journal_for(journal_dir: str, shard: int, journal_options: Dict = None) -> Journal:
+        """
+        Creates the journal of a shard.
+
+        Args:
+            journal_dir (str): The directory of the journals, or None for no journal.
+            shard (int): The index of the shard.
+            journal_options (Dict): Options of the journal.
+
+        Returns:
+            Journal: The journal of the shard, or None.
+        """
+        if journal_dir is None:
+            return None
+        os.makedirs(journal_dir, exist_ok=True)
+        return Journal(os.path.join(journal_dir, f"shard-{shard}.journal"), **(journal_options or {}))
+
+    @staticmethod
+    def snapshots_for(snapshot_dir: str, shard: int, snapshot_options: Dict = None) -> SnapshotStore:
+        """
+        Creates the snapshot store of a shard.
+
+        Args:
+            snapshot_dir (str): The directory of the snapshots, or None for no snapshots.
+            shard (int): The index of the shard.
+            snapshot_options (Dict): Options of the snapshot store.
+
+        Returns:
+            SnapshotStore: The snapshot store of the shard, or None.
+        """
+        if snapshot_dir is None:
+            return None
+        return SnapshotStore(os.path.join(snapshot_dir, f"shard-{shard}"), **(snapshot_options or {}))
+
+    def start(self) -> None:
+        """
+        Starts the process of every engine.
+        """
+        for engine in self.engines:
+            engine.start()
+
+    def submit(self, request) -> None:
+        """
+        Publishes a request to the shard that owns its symbol.
+
+        Args:
+            request: The request to publish.
+        """
+        self.message_bus.publish("request", request, self.router.shard_for(request.symbol))
+
+    def terminate(self) -> None:
+        """
+        Terminates the process of every engine.
+        """
+        for engine in self.engines:
+            engine.terminate()
+
+    def join(self) -> None:
+        """
+        Waits for the process of every engine to exit.
+        """
+        for engine in self.engines:
+            engine.join()
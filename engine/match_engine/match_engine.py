@@ -1,285 +1,1175 @@
+import gc
+import math
 import multiprocessing
-from typing import Union
+import os
+import queue
+import signal
+import time
+from collections import deque
+from typing import Deque, Dict, List, Union
 # order and order book
 from ..orders.order import Order
+from ..orders.stop_loss_order import StopLossOrder
+from ..instruments.instrument import Instrument
 from ..order_book.order_book import OrderBook
+from ..order_book.ladder_order_book import LadderOrderBook
+from ..order_book.order_id_filter import OrderIdFilter
 # requests
 from ..requests.add_order_request import AddOrderRequest
 from ..requests.cancel_order_request import CancelOrderRequest
+from ..requests.amend_order_request import AmendOrderRequest
 from ..requests.order_book_snapshot_request import OrderBookSnapshotRequest
+from ..requests.engine_stats_request import EngineStatsRequest
+from ..requests.profile_request import ProfileRequest
+from ..requests.timer_request import TimerRequest
 from ..message_bus.message_bus import MessageBus
+from ..journal.journal import Journal
+from ..journal.snapshot_store import SnapshotStore
+from ..stats.engine_stats import EngineStats
+from ..stats.engine_profiler import EngineProfiler
+from ..risk.risk_manager import RiskManager
 # events
-from ..events.trade_event import TradeEvent
-from ..events.order_fully_filled import OrderFullyFilled
-from ..events.order_partially_filled import OrderPartiallyFilled
+from ..events.execution_event import ExecutionEvent
 from ..events.order_book_snapshot import OrderBookSnapshot
+from ..events.depth_update import DepthUpdate
 from ..events.order_cancel_event import OrderCancelEvent
+from ..events.order_amended_event import OrderAmendedEvent
+from ..events.order_rejected_event import OrderRejectedEvent
+from ..events.event_batch import EventBatch
+from ..events.engine_stats_event import EngineStatsEvent
+from ..events.profile_event import ProfileEvent
+from ..events.order_triggered_event import OrderTriggeredEvent
 
 class MatchEngine(multiprocessing.Process):
     """
     Represents the core matching engine, which takes in requests to be processed and emits messages via the MessageBus.
 
+    Prices are converted to integer ticks of the instrument when a request is processed, so the book,
+    the matching loop and the emitted events all work on integers.
+
+    The book implementation is chosen with book_type: "price_level" (the default) keeps a sorted index of
+    price levels and suits any instrument, while "ladder" preallocates one slot per tick of the
+    instrument's price band and rejects orders priced outside of it.
+
+    With a batch_size above 1 the engine drains up to batch_size pending requests at a time (optionally
+    waiting up to max_batch_latency seconds for the batch to fill up), processes them in order, and
+    publishes every event they produced as a single EventBatch message.
+
+    Every match between an incoming order and a resting order is published as one ExecutionEvent, which
+    names both orders and carries the quantities left on each, numbered by a per-book execution sequence
+    that consumers can check for gaps. With batch_executions, a request is published as one EventBatch
+    even with a batch_size of 1, so the executions of an order that sweeps several levels arrive in one
+    message.
+
+    Stop orders wait in the stop book of their instrument (see StopBook) until a trade reaches their stop
+    price. The stops triggered while a request is matched are queued, and once the request is done they
+    enter matching one after the other in the order they were triggered, the trades of one triggering
+    more stops behind them, so a cascade is processed in a deterministic order within the request.
+
+    An engine can host several instruments, each with its own order book. Requests are routed to the
+    book of their symbol, and order_book/instrument always point at the book and instrument of the
+    request being processed. When several engines share the load (see EnginePool), each one reads the
+    request channel of its shard.
+
+    With a journal, every request is appended to it before it is processed (and every emitted event
+    too if the journal records events), and the journal commits its pending records when the engine
+    goes idle. With a snapshot store as well, the engine snapshots its books in the background every
+    few journal records, and on start it restores the latest snapshot and replays only the journal
+    records written after it (see recover).
+
+    With stats enabled, the engine times every request it takes off the request channel (see
+    EngineStats) and counts the events it emits. Without them the request loop takes no timestamps.
+    The statistics are published in answer to an EngineStatsRequest (the requests of a batch are
+    counted once the batch is published), and with a stats_path they are written to that file when
+    the engine process exits, terminate() included.
+
+    GTD orders expire at their expire_time and DAY orders at the next session_close, both rounded up to
+    the timer_resolution. Expiry times are kept in the timer wheel of each book (see TimerWheel) and
+    checked against the engine clock, which only moves on TimerRequests. The running engine sends itself
+    a TimerRequest, journaled like any other request, whenever its clock falls a tick behind while it
+    has expiries scheduled or a request arrives, so a replay expires the same orders at the same point
+    of the request flow. A TimerRequest cancels at most expiry_batch orders, and the engine sends more
+    of them until every due order is expired, so a session close does not hold up the request channel.
+
+    Every order_id is accepted once: an AddOrderRequest reusing the order_id of an order the engine
+    accepted before, still live or not, is rejected. The order_ids are remembered in fixed memory (see
+    OrderIdFilter), the last order_id_window exactly and up to 2 * order_id_capacity before them in Bloom
+    filters, which reject a new order_id with a small probability. An order_id_window of 0 turns the
+    check off.
+
+    With a risk manager, every new order and every amendment that adds quantity or moves the price is
+    checked against the pre-trade limits of its account first (see RiskManager), and rejected if it
+    breaks one. The engine updates the exposure of the accounts as their orders rest, trade and leave
+    the book, so the checks never scan the book.
+
+    A ProfileRequest profiles the engine process from the inside for a window of time (see
+    EngineProfiler), and with a profile_dir, SIGUSR1 starts and stops a cProfile profile as well.
+    While a profile is taken, the decode, book, matching, emit and request stages are timed by
+    wrapping the methods that make them up, so the engine runs its plain methods the rest of the time.
+
     Attributes:
         order_book (OrderBook): An instance or OrderBook to keep track of all orders.
+        instrument (Instrument): The instrument traded on this engine, which defines the tick size.
+        order_books (Dict[str, OrderBook]): The order book of every hosted instrument, keyed by symbol.
+        instruments (Dict[str, Instrument]): Every hosted instrument, keyed by symbol.
+        shard (int): The shard this engine serves on the message bus.
+        book_type (str): The order book implementation, either "price_level" or "ladder".
+        timer_resolution (float): The precision in seconds of order expiry times.
+        session_close (float): When DAY orders expire, in seconds after midnight UTC.
+        expiry_batch (int): The maximum number of orders expired per TimerRequest.
+        clock (float): The time of the last TimerRequest, in seconds since the epoch.
+        order_ids (OrderIdFilter): The order_ids accepted by the engine, or None when duplicates are not checked.
+        risk (RiskManager): The pre-trade risk checks and account exposures, or None to not check orders.
+        batch_size (int): The maximum number of requests processed per batch.
+        max_batch_latency (float): How long in seconds to wait for a batch to fill up, 0 to only take what is pending.
+        batch_executions (bool): Whether the events of a request are published as one EventBatch when batch_size is 1.
+        journal (Journal): The journal of the requests processed by this engine, or None.
+        snapshots (SnapshotStore): Where the engine writes and finds snapshots of its books, or None.
+        stats (EngineStats): The latency histograms and counters of the engine, or None when disabled.
+        stats_path (str): The JSON file the statistics are written to when the engine process exits, or None.
+        profiler (EngineProfiler): Takes profiles of the engine process on request.
+        profile_dir (str): The directory of the profiles, or None for the working directory without SIGUSR1 control.
+        _profile_toggle (bool): Whether SIGUSR1 asked to start or stop a profile.
+        _triggered (Deque[StopLossOrder]): Stops triggered by the current request and not matched yet.
+        _timed (bool): Whether expiries may be scheduled, so the clock has to keep up.
+        _expiring (bool): Whether due orders are left over from the last TimerRequest.
+        _next_tick (float): The time.time() at which the clock falls a tick behind.
+        _event_buffer (List): Events emitted by the current batch, or None when events are published one by one.
+        _replaying (bool): Whether journal records are being replayed, which publishes no events.
     """
 
-    def __init__(self, message_bus: MessageBus):
+    def __init__(self, message_bus: MessageBus, instrument: Instrument = None, book_type: str = "price_level", batch_size: int = 1, max_batch_latency: float = 0.0, instruments: List[Instrument] = None, shard: int = 0, journal: Journal = None, snapshots: SnapshotStore = None, stats: bool = False, stats_path: str = None, profile_dir: str = None, timer_resolution: float = 1.0, session_close: float = 0.0, expiry_batch: int = 1000, order_id_window: int = 100000, order_id_capacity: int = 1000000, risk: RiskManager = None, batch_executions: bool = False):
         super().__init__()
-        self.order_book = OrderBook()
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if expiry_batch < 1:
+            raise ValueError("expiry_batch must be at least 1")
+
+        if not instruments:
+            instruments = [instrument if instrument is not None else Instrument()]
+
         self.message_bus = message_bus
+        self.book_type = book_type
+        self.timer_resolution = timer_resolution
+        self.session_close = session_close
+        self.expiry_batch = expiry_batch
+        self.clock = 0.0
+        self.order_id_window = order_id_window
+        self.order_id_capacity = order_id_capacity
+        self.order_ids = OrderIdFilter(order_id_window, order_id_capacity) if order_id_window else None
+        self.risk = risk
+        self.instruments = {instrument.symbol: instrument for instrument in instruments}
+        self.order_books = {instrument.symbol: self.create_order_book(instrument) for instrument in instruments}
+        self.instrument = instruments[0]
+        self.order_book = self.order_books[self.instrument.symbol]
+        self.shard = shard
+        self.batch_size = batch_size
+        self.max_batch_latency = max_batch_latency
+        self.batch_executions = batch_executions
+        self.journal = journal
+        self.snapshots = snapshots
+        self.stats = EngineStats() if stats else None
+        self.stats_path = stats_path
+        self.profiler = EngineProfiler()
+        self.profile_dir = profile_dir
+        self._profile_toggle = False
+        self._triggered: Deque[StopLossOrder] = deque()
+        self._timed = False
+        self._expiring = False
+        self._next_tick = 0.0
+        self._event_buffer = None
+        self._replaying = False
 
     def run(self):
         """
         Run the Match Engine process. Overrides the multiprocessing.Process.run() function
         """
 
+        # Restore the books from the latest snapshot and the journal
+        if self.journal is not None:
+            self.recover()
+
+        # Without signal handlers the engine blocks on the request channel until a request arrives.
+        # Signals may be delivered to a helper thread of the channels, so with handlers the engine
+        # wakes up now and then to run them.
+        wake_interval = None
+        if self.stats_path is not None:
+            # Write the statistics before terminate() kills the process
+            signal.signal(signal.SIGTERM, self._terminate)
+            wake_interval = 0.1
+        if self.profile_dir is not None:
+            signal.signal(signal.SIGUSR1, self._toggle_profile)
+            wake_interval = 0.1
+
         # Subscribe to the requests channel
-        requests = self.message_bus.subscribe(message_type="request")
+        requests = self.message_bus.subscribe("request", self.shard)
+        stats = self.stats
+        clock = time.perf_counter_ns
+
+        try:
+            while True:
+                # Start or stop a profile on SIGUSR1, and end a profile whose window is over
+                if self._profile_toggle or self.profiler.deadline is not None:
+                    self.check_profile()
+
+                if self.message_bus.pending(self.shard) or (self.journal is not None and self.journal.pending):
+                    # Events are held back for slow subscribers or journal records wait for their commit,
+                    # finish that while waiting for requests
+                    try:
+                        request = requests.get(timeout=0.001)
+                    except queue.Empty:
+                        if self._timed:
+                            self.check_timers(False)
+                        self.idle()
+                        continue
+                else:
+                    # Block here until we get a request, or until the next tick of the clock is due
+                    timeout = wake_interval if self.profiler.deadline is None else 0.01
+                    if self._timed:
+                        until_tick = 0.0 if self._expiring else max(0.0, self._next_tick - time.time())
+                        timeout = until_tick if timeout is None else min(timeout, until_tick)
+                    try:
+                        request = requests.get(timeout=timeout)
+                    except queue.Empty:
+                        if self._timed:
+                            self.check_timers(False)
+                        continue
+
+                # Move the clock before the request, so it expires what is due before it is processed
+                self.check_timers(True)
+
+                if stats is not None:
+                    dequeued = clock()
+                    stats.record_queue_depth(requests.qsize())
+
+                if self.batch_size == 1 and not self.batch_executions:
+                    # Journal and process the incoming request
+                    if self.journal is not None:
+                        self.journal.append(request)
+                    if stats is None:
+                        self.process(request)
+                    else:
+                        started = clock()
+                        self.process(request)
+                        finished = clock()
+                        stats.record_request(request, dequeued, started, finished, finished)
+                else:
+                    batch = self.drain(requests, request)
+                    if self.journal is not None:
+                        for request in batch:
+                            self.journal.append(request)
+                    self.process_batch(batch, dequeued if stats is not None else None)
+
+                if self.snapshots is not None and self.journal is not None and self.snapshots.due(self.journal.sequence):
+                    self.take_snapshot()
+
+                # if self.order_book.validate_book():
+                #     print("book valid")
+                # else:
+                #     print("book invalid")
+        finally:
+            if self.stats_path is not None:
+                EngineStats.dump(self.stats_summary(), self.stats_path)
+
+    def check_timers(self, arrived: bool) -> None:
+        """
+        Sends a TimerRequest to the engine when due orders are left to expire, or when the clock is a tick
+        behind and expiries are scheduled or a request just arrived. The TimerRequest is journaled and its
+        cancels are published as one EventBatch.
+
+        Args:
+            arrived (bool): Whether a request just arrived, which the clock has to be up to date for.
+
+        Returns:
+            None
+        """
+        now = time.time()
+        if not self._expiring:
+            if now < self._next_tick:
+                return
+            if not arrived and not any(book.expiries for book in self.order_books.values()):
+                self._timed = False
+                return
+
+        request = TimerRequest(now, self.instrument.symbol)
+        if self.journal is not None:
+            self.journal.append(request)
+        self.process_batch([request], time.perf_counter_ns() if self.stats is not None else None)
+
+    def _toggle_profile(self, signum, frame) -> None:
+        self._profile_toggle = True
+
+    def _terminate(self, signum, frame) -> None:
+        EngineStats.dump(self.stats_summary(), self.stats_path)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def recover(self) -> None:
+        """
+        Restores the order books from the latest snapshot, then replays the requests journaled after it.
+        Replayed requests rebuild the books and depth sequences without publishing any event.
+
+        The cyclic garbage collector is paused meanwhile, since creating millions of orders would trigger
+        full collections over and over, and the restored objects are then frozen out of future collections.
+
+        Returns:
+            None
+        """
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._recover()
+        finally:
+            gc.freeze()
+            if gc_enabled:
+                gc.enable()
+
+    def _recover(self) -> None:
+        after = 0
+        latest = self.snapshots.latest() if self.snapshots is not None else None
+        if latest is not None:
+            after, books, order_ids, positions = SnapshotStore.load(latest)
+            if self.order_ids is not None:
+                self.order_ids = OrderIdFilter(self.order_id_window, self.order_id_capacity)
+                self.order_ids.restore(*order_ids)
+            if self.risk is not None:
+                self.risk.exposures.clear()
+                for symbol, account, position in positions:
+                    self.risk.exposure(symbol, account).position = position
+            for symbol, (sequence, execution_sequence, orders, stops, last_price, (now, current, expiries)) in books.items():
+                if symbol not in self.instruments:
+                    continue
+                book = self.create_order_book(self.instruments[symbol])
+                for order in orders:
+                    book.add_order(order)
+                for stop in stops:
+                    book.stops.add(stop)
+                if self.risk is not None:
+                    for order in orders + stops:
+                        self.risk.on_open(symbol, order)
+                book.stops.last_price = last_price
+                book.expiries.restore(now, current, expiries)
+                self.clock = max(self.clock, now)
+                self._timed = self._timed or bool(expiries)
+                book.changed_levels.clear()
+                book.sequence = sequence
+                book.execution_sequence = execution_sequence
+                self.order_books[symbol] = book
+            self.order_book = self.order_books[self.instrument.symbol]
+            self.snapshots.last_sequence = after
+
+        if not os.path.exists(self.journal.path):
+            return
+
+        self._replaying = True
+        try:
+            for _, message in Journal.read(self.journal.path, self.journal.codec, after):
+                if isinstance(message, (AddOrderRequest, CancelOrderRequest, AmendOrderRequest, TimerRequest)):
+                    self.process(message)
+        finally:
+            self._replaying = False
+
+    def take_snapshot(self) -> None:
+        """
+        Commits the journal and snapshots the books in the background, labelled with the last journal sequence.
+
+        Returns:
+            None
+        """
+        self.journal.sync()
+        self.snapshots.write_in_background(self.order_books, self.journal.sequence, self.order_ids, self.risk)
+
+    def idle(self) -> None:
+        """
+        Does the deferred work of an engine without requests: hands held-back events to slow subscribers
+        and commits the pending journal records.
+
+        Returns:
+            None
+        """
+        self.message_bus.flush(self.shard)
+        if self.journal is not None:
+            self.journal.sync()
+
+    def drain(self, requests: multiprocessing.Queue, first_request) -> List:
+        """
+        Collects a batch of requests, starting with one that was already received.
+
+        Args:
+            requests (multiprocessing.Queue): The requests channel.
+            first_request: The request that opens the batch.
+
+        Returns:
+            List: Up to batch_size requests in the order they were received.
+        """
+        batch = [first_request]
+        deadline = time.monotonic() + self.max_batch_latency
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(requests.get_nowait())
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+        return batch
+
+    def process_batch(self, requests: List, dequeued: int = None) -> None:
+        """
+        Process a batch of requests in order and publish all of their events as one EventBatch.
+
+        Args:
+            requests (List): The requests to process.
+            dequeued (int): When the first request of the batch was dequeued, in time.perf_counter_ns()
+                nanoseconds, to time the requests in the engine stats. None to not time them.
+
+        Returns:
+            None
+        """
+        self._event_buffer = []
+        timings = [] if dequeued is not None and self.stats is not None else None
+        try:
+            if timings is None:
+                for request in requests:
+                    self.process(request)
+            else:
+                for request in requests:
+                    started = time.perf_counter_ns()
+                    self.process(request)
+                    timings.append((request, started, time.perf_counter_ns()))
+        finally:
+            events, self._event_buffer = self._event_buffer, None
+            if events:
+                self.message_bus.publish("event", EventBatch(events), self.shard)
+
+        if timings:
+            published = time.perf_counter_ns()
+            for request, started, finished in timings:
+                self.stats.record_request(request, dequeued, started, finished, published)
+
+    def publish_event(self, event) -> None:
+        """
+        Publishes an event to the message bus, or holds it back for the current batch.
 
-        while True:
-            # Block here until we get a request
-            request = requests.get()
+        Args:
+            event: The event to publish.
+
+        Returns:
+            None
+        """
+        if self._replaying:
+            return
 
-            # Process the incoming request
-            self.process(request)
+        if self.stats is not None:
+            self.stats.record_event(event)
 
-            # if self.order_book.validate_book():
-            #     print("book valid")
-            # else:
-            #     print("book invalid")
+        if self.journal is not None and self.journal.record_events:
+            self.journal.append(event)
 
+        if self._event_buffer is not None:
+            self._event_buffer.append(event)
+        else:
+            self.message_bus.publish("event", event, self.shard)
 
-    def process(self, request: Union[AddOrderRequest, CancelOrderRequest, OrderBookSnapshotRequest]) -> None:
+    def process(self, request: Union[AddOrderRequest, CancelOrderRequest, AmendOrderRequest, OrderBookSnapshotRequest, EngineStatsRequest, ProfileRequest, TimerRequest]) -> None:
         """
         Process any incoming request.
 
         Args:
-            request (Union[AddOrderRequest, CancelOrderRequest, OrderBookSnapshotRequest]):
-                The incoming request to process. It can be a request to add an order,
-                cancel an order, or get an order book snapshot.
+            request (Union[AddOrderRequest, CancelOrderRequest, AmendOrderRequest, OrderBookSnapshotRequest, EngineStatsRequest, ProfileRequest, TimerRequest]):
+                The incoming request to process. It can be a request to add an order, cancel an order,
+                amend an order, get an order book snapshot, get the engine stats, profile the engine or
+                move the clock of the engine.
 
         Returns:
             None
         """
 
+        # The clock is shared by every book
+        if isinstance(request, TimerRequest):
+            self.process_timer(request)
+            return
+
+        # Switch to the book of the request's instrument
+        if request.symbol != self.instrument.symbol:
+            instrument = self.instruments.get(request.symbol)
+            if instrument is None:
+                self.emit_rejected(getattr(request, "order_id", 0), f"unknown symbol {request.symbol}", request.symbol)
+                return
+            self.instrument = instrument
+            self.order_book = self.order_books[request.symbol]
+
         # Check if the request is to add a new order
         if isinstance(request, AddOrderRequest):
             self.process_order(request)
 
         # Check if the request is one to cancel the order
         elif isinstance(request, CancelOrderRequest):
-            self.order_book.delete_order(request.order_id)
-            self.emit_cancel_order(request)
+            self.process_cancel_order(request)
+
+        # Check if the request is one to amend the order
+        elif isinstance(request, AmendOrderRequest):
+            self.process_amend_order(request)
 
         # Check if the request is one to get a snapshot of the orderbook
         elif isinstance(request, OrderBookSnapshotRequest):
-            self.process_order_book_snapshot()
+            self.process_order_book_snapshot(request)
+
+        # Check if the request is one to get the engine stats
+        elif isinstance(request, EngineStatsRequest):
+            self.process_engine_stats(request)
+
+        # Check if the request is one to start or stop profiling
+        elif isinstance(request, ProfileRequest):
+            self.process_profile(request)
+
+        # Match the stops triggered by the request
+        if self._triggered:
+            self.process_triggered_stops()
+
+        # Publish the levels the request changed
+        if self.order_book.changed_levels:
+            self.emit_depth_updates()
 
     def process_order(self, request: AddOrderRequest) -> None:
         """
         Process an incoming request of type AddOrderRequest.
 
+        A GTC, GTD or DAY limit order rests whatever it does not fill, GTD and DAY orders until they expire.
+        Market orders and IOC/FOK orders never rest: their unfilled quantity is cancelled, and a FOK order
+        that cannot fill in full is cancelled before it trades. An order with a stop price goes to the
+        stop book instead, and expires there as well. An order_id the engine accepted before is rejected,
+        and so is an order that breaks the risk limits of its account.
+
         Args:
             request (AddOrderRequest): the request to be processed
 
         Returns:
             None
         """
-        if request.price:
-            limit_order = Order(**vars(request))
-            self.process_limit_order(limit_order)
+        order_ids = self.order_ids
+        if order_ids is not None and request.order_id in order_ids:
+            self.emit_rejected(request.order_id, "duplicate order_id")
+            return
 
-        elif request.price == None:
-            market_order = Order(**vars(request))
-            self.process_market_order(market_order)
-        
-    def process_limit_order(self, limit_order: Order) -> None:
+        price = None
+        if request.price is not None:
+            try:
+                price = self.instrument.to_ticks(request.price)
+            except ValueError as error:
+                self.emit_rejected(request.order_id, str(error))
+                return
+
+            if not self.order_book.accepts_price(price):
+                self.emit_rejected(request.order_id, "price is outside the price band of the book")
+                return
+
+        stop_price = None
+        if request.stop_price is not None:
+            try:
+                stop_price = self.instrument.to_ticks(request.stop_price)
+            except ValueError as error:
+                self.emit_rejected(request.order_id, str(error))
+                return
+
+        expire_time = None
+        if request.time_in_force == "GTD":
+            if request.expire_time <= self.clock:
+                self.emit_rejected(request.order_id, "expire_time has already passed")
+                return
+            expire_time = request.expire_time
+        elif request.time_in_force == "DAY":
+            expire_time = self.next_session_close()
+
+        if self.risk is not None:
+            reason = self.risk.check(self.instrument.symbol, request.account, request.side, request.quantity, price if price is not None else stop_price,
+                                     self.order_book, self.instrument.tick_size, collar=stop_price is None)
+            if reason is not None:
+                self.emit_rejected(request.order_id, reason)
+                return
+
+        if order_ids is not None:
+            order_ids.add(request.order_id)
+
+        expiries = self.order_book.expiries
+        if expiries:
+            # Forget the expiry of an earlier order with the same order_id
+            expiries.cancel(request.order_id)
+
+        if stop_price is not None:
+            self.process_stop_order(request, price, stop_price)
+            if expire_time is not None:
+                expiries.schedule(request.order_id, expire_time)
+                self._timed = True
+        else:
+            order = Order.trusted(request.order_id, request.side, request.quantity, price, request.account)
+            self.match_order(order, request.time_in_force)
+            if expire_time is not None and self.order_book.get_order(order.order_id) is order:
+                expiries.schedule(order.order_id, expire_time)
+                self._timed = True
+
+    def next_session_close(self) -> float:
+        """
+        Returns:
+            float: The first session close after the engine clock, in seconds since the epoch.
         """
-        Process a limit order by adding it to the order book and performing matching.
+        day = 86400.0
+        return (math.floor((self.clock - self.session_close) / day) + 1) * day + self.session_close
+
+    def process_stop_order(self, request: AddOrderRequest, price: int, stop_price: int) -> None:
+        """
+        Process an incoming stop order: hold it in the stop book, or trigger it at once if the last trade
+        already reached its stop price.
 
         Args:
-            limit_order (Order): The limit order to be processed.
+            request (AddOrderRequest): the request of the stop order
+            price (int): The limit price in ticks of a stop-limit order, or None for a stop-market order.
+            stop_price (int): The stop price in ticks.
 
         Returns:
             None
         """
+        stop = StopLossOrder.trusted(request.order_id, request.side, request.quantity, stop_price, price, request.time_in_force, request.account)
+        stops = self.order_book.stops
+        if stops.is_crossed(stop):
+            self._triggered.append(stop)
+        else:
+            stops.add(stop)
+            if self.risk is not None:
+                self.risk.on_open(self.instrument.symbol, stop)
 
-        self.order_book.add_order(limit_order)
+    def process_triggered_stops(self) -> None:
+        """
+        Matches the triggered stops in the order they were triggered, including the stops that their own
+        trades trigger, until none is left.
 
-        # Perform matching algo
-        while self.order_book.bids and self.order_book.asks:
+        Returns:
+            None
+        """
+        triggered = self._triggered
+        while triggered:
+            stop = triggered.popleft()
+            self.emit_triggered(stop)
+            self.match_order(Order.trusted(stop.order_id, stop.side, stop.quantity, stop.price, stop.account), stop.time_in_force)
 
-            # Get the current best bid and best ask
-            best_bid = self.order_book.get_best_bid()
-            best_ask = self.order_book.get_best_ask()
+    def match_order(self, order: Order, time_in_force: str = "GTC") -> None:
+        """
+        Matches a new order according to its time in force.
 
-            # If the following evaluates to True, then a trade has occured
-            if best_bid.price >= best_ask.price:
+        Args:
+            order (Order): The order, with a price in ticks or None for a market order.
+            time_in_force (str): The time in force of the order.
 
-                # Pop the orders from the heaps
-                bid_order = self.order_book.remove_best_bid()
-                ask_order = self.order_book.remove_best_ask()
+        Returns:
+            None
+        """
+        if order.price is not None and time_in_force != "IOC" and time_in_force != "FOK":
+            self.process_limit_order(order)
+        else:
+            self.process_immediate_order(order, time_in_force == "FOK")
 
-                # Get the min quantity
-                trade_quantity = min(bid_order.quantity, ask_order.quantity)
+    def process_cancel_order(self, request: CancelOrderRequest) -> None:
+        """
+        Process an incoming request of type CancelOrderRequest.
 
-                # Update order quantities
-                bid_order.quantity -= trade_quantity
-                ask_order.quantity -= trade_quantity
+        Args:
+            request (CancelOrderRequest): the request to be processed
 
-                # Emit a Trade event
-                self.emit_trade(bid_order.price, trade_quantity)
-                self.emit_trade(ask_order.price, trade_quantity)
+        Returns:
+            None
+        """
+        book = self.order_book
+        if request.order_id in book.stops:
+            order = book.stops.remove(request.order_id)
+        else:
+            try:
+                order = book.delete_order(request.order_id)
+            except KeyError:
+                self.emit_rejected(request.order_id, "order_id not found in order book")
+                return
 
+        if book.expiries:
+            book.expiries.cancel(order.order_id)
+        if self.risk is not None:
+            self.risk.on_close(self.instrument.symbol, order, order.quantity)
+        self.emit_cancel_order(order)
 
-                if bid_order.quantity > 0:
-                    # Add partially filled order back to the book
-                    self.order_book.add_order(bid_order)
-                    self.emit_partial_fill(bid_order.order_id, bid_order.quantity)
-                else:
-                    # Emit fully filled message
-                    self.emit_fully_filled(bid_order.order_id)
+    def process_timer(self, request: TimerRequest) -> None:
+        """
+        Process a request to move the engine clock: advances the expiry wheel of every book and cancels
+        up to expiry_batch of the orders that expired, the orders whose expiry came first first.
+
+        Args:
+            request (TimerRequest): the request to be processed
+
+        Returns:
+            None
+        """
+        if request.now > self.clock:
+            self.clock = request.now
+        self._next_tick = (math.floor(self.clock / self.timer_resolution) + 1) * self.timer_resolution
 
-                if ask_order.quantity > 0:
-                    # Add partially filled order back to the book
-                    self.order_book.add_order(ask_order)
-                    self.emit_partial_fill(ask_order.order_id, ask_order.quantity)
+        budget = self.expiry_batch
+        expiring = False
+        for symbol, book in self.order_books.items():
+            expiries = book.expiries
+            expiries.advance(self.clock)
+            if not expiries.has_due:
+                continue
+
+            self.instrument = self.instruments[symbol]
+            self.order_book = book
+            while budget > 0:
+                order_id = expiries.pop_due()
+                if order_id is None:
+                    break
+                if order_id in book.stops:
+                    order = book.stops.remove(order_id)
+                elif book.get_order(order_id) is not None:
+                    order = book.delete_order(order_id)
                 else:
-                    # Emit fully filled message
-                    self.emit_fully_filled(ask_order.order_id)
+                    # Filled or cancelled since it was scheduled
+                    continue
+                budget -= 1
+                if self.risk is not None:
+                    self.risk.on_close(symbol, order, order.quantity)
+                self.emit_cancel_order(order, "expired")
+
+            if book.changed_levels:
+                self.emit_depth_updates()
+            expiring = expiring or expiries.has_due
+
+        self._expiring = expiring
+
+    def process_amend_order(self, request: AmendOrderRequest) -> None:
+        """
+        Process an incoming request of type AmendOrderRequest.
+
+        A quantity reduction at the same price is applied in place and keeps the order's queue priority.
+        A new price or a larger quantity cancels the order and replaces it in the same step, matching
+        it against the book at its new price before resting it at the back of the queue, once the
+        replacement passes the risk checks.
 
+        Args:
+            request (AmendOrderRequest): the request to be processed
+
+        Returns:
+            None
+        """
+        order = self.order_book.get_order(request.order_id)
+        if order is None:
+            if request.order_id in self.order_book.stops:
+                self.emit_rejected(request.order_id, "pending stop orders cannot be amended")
             else:
+                self.emit_rejected(request.order_id, "order_id not found in order book")
+            return
+
+        risk = self.risk
+        if request.quantity <= 0:
+            if self.order_book.expiries:
+                self.order_book.expiries.cancel(order.order_id)
+            if risk is not None:
+                risk.on_close(self.instrument.symbol, order, order.quantity)
+            self.emit_cancel_order(self.order_book.delete_order(order.order_id))
+            return
+
+        try:
+            price = order.price if request.price is None else self.instrument.to_ticks(request.price)
+        except ValueError as error:
+            self.emit_rejected(request.order_id, str(error))
+            return
+
+        if not self.order_book.accepts_price(price):
+            self.emit_rejected(request.order_id, "price is outside the price band of the book")
+            return
+
+        if price == order.price and request.quantity <= order.quantity:
+            # Reduce in place, the order keeps its place in the queue
+            if risk is not None:
+                risk.on_close(self.instrument.symbol, order, order.quantity - request.quantity)
+            self.order_book.reduce_order(order, order.quantity - request.quantity)
+            self.emit_amended(order)
+        else:
+            if risk is not None:
+                reason = risk.check(self.instrument.symbol, order.account, order.side, request.quantity, price, self.order_book,
+                                    self.instrument.tick_size, replacing=order)
+                if reason is not None:
+                    self.emit_rejected(request.order_id, reason)
+                    return
+                risk.on_close(self.instrument.symbol, order, order.quantity)
+
+            # Cancel-replace, the order loses its time priority
+            self.order_book.delete_order(order.order_id)
+            order.quantity = request.quantity
+            order.price = price
+            self.emit_amended(order)
+            self.process_limit_order(order)
+
+    def process_limit_order(self, limit_order: Order) -> None:
+        """
+        Process a limit order by matching it against the opposite side and resting any remainder in the book.
+
+        Args:
+            limit_order (Order): The limit order to be processed.
+
+        Returns:
+            None
+        """
+        self.sweep(limit_order)
+
+        # Rest whatever is left of the order at the back of its price level
+        if limit_order.quantity > 0:
+            self.order_book.add_order(limit_order)
+            if self.risk is not None:
+                self.risk.on_open(self.instrument.symbol, limit_order)
+
+    def process_immediate_order(self, order: Order, fill_or_kill: bool = False) -> None:
+        """
+        Process a market or IOC order by matching it against the opposite side and cancelling any remainder.
+
+        Args:
+            order (Order): The order to be processed, with a price of None for a market order.
+            fill_or_kill (bool): Whether the order is cancelled untouched unless it can fill in full (FOK).
+
+        Returns:
+            None
+        """
+        # The aggregate level quantities tell whether a FOK order fills before any order is touched
+        if fill_or_kill and not self.order_book.can_fill(order.side, order.quantity, order.price):
+            self.emit_cancel_order(order, "fill or kill")
+            return
+
+        self.sweep(order)
+
+        if order.quantity > 0:
+            self.emit_cancel_order(order, "unfilled")
+
+    def sweep(self, order: Order) -> None:
+        """
+        Matches an incoming order against the opposite side of the book in one pass, walking the levels
+        from the best price until the order is filled or no longer crosses (any level for a market order).
+
+        A level that the order takes in full is removed with all its orders at once, and only the last
+        level is consumed order by order in time priority. Every match of the incoming order with a resting
+        order is reported by one ExecutionEvent at the resting order's price, which carries the quantities
+        left on both orders, so no separate trade or fill events are published. The order's quantity is
+        left at its unfilled remainder.
+
+        Args:
+            order (Order): The incoming order, with a price in ticks or None for a market order.
+
+        Returns:
+            None
+        """
+        book = self.order_book
+        buying = order.side == "buy"
+        opposite = book.asks if buying else book.bids
+        limit = order.price
+        remaining = order.quantity
+        risk = self.risk
+        symbol = self.instrument.symbol
+        aggressor_id = order.order_id
+
+        while remaining > 0:
+            level = opposite.best_level()
+            if level is None or (limit is not None and (level.price > limit if buying else level.price < limit)):
                 break
 
-    def process_market_order(self, market_order: Order) -> None:
+            price = level.price
+            if remaining >= level.quantity:
+                # Take the whole level
+                for resting_order in book.remove_best_level(opposite.side):
+                    quantity = resting_order.quantity
+                    remaining -= quantity
+                    if risk is not None:
+                        risk.on_fill(symbol, resting_order, quantity, True)
+                    self.emit_execution(aggressor_id, resting_order.order_id, price, quantity, remaining, 0)
+                self.trigger_stops(price)
+                continue
+
+            # Fill the level partially, oldest orders first
+            while remaining > 0:
+                resting_order = level.head()
+                quantity = min(remaining, resting_order.quantity)
+                remaining -= quantity
+                if risk is not None:
+                    risk.on_fill(symbol, resting_order, quantity, True)
+                book.reduce_order(resting_order, quantity)
+                self.emit_execution(aggressor_id, resting_order.order_id, price, quantity, remaining, resting_order.quantity)
+            self.trigger_stops(price)
+
+        if risk is not None and remaining < order.quantity:
+            risk.on_fill(symbol, order, order.quantity - remaining, False)
+        order.quantity = remaining
+
+    def emit_execution(self, aggressor_id: int, resting_id: int, price: int, quantity: int, aggressor_remaining: int, resting_remaining: int) -> None:
         """
-        Process an incoming match order.
+        Publishes an execution message to the message bus, numbered by the execution sequence of the
+        instrument's order book.
 
         Args:
-            market_order (Order): The market order to be matched.
+            aggressor_id (int): Unique identifier of the incoming order.
+            resting_id (int): Unique identifier of the resting order it matched.
+            price (int): The price in ticks of the resting order.
+            quantity (int): The amount that traded.
+            aggressor_remaining (int): The amount of the incoming order left to match.
+            resting_remaining (int): The amount of the resting order left in the book.
 
         Returns:
             None
         """
-        if market_order.side == "buy":
+        book = self.order_book
+        book.execution_sequence += 1
+        self.publish_event(ExecutionEvent.trusted(aggressor_id, resting_id, price, quantity, aggressor_remaining, resting_remaining, book.execution_sequence, self.instrument.symbol))
 
-            # Continue to match against bid orders until we have exhausted quantity
-            while self.order_book.asks and market_order.quantity > 0 and self.order_book.asks[0].price <= market_order.price:
-                resting_order = self.order_book.remove_best_ask()
+    def trigger_stops(self, price: int) -> None:
+        """
+        Triggers the pending stops that a trade at the given price reached. They are queued and matched
+        once the current order is done.
 
-                if resting_order.quantity <= market_order.quantity:
-                    # Fully fill resting order
-                    self.emit_trade(resting_order.price, market_order.quantity)
-                    self.emit_fully_filled(resting_order.order_id)
-                    market_order.quantity -= resting_order.quantity
-                else:
-                    # Partially fill resting order
-                    resting_order.quantity -= market_order.quantity
-                    self.order_book.add_order(resting_order)
-                    self.emit_trade()
-                    self.emit_partial_fill(resting_order.order_id, resting_order.quantity)
-                    market_order.quantity = 0
-
-            if market_order.quantity > 0:
-                self.order_book.add_order(market_order)
-
-        elif market_order.side == "sell":
-
-            # Continue to match with ask orders until we have exhausted quantity
-            while self.order_book.bids and market_order.quantity > 0 and self.order_book.bids[0].price >= market_order.price:
-                resting_order = self.order_book.remove_best_bid()
-
-                if resting_order.quantity <= market_order.quantity:
-                    # Fully fill resting order
-                    self.emit_trade(resting_order.price, market_order.quantity)
-                    self.emit_fully_filled(resting_order.order_id)
-                    market_order.quantity -= resting_order.quantity
-                else:
-                    # Partially fill resting order
-                    resting_order.quantity -= market_order.quantity
-                    self.order_book.add_order(resting_order)
-                    self.emit_trade()
-                    self.emit_partial_fill(resting_order.order_id, resting_order.quantity)
-                    market_order.quantity = 0
+        Args:
+            price (int): Indicates the price in ticks at which the trade happened.
+
+        Returns:
+            None
+        """
+        triggered = self.order_book.stops.trigger(price)
+        if triggered:
+            if self.risk is not None:
+                for stop in triggered:
+                    self.risk.on_close(self.instrument.symbol, stop, stop.quantity)
+            self._triggered.extend(triggered)
+
+    def emit_cancel_order(self, order: Order, reason: str = "requested") -> None:
+        """
+        Publishes an order cancelled message to the message bus
+
+        Args:
+            order (Order): The order that was removed from the book.
+            reason (str): Why the order was cancelled (see OrderCancelEvent).
+
+        Returns:
+            None
+        """
+        response = OrderCancelEvent(order.order_id, order.side, order.quantity, order.price, self.instrument.symbol, reason)
+        self.publish_event(response)
 
-            if market_order.quantity > 0:
-                self.order_book.add_order(market_order)
+    def emit_amended(self, order: Order) -> None:
+        """
+        Publishes an order amended message to the message bus
 
+        Args:
+            order (Order): The order after the amendment.
 
+        Returns:
+            None
+        """
+        response = OrderAmendedEvent(order.order_id, order.side, order.quantity, order.price, self.instrument.symbol)
+        self.publish_event(response)
 
-    def emit_trade(self, price: float, quantity: int) -> None:
+    def emit_triggered(self, stop: StopLossOrder) -> None:
         """
-        Publishes a trade message to the message bus.
+        Publishes a stop triggered message to the message bus
 
         Args:
-            price (float): Indicates the price at which the trade happened.
-            quantity (int): the amount that traded.
+            stop (StopLossOrder): The triggered stop order.
 
         Returns:
             None
         """
+        response = OrderTriggeredEvent(stop.order_id, stop.side, stop.quantity, stop.price, stop.stop_price, self.instrument.symbol)
+        self.publish_event(response)
+
+    def emit_depth_updates(self) -> None:
+        """
+        Publishes a DepthUpdate with the new aggregate quantity of every level changed by the current request,
+        numbered by the sequence of the instrument's order book.
 
-        response = TradeEvent(price, quantity)
-        self.message_bus.publish("event", response)
-        
+        Returns:
+            None
+        """
+        book = self.order_book
+        symbol = self.instrument.symbol
+        for side, price, quantity in book.pop_changed_levels():
+            book.sequence += 1
+            self.publish_event(DepthUpdate.trusted(side, price, quantity, book.sequence, symbol))
 
-    def emit_fully_filled(self, order_id: int) -> None:
+    def emit_rejected(self, order_id: int, reason: str, symbol: str = None) -> None:
         """
-        Publishes a fully filled message to the message bus
+        Publishes a rejected request message to the message bus
 
         Args:
-            order_id (int): Unique identifier of the order that was fully filled.
+            order_id (int): Unique identifier of the order the request referred to.
+            reason (str): Why the request was rejected.
+            symbol (str): Symbol of the request, if it is not the current instrument's.
 
         Returns:
             None
         """
+        response = OrderRejectedEvent(order_id, reason, symbol if symbol is not None else self.instrument.symbol)
+        self.publish_event(response)
+
+    def process_order_book_snapshot(self, request: OrderBookSnapshotRequest) -> None:
+        """
+        Process a request to get a snapshot of the order book, aggregated by price level. The snapshot carries
+        the sequence number of the last depth update, so consumers can resume the update stream right after it.
+
+        Args:
+            request (OrderBookSnapshotRequest): the request to be processed
 
-        response = OrderFullyFilled(order_id)
-        self.message_bus.publish("event", response)
+        Returns:
+            None
+        """
+        book = self.order_book
+        bids, asks = book.get_bid_levels(request.depth), book.get_ask_levels(request.depth)
+        self.publish_event(OrderBookSnapshot(bids, asks, book.sequence, self.instrument.symbol))
 
-    def emit_partial_fill(self, order_id: int, remaining_quantity: int) -> None:
+    def process_engine_stats(self, request: EngineStatsRequest) -> None:
         """
-        Publishes a partially filled message to the message bus
+        Process a request to get the latency histograms and counters of the engine.
 
         Args:
-            order_id (int): Unique identifier of the order that was fully filled.
-            remaining_quantity (int): The amount remaining. 
+            request (EngineStatsRequest): the request to be processed
+
         Returns:
             None
         """
-        response = OrderPartiallyFilled(order_id, remaining_quantity)
-        self.message_bus.publish("event", response)
-    
-    def emit_cancel_order(self, message: OrderCancelEvent) -> None:
-        response = OrderCancelEvent(**vars(message))
-        self.message_bus.publish("event", response)
+        self.publish_event(EngineStatsEvent(self.shard, self.stats_summary(), request.symbol))
+
+    def stats_summary(self) -> Dict:
+        """
+        Summarizes the statistics of the engine.
+
+        Returns:
+            Dict: The EngineStats summary when stats are enabled, and the journal stats under "journal"
+            when the engine has a journal.
+        """
+        summary = self.stats.summary() if self.stats is not None else {}
+        if self.journal is not None:
+            summary["journal"] = self.journal.stats()
+        return summary
 
-    def process_order_book_snapshot(self) -> None:
+    def process_profile(self, request: ProfileRequest) -> None:
         """
-        Process a request to get a snapshot of the order book
+        Process a request to start or stop profiling the engine.
+
+        Args:
+            request (ProfileRequest): the request to be processed
 
         Returns:
             None
         """
+        try:
+            if request.action == "start":
+                self.start_profile(request.mode, request.path, request.seconds, request.symbol)
+            else:
+                self.stop_profile(request.symbol)
+        except ValueError as error:
+            self.emit_rejected(0, str(error), request.symbol)
 
-        response = "\n"
-        for ask in self.order_book.get_asks():
-            response += f"#S0{ask.order_id}\t{ask.price}\t{ask.quantity}\n"
-        response += "\n"
-        for bid in self.order_book.get_bids():
-            response += f"#B0{bid.order_id}\t{bid.price}\t{bid.quantity}\n"
+    def start_profile(self, mode: str = "cprofile", path: str = "", seconds: float = None, symbol: str = None) -> None:
+        """
+        Starts profiling the engine and times the stages of request processing: decoding requests off a
+        binary channel, book updates, matching, emitting events, and whole requests.
 
-        self.message_bus.publish("event", OrderBookSnapshot(response))
+        Args:
+            mode (str): The profiler to use, "cprofile" or "sample".
+            path (str): The file to save the profile to, relative to profile_dir, or "" to name it after the shard and the time.
+            seconds (float): How long to profile for, or None to profile until stop_profile is called.
+            symbol (str): Symbol of the request that started the profile, if it is not the current instrument's.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: if a profile is already being taken or the mode is unknown.
+        """
+        if not path:
+            extension = "prof" if mode == "cprofile" else "folded"
+            path = f"shard-{self.shard}-{time.strftime('%Y%m%d-%H%M%S')}.{extension}"
+        path = os.path.join(self.profile_dir or ".", path)
+
+        timers = self.profiler.start(mode, path, seconds)
+        codec = getattr(self.message_bus.subscribe("request", self.shard), "codec", None)
+        if codec is not None:
+            timers.install("decode", codec, "decode")
+        for book in self.order_books.values():
+            timers.install("book", book, "add_order", "delete_order", "reduce_order", "remove_best_level", "can_fill")
+        timers.install("matching", self, "process_limit_order", "process_immediate_order")
+        timers.install("emit", self, "publish_event", "emit_depth_updates")
+        timers.install("request", self, "process")
+
+        self.publish_event(ProfileEvent("started", path, symbol if symbol is not None else self.instrument.symbol))
+
+    def stop_profile(self, symbol: str = None) -> None:
+        """
+        Stops profiling the engine and saves the profile.
+
+        Args:
+            symbol (str): Symbol of the request that stopped the profile, if it is not the current instrument's.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: if no profile is being taken.
+        """
+        path = self.profiler.stop()
+        self.publish_event(ProfileEvent("stopped", path, symbol if symbol is not None else self.instrument.symbol))
+
+    def check_profile(self) -> None:
+        """
+        Starts or stops a cProfile profile as asked by SIGUSR1, and stops a profile whose window is over.
+
+        Returns:
+            None
+        """
+        toggle, self._profile_toggle = self._profile_toggle, False
+        if self.profiler.active and (toggle or self.profiler.expired()):
+            self.stop_profile()
+        elif toggle and not self.profiler.active:
+            self.start_profile()
 
     def next_order_id(self) -> int:
-        return len(self.order_book.asks) + len(self.order_book.bids)
+        return len(self.order_book)
 
 
     def reset_book(self) -> None:
         """
-        Resets the order book, for testing purposes mostly 
+        Resets the order book of every instrument and forgets the accepted order_ids and account exposures, for testing purposes mostly 
 
         Returns:
             None
         """
-        self.order_book = OrderBook()
\ No newline at end of file
+        for symbol, instrument in self.instruments.items():
+            self.order_books[symbol] = self.create_order_book(instrument)
+        self.order_book = self.order_books[self.instrument.symbol]
+        if self.order_ids is not None:
+            self.order_ids = OrderIdFilter(self.order_id_window, self.order_id_capacity)
+        if self.risk is not None:
+            self.risk.exposures.clear()
+
+    def create_order_book(self, instrument: Instrument) -> OrderBook:
+        """
+        Creates an empty order book of the configured book_type.
+
+        Args:
+            instrument (Instrument): The instrument the book is for.
+
+        Returns:
+            OrderBook: The new order book.
+
+        Raises:
+            ValueError: if the book_type is unknown, or the ladder is requested for an instrument without a price band.
+        """
+        if self.book_type == "price_level":
+            return OrderBook(timer_resolution=self.timer_resolution)
+        elif self.book_type == "ladder":
+            min_price, max_price = instrument.price_band_ticks()
+            return LadderOrderBook(min_price, max_price, timer_resolution=self.timer_resolution)
+        raise ValueError(f"unknown book_type {self.book_type}")
\ No newline at end of file
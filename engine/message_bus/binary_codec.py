@@ -0,0 +1,337 @@
+import json
+import struct
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+# requests
+from ..requests.add_order_request import AddOrderRequest, TIME_IN_FORCE
+from ..requests.cancel_order_request import CancelOrderRequest
+from ..requests.amend_order_request import AmendOrderRequest
+from ..requests.order_book_snapshot_request import OrderBookSnapshotRequest
+from ..requests.engine_stats_request import EngineStatsRequest
+from ..requests.profile_request import ProfileRequest
+from ..requests.timer_request import TimerRequest
+# events
+from ..events.trade_event import TradeEvent
+from ..events.order_fully_filled import OrderFullyFilled
+from ..events.order_partially_filled import OrderPartiallyFilled
+from ..events.order_book_snapshot import OrderBookSnapshot
+from ..events.depth_update import DepthUpdate
+from ..events.order_cancel_event import OrderCancelEvent
+from ..events.order_amended_event import OrderAmendedEvent
+from ..events.order_rejected_event import OrderRejectedEvent
+from ..events.event_batch import EventBatch
+from ..events.engine_stats_event import EngineStatsEvent
+from ..events.profile_event import ProfileEvent
+from ..events.order_triggered_event import OrderTriggeredEvent
+from ..events.execution_event import ExecutionEvent
+
+# Length prefix of a frame when messages are written to a file or a socket
+FRAME_HEADER = struct.Struct("<I")
+
+# Field kinds and their fixed-size layout. Optional fields carry a presence flag. Strings, JSON
+# documents and level lists carry a length prefix, with the utf-8 bytes or (price, quantity) pairs
+# appended after the fixed part of the message.
+_KIND_FORMATS = {
+    "int": "q",
+    "int?": "Bq",
+    "float": "d",
+    "float?": "Bd",
+    "side": "B",
+    "tif": "B",
+    "str": "I",
+    "json": "I",
+    "levels": "I",
+}
+
+_LEVEL = struct.Struct("<qq")
+
+_SIDES = {"buy": 0, "sell": 1}
+_SIDE_NAMES = ("buy", "sell")
+
+_TIME_IN_FORCE = {name: code for code, name in enumerate(TIME_IN_FORCE)}
+
+
+class _Schema:
+    """
+    Fixed binary layout of one message type.
+
+    Attributes:
+        cls (type): The message class.
+        tag (int): The type tag written in front of every message of this type.
+        fields (List[Tuple[str, str]]): (attribute, kind) pairs in wire order.
+        validate (bool): Whether decoding goes through the class constructor (requests) or skips it (events).
+        layout (struct.Struct): The fixed-size part of the message, tag included.
+    """
+
+    __slots__ = ("cls", "tag", "fields", "validate", "layout")
+
+    def __init__(self, cls: type, tag: int, fields: List[Tuple[str, str]], validate: bool):
+        self.cls = cls
+        self.tag = tag
+        self.fields = fields
+        self.validate = validate
+        self.layout = struct.Struct("<B" + "".join(_KIND_FORMATS[kind] for _, kind in fields))
+
+
+class BinaryCodec:
+    """
+    Encodes requests and events to a compact fixed-layout binary format and back.
+
+    Every message starts with a one byte type tag followed by its fields packed with struct (little
+    endian, no padding). Strings, level lists and nested batches are length-prefixed and appended after the fixed
+    part. Requests are decoded through their validating constructors, since they come from outside
+    the engine, while events are rebuilt without re-running validation.
+
+    The same encoding is used on the MessageBus and, with a length prefix per message, in files and
+    on sockets (see write, read and iter_messages).
+
+    Attributes:
+        _by_type (Dict[type, _Schema]): Message layouts keyed by class.
+        _by_tag (Dict[int, _Schema]): Message layouts keyed by type tag.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new BinaryCodec with the layouts of every request and event type.
+        """
+        self._by_type: Dict[type, _Schema] = {}
+        self._by_tag: Dict[int, _Schema] = {}
+
+        symbol = ("symbol", "str")
+        order_fields = [("order_id", "int"), ("side", "side"), ("quantity", "int"), ("price", "float?"), symbol]
+        order_state_fields = [("order_id", "int"), ("side", "side"), ("quantity", "int"), ("price", "int"), symbol]
+
+        # requests
+        self.register(AddOrderRequest, 1, order_fields + [("time_in_force", "tif"), ("stop_price", "float?"), ("expire_time", "float?"), ("account", "str")], validate=True)
+        self.register(CancelOrderRequest, 2, order_fields, validate=True)
+        self.register(AmendOrderRequest, 3, order_fields, validate=True)
+        self.register(OrderBookSnapshotRequest, 4, [symbol, ("depth", "int?")], validate=True)
+        self.register(EngineStatsRequest, 5, [symbol], validate=True)
+        self.register(ProfileRequest, 6, [("action", "str"), ("mode", "str"), ("seconds", "float?"), ("path", "str"), symbol], validate=True)
+        self.register(TimerRequest, 7, [("now", "float"), symbol], validate=True)
+
+        # events
+        self.register(TradeEvent, 64, [("price", "int"), ("quantity", "int"), symbol])
+        self.register(OrderFullyFilled, 65, [("order_id", "int"), symbol])
+        self.register(OrderPartiallyFilled, 66, [("order_id", "int"), ("remaining_quantity", "int"), symbol])
+        # A cancelled market order has no price
+        self.register(OrderCancelEvent, 67, order_state_fields[:3] + [("price", "int?"), symbol, ("reason", "str")])
+        self.register(OrderAmendedEvent, 68, order_state_fields)
+        self.register(OrderRejectedEvent, 69, [("order_id", "int"), ("reason", "str"), symbol])
+        self.register(OrderBookSnapshot, 70, [("bids", "levels"), ("asks", "levels"), ("sequence", "int"), symbol])
+        self.register(DepthUpdate, 71, [("side", "side"), ("price", "int"), ("quantity", "int"), ("sequence", "int"), symbol])
+        self.register(EngineStatsEvent, 72, [("shard", "int"), ("stats", "json"), symbol])
+        self.register(ProfileEvent, 73, [("status", "str"), ("path", "str"), symbol])
+        self.register(OrderTriggeredEvent, 74, order_state_fields[:3] + [("price", "int?"), ("stop_price", "int"), symbol])
+        self.register(ExecutionEvent, 75, [("aggressor_id", "int"), ("resting_id", "int"), ("price", "int"), ("quantity", "int"),
+                                           ("aggressor_remaining", "int"), ("resting_remaining", "int"), ("sequence", "int"), symbol])
+        self.register(EventBatch, 127, [])
+
+    def register(self, cls: type, tag: int, fields: List[Tuple[str, str]], validate: bool = False) -> None:
+        """
+        Registers the binary layout of a message type.
+
+        Args:
+            cls (type): The message class.
+            tag (int): A type tag between 0 and 255, unique to this class.
+            fields (List[Tuple[str, str]]): (attribute, kind) pairs in wire order. Kinds are "int", "int?",
+                "float", "float?", "side", "tif", "str", "json" and "levels".
+            validate (bool): Whether decoded messages are built through the class constructor.
+
+        Raises:
+            ValueError: if the tag is already taken.
+        """
+        if tag in self._by_tag:
+            raise ValueError(f"type tag {tag} is already registered")
+
+        schema = _Schema(cls, tag, fields, validate)
+        self._by_type[cls] = schema
+        self._by_tag[tag] = schema
+
+    def encode(self, message) -> bytes:
+        """
+        Encodes a request or event.
+
+        Args:
+            message: The message to encode.
+
+        Returns:
+            bytes: The encoded message.
+
+        Raises:
+            TypeError: if the message type has no registered layout.
+        """
+        schema = self._by_type.get(type(message))
+        if schema is None:
+            raise TypeError(f"no binary layout for {type(message).__name__}")
+
+        if schema.cls is EventBatch:
+            parts = [bytes((schema.tag,)), FRAME_HEADER.pack(len(message.events))]
+            for event in message.events:
+                payload = self.encode(event)
+                parts.append(FRAME_HEADER.pack(len(payload)))
+                parts.append(payload)
+            return b"".join(parts)
+
+        values = [schema.tag]
+        tail = []
+        for attr, kind in schema.fields:
+            value = getattr(message, attr)
+            if kind == "int" or kind == "float":
+                values.append(value)
+            elif kind == "side":
+                if value not in _SIDES:
+                    raise ValueError(f"cannot encode side {value!r}")
+                values.append(_SIDES[value])
+            elif kind == "tif":
+                if value not in _TIME_IN_FORCE:
+                    raise ValueError(f"cannot encode time in force {value!r}")
+                values.append(_TIME_IN_FORCE[value])
+            elif kind == "str":
+                data = value.encode("utf-8")
+                values.append(len(data))
+                tail.append(data)
+            elif kind == "json":
+                data = json.dumps(value).encode("utf-8")
+                values.append(len(data))
+                tail.append(data)
+            elif kind == "levels":
+                values.append(len(value))
+                tail.extend(_LEVEL.pack(price, quantity) for price, quantity in value)
+            elif value is None:
+                values += (0, 0)
+            else:
+                values += (1, value)
+
+        fixed = schema.layout.pack(*values)
+        return fixed + b"".join(tail) if tail else fixed
+
+    def decode(self, data: bytes):
+        """
+        Decodes a request or event.
+
+        Args:
+            data (bytes): The encoded message.
+
+        Returns:
+            The decoded message.
+
+        Raises:
+            ValueError: if the type tag is unknown.
+            TypeError: if a decoded request fails validation.
+        """
+        message, _ = self._decode_from(memoryview(data), 0)
+        return message
+
+    def _decode_from(self, data: memoryview, offset: int):
+        schema = self._by_tag.get(data[offset])
+        if schema is None:
+            raise ValueError(f"unknown type tag {data[offset]}")
+
+        if schema.cls is EventBatch:
+            (count,) = FRAME_HEADER.unpack_from(data, offset + 1)
+            offset += 1 + FRAME_HEADER.size
+            events = []
+            for _ in range(count):
+                (length,) = FRAME_HEADER.unpack_from(data, offset)
+                offset += FRAME_HEADER.size
+                event, _ = self._decode_from(data[offset:offset + length], 0)
+                events.append(event)
+                offset += length
+            return EventBatch(events), offset
+
+        values = schema.layout.unpack_from(data, offset)
+        offset += schema.layout.size
+        fields = {}
+        index = 1
+        for attr, kind in schema.fields:
+            if kind == "int" or kind == "float":
+                fields[attr] = values[index]
+                index += 1
+            elif kind == "side":
+                fields[attr] = _SIDE_NAMES[values[index]]
+                index += 1
+            elif kind == "tif":
+                fields[attr] = TIME_IN_FORCE[values[index]]
+                index += 1
+            elif kind == "str":
+                length = values[index]
+                fields[attr] = str(data[offset:offset + length], "utf-8")
+                offset += length
+                index += 1
+            elif kind == "json":
+                length = values[index]
+                fields[attr] = json.loads(str(data[offset:offset + length], "utf-8"))
+                offset += length
+                index += 1
+            elif kind == "levels":
+                count = values[index]
+                fields[attr] = [_LEVEL.unpack_from(data, offset + i * _LEVEL.size) for i in range(count)]
+                offset += count * _LEVEL.size
+                index += 1
+            else:
+                fields[attr] = values[index + 1] if values[index] else None
+                index += 2
+
+        if schema.validate:
+            return schema.cls(**fields), offset
+
+        message = schema.cls.__new__(schema.cls)
+        for attr, value in fields.items():
+            setattr(message, attr, value)
+        return message, offset
+
+    def write(self, stream: BinaryIO, message) -> int:
+        """
+        Writes a length-prefixed message to a binary file or socket stream.
+
+        Args:
+            stream (BinaryIO): The stream to write to.
+            message: The message to write.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        payload = self.encode(message)
+        stream.write(FRAME_HEADER.pack(len(payload)) + payload)
+        return FRAME_HEADER.size + len(payload)
+
+    def read(self, stream: BinaryIO) -> Optional[object]:
+        """
+        Reads one length-prefixed message from a binary file or socket stream.
+
+        Args:
+            stream (BinaryIO): The stream to read from.
+
+        Returns:
+            The decoded message, or None at the end of the stream.
+
+        Raises:
+            EOFError: if the stream ends in the middle of a message.
+        """
+        header = stream.read(FRAME_HEADER.size)
+        if not header:
+            return None
+        if len(header) < FRAME_HEADER.size:
+            raise EOFError("truncated frame header")
+
+        (length,) = FRAME_HEADER.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise EOFError("truncated frame")
+        return self.decode(payload)
+
+    def iter_messages(self, stream: BinaryIO) -> Iterator:
+        """
+        Streams every length-prefixed message of a binary file or socket stream.
+
+        Args:
+            stream (BinaryIO): The stream to read from.
+
+        Returns:
+            Iterator: The decoded messages, in order.
+        """
+        while True:
+            message = self.read(stream)
+            if message is None:
+                return
+            yield message
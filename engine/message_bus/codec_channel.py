@@ -0,0 +1,43 @@
+import multiprocessing
+
+
+class CodecChannel:
+    """
+    Represents a message bus channel whose messages travel encoded as bytes.
+
+    It wraps the underlying multiprocessing.Queue and exposes the same put/get interface, encoding
+    messages on the way in and decoding them on the way out.
+
+    Attributes:
+        queue (multiprocessing.Queue): The underlying queue carrying the encoded messages.
+        codec: The codec used to encode and decode messages (see BinaryCodec).
+    """
+
+    def __init__(self, queue: multiprocessing.Queue, codec):
+        """
+        Initialize a new CodecChannel.
+
+        Args:
+            queue (multiprocessing.Queue): The underlying queue carrying the encoded messages.
+            codec: The codec used to encode and decode messages.
+        """
+        self.queue = queue
+        self.codec = codec
+
+    def put(self, message, block: bool = True, timeout: float = None) -> None:
+        self.queue.put(self.codec.encode(message), block, timeout)
+
+    def put_nowait(self, message) -> None:
+        self.queue.put_nowait(self.codec.encode(message))
+
+    def get(self, block: bool = True, timeout: float = None):
+        return self.codec.decode(self.queue.get(block, timeout))
+
+    def get_nowait(self):
+        return self.codec.decode(self.queue.get_nowait())
+
+    def qsize(self) -> int:
+        return self.queue.qsize()
+
+    def empty(self) -> bool:
+        return self.queue.empty()
@@ -0,0 +1,76 @@
+from collections import deque
+from typing import Callable, Deque
+
+
+class LocalMessageBus:
+    """
+    Represents an in-process message bus, for running a MatchEngine without starting its process.
+
+    It offers the publishing side of MessageBus to an engine whose process is called directly (for
+    instance engine.process(request)), handing every event to a sink function or keeping it in a
+    queue, with no pickling, encoding or inter-process communication in between.
+
+    Attributes:
+        sink (Callable): Called with every published event, or None to keep the events in events.
+        requests (Deque): Requests published on the bus, in order.
+        events (Deque): Published events when there is no sink, in order.
+    """
+
+    def __init__(self, sink: Callable = None):
+        """
+        Initialize a new LocalMessageBus.
+
+        Args:
+            sink (Callable): Called with every published event, or None to keep the events in events.
+        """
+        self.sink = sink
+        self.requests: Deque = deque()
+        self.events: Deque = deque()
+        self.shards = 1
+
+    def subscribe(self, channel: str, shard: int = 0, **options) -> Deque:
+        """
+        Subscribe to a specific channel.
+
+        Args:
+            channel (str): The specific channel to subscribe to.
+
+        Returns:
+            Deque: The requests or the kept events.
+        """
+        if channel == "request":
+            return self.requests
+        elif channel == "event":
+            return self.events
+
+    def publish(self, channel: str, message, shard: int = 0) -> None:
+        """
+        Publish a message on a specific channel.
+
+        Args:
+            channel (str): The specific channel to publish to.
+            message: The request or event to publish.
+            shard (int): Unused, there is a single shard.
+
+        Returns:
+            None
+        """
+        if channel == "request":
+            self.requests.append(message)
+        elif channel == "event":
+            if self.sink is not None:
+                self.sink(message)
+            else:
+                self.events.append(message)
+
+    def pending(self, shard: int = 0) -> bool:
+        return False
+
+    def flush(self, shard: int = 0) -> bool:
+        return False
+
+    def lag(self) -> dict:
+        return {"local": len(self.events)}
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,71 @@
+import queue
+import time
+from typing import List
+
+
+class MergedChannel:
+    """
+    Represents the merged view of several channels, read in rotation.
+
+    Used to read the events of every shard when each shard publishes on its own channel. Messages of
+    one channel keep their order, so the events of a symbol, which always comes from the same shard,
+    stay in order in the merged stream.
+
+    Attributes:
+        channels (List): The channels to read from.
+        max_sleep (float): The longest single sleep while waiting for a message, in seconds.
+        _next (int): The channel to try first on the next read.
+    """
+
+    def __init__(self, channels: List, max_sleep: float = 0.001):
+        """
+        Initialize a new MergedChannel.
+
+        Args:
+            channels (List): The channels to read from.
+            max_sleep (float): The longest single sleep while waiting for a message, in seconds.
+        """
+        self.channels = channels
+        self.max_sleep = max_sleep
+        self._next = 0
+
+    def get_nowait(self):
+        for _ in range(len(self.channels)):
+            channel = self.channels[self._next]
+            self._next = (self._next + 1) % len(self.channels)
+            try:
+                return channel.get_nowait()
+            except queue.Empty:
+                pass
+        raise queue.Empty
+
+    def get(self, block: bool = True, timeout: float = None):
+        """
+        Reads the next message from whichever channel has one.
+
+        Args:
+            block (bool): Whether to wait for a message when every channel is empty.
+            timeout (float): The longest time to wait, in seconds, or None to wait forever.
+
+        Returns:
+            The next message.
+
+        Raises:
+            queue.Empty: if no message arrives.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sleep = 1e-6
+        while True:
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                if not block or (deadline is not None and time.monotonic() >= deadline):
+                    raise
+            time.sleep(sleep)
+            sleep = min(sleep * 2, self.max_sleep)
+
+    def qsize(self) -> int:
+        return sum(channel.qsize() for channel in self.channels)
+
+    def empty(self) -> bool:
+        return all(channel.empty() for channel in self.channels)
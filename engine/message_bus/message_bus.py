@@ -1,45 +1,187 @@
 import multiprocessing
+from typing import Callable, Dict, List, Union
+from .codec_channel import CodecChannel
+from .binary_codec import BinaryCodec
+from .shared_memory_ring import SharedMemoryRing
+from .subscription import Subscription, conflation_key
 
 
 class MessageBus:
     """
     Represents the message bus for inteprocess communication.
 
+    By default messages are put on the channels as Python objects (and pickled by multiprocessing).
+    With a codec, such as BinaryCodec, they travel as compact encoded bytes instead, and the channels
+    returned by subscribe decode them transparently.
+
+    The "shared_memory" transport replaces the queues with single-producer/single-consumer ring buffers
+    in shared memory (see SharedMemoryRing), which always carry encoded messages (BinaryCodec unless
+    another codec is given). Each channel must then have exactly one publishing and one subscribed
+    process, and close() should be called by the creating process once the bus is no longer used.
+
+    With several shards (MatchEngine processes, see EnginePool), every shard has its own request
+    channel, and events from all shards are merged into one stream for subscribers. Queues accept
+    many producers, so the shards share one event queue; shared memory rings have a single producer,
+    so each shard then gets its own event ring and subscribe returns a MergedChannel over them.
+
+    The event channel fans out: every subscription gets the full stream on its own channel(s), so
+    subscribers never take messages from each other, and each has its own policy for when it falls
+    behind (see Subscription). Subscriptions must be created before the engines start, since every
+    engine process publishes to the subscriptions it was started with. Unless disabled, a "default"
+    subscription that blocks and is unbounded for queues is created up front and returned by
+    subscribe("event").
+
     Attributes:
-        requests (multiprocessing.Queue): The requests channel.
-        events (multiprocessing.Queue): The events channel.
+        requests (List[Union[multiprocessing.Queue, CodecChannel, SharedMemoryRing]]): The request channel of each shard.
+        subscriptions (Dict[str, Subscription]): The event subscriptions, keyed by subscriber name.
+        codec: The codec used to encode messages, or None to send Python objects.
+        transport (str): The channel implementation, either "queue" or "shared_memory".
+        shards (int): The number of MatchEngine shards.
     """
 
-    def __init__(self):
-        self.requests =  multiprocessing.Queue()
-        self.events =  multiprocessing.Queue()
+    def __init__(self, codec=None, transport: str = "queue", shards: int = 1, default_subscription: bool = True, **ring_options):
+        """
+        Initialize a new MessageBus.
+
+        Args:
+            codec: The codec used to encode messages, or None to send Python objects over queues.
+            transport (str): The channel implementation, either "queue" or "shared_memory".
+            shards (int): The number of MatchEngine shards.
+            default_subscription (bool): Whether to create the "default" event subscription. Disable it
+                when every consumer has a named subscription, so that unread events do not pile up.
+            **ring_options: slots, slot_size, wait_strategy and max_sleep of the shared memory rings.
+
+        Raises:
+            ValueError: if the transport is unknown or there are no shards.
+        """
+        if transport not in ("queue", "shared_memory"):
+            raise ValueError(f"unknown transport {transport}")
+
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+
+        if transport == "shared_memory" and codec is None:
+            codec = BinaryCodec()
+
+        self.codec = codec
+        self.transport = transport
+        self.shards = shards
+        self._ring_options = ring_options
+        self.requests = [self._make_channel() for _ in range(shards)]
+        self.subscriptions: Dict[str, Subscription] = {}
+        if default_subscription:
+            self.add_subscription("default", maxsize=0)
+
+    def _make_channel(self, maxsize: int = 0) -> Union[multiprocessing.Queue, CodecChannel, SharedMemoryRing]:
+        if self.transport == "shared_memory":
+            return SharedMemoryRing(self.codec, **self._ring_options)
+        if self.codec is None:
+            return multiprocessing.Queue(maxsize)
+        return CodecChannel(multiprocessing.Queue(maxsize), self.codec)
+
+    def add_subscription(self, name: str, policy: str = "block", maxsize: int = 1024, key: Callable = conflation_key) -> Subscription:
+        """
+        Creates a new subscription to the event channel.
+
+        Args:
+            name (str): The name of the subscriber.
+            policy (str): What to do when the subscriber falls behind: "block", "drop_oldest" or "conflate".
+            maxsize (int): The capacity of the subscriber's queue (0 for unbounded), and the largest drop_oldest
+                backlog. Shared memory rings have the capacity given by the ring options.
+            key (Callable): Maps an event to its conflation key.
+
+        Returns:
+            Subscription: The new subscription.
+
+        Raises:
+            ValueError: if the name is taken or the policy is unknown.
+        """
+        if name in self.subscriptions:
+            raise ValueError(f"subscriber {name} already exists")
+
+        # Queues accept many producers, shared memory rings need one per shard
+        count = self.shards if self.transport == "shared_memory" else 1
+        subscription = Subscription(name, [self._make_channel(maxsize) for _ in range(count)], policy, maxsize, key)
+        self.subscriptions[name] = subscription
+        return subscription
+
+    def lag(self) -> Dict[str, int]:
+        """
+        Reports how far behind each subscriber is.
+
+        Returns:
+            Dict[str, int]: The lag of every subscription (see Subscription.lag), keyed by subscriber name.
+        """
+        return {name: subscription.lag() for name, subscription in self.subscriptions.items()}
 
-    def subscribe(self, channel: str) ->  multiprocessing.Queue:
+    def flush(self, shard: int = 0) -> bool:
+        """
+        Hands the events a shard held back for slow subscribers over to them, as far as they have room.
+
+        Args:
+            shard (int): The publishing shard.
+
+        Returns:
+            bool: True if events are still held back for some subscriber.
+        """
+        pending = False
+        for subscription in self.subscriptions.values():
+            pending = subscription.flush(shard) or pending
+        return pending
+
+    def pending(self, shard: int = 0) -> bool:
+        """
+        Returns:
+            bool: True if the shard holds events back for some subscriber.
+        """
+        return any(subscription.pending(shard) for subscription in self.subscriptions.values())
+
+    def close(self) -> None:
+        """
+        Releases the shared memory of the channels. Queues need no explicit cleanup.
+        """
+        if self.transport == "shared_memory":
+            for channel in self.requests:
+                channel.close()
+            for subscription in self.subscriptions.values():
+                for channel in subscription.channels:
+                    channel.close()
+
+    def subscribe(self, channel: str, shard: int = 0, name: str = "default", **options) -> Union[multiprocessing.Queue, CodecChannel, SharedMemoryRing, Subscription]:
         """
         Subscribe to a specific channel.
 
         Args:
             channel (str): The specific channel to subscribe to.
+            shard (int): The shard whose request channel to subscribe to. Events of all shards are merged.
+            name (str): The name of the event subscriber. An unknown name creates a new subscription.
+            **options: policy, maxsize and key of a new subscription (see add_subscription).
 
         Returns:
-            multiprocessing.Queue: A reference to the multiprocessing.Queue for the specified channel
+            Union[multiprocessing.Queue, CodecChannel, SharedMemoryRing, Subscription]: A reference to the specified channel
         """
         if channel == "request":
-            return self.requests
+            return self.requests[shard]
         elif channel == "event":
-            return self.events
+            subscription = self.subscriptions.get(name)
+            if subscription is None:
+                subscription = self.add_subscription(name, **options)
+            return subscription
 
-    def publish(self, channel: str, message) -> None:
+    def publish(self, channel: str, message, shard: int = 0) -> None:
         """
-        Subscribe to a specific channel.
+        Publish a message on a specific channel.
 
         Args:
             channel (str): The specific channel to publish to.
+            message: The request or event to publish.
+            shard (int): The shard the request is for, or the shard publishing the event.
 
         Returns:
             None
         """
         if channel == "request":
-            self.requests.put(message)
+            self.requests[shard].put(message)
         elif channel == "event":
-            self.events.put(message)
\ No newline at end of file
+            for subscription in self.subscriptions.values():
+                subscription.publish(message, shard)
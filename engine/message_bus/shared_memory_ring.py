@@ -0,0 +1,223 @@
+import queue
+import struct
+import time
+from multiprocessing import shared_memory
+
+# Producer and consumer counters live on separate cache lines at the start of the segment. They are
+# read and written through a memoryview cast to native 64-bit integers, which stores and loads each
+# value in one aligned access. struct.pack_into cannot be used: it zeroes the target before packing,
+# so the other process could briefly observe a counter of 0.
+_HEAD_INDEX = 0
+_TAIL_INDEX = 8
+_DATA_OFFSET = 128
+
+# Every message starts with its length
+_LENGTH = struct.Struct("<I")
+
+
+class SharedMemoryRing:
+    """
+    Represents a single-producer/single-consumer ring buffer on multiprocessing.shared_memory.
+
+    Messages are encoded with a codec and copied into fixed-size slots of a shared memory segment, so
+    passing a message between processes costs two memory copies and no lock, pickling or pipe write.
+    A message longer than one slot takes up consecutive slots. The head (next slot to read) and tail
+    (next slot to write) counters only ever grow and are each written by one side only, which is what
+    makes the ring safe without locks for exactly one producer and one consumer process.
+
+    Blocking get/put wait with either a busy "spin" (lowest latency, burns a core) or a "backoff"
+    strategy that spins briefly, then yields, then sleeps for exponentially longer up to max_sleep.
+
+    The ring exposes the put/get interface of multiprocessing.Queue, raising queue.Full and
+    queue.Empty in the same situations.
+
+    Attributes:
+        codec: The codec used to encode and decode messages (see BinaryCodec).
+        slots (int): The number of slots in the ring.
+        slot_size (int): The size of a slot in bytes.
+        wait_strategy (str): How blocking calls wait, either "spin" or "backoff".
+        max_sleep (float): The longest single sleep of the backoff strategy, in seconds.
+        _shm (shared_memory.SharedMemory): The shared memory segment.
+        _owner (bool): Whether this instance created the segment and should unlink it.
+    """
+
+    def __init__(self, codec, slots: int = 16384, slot_size: int = 128, wait_strategy: str = "backoff", max_sleep: float = 0.001):
+        """
+        Initialize a new SharedMemoryRing, creating its shared memory segment.
+
+        Args:
+            codec: The codec used to encode and decode messages.
+            slots (int): The number of slots in the ring.
+            slot_size (int): The size of a slot in bytes, at least 8.
+            wait_strategy (str): How blocking calls wait, either "spin" or "backoff".
+            max_sleep (float): The longest single sleep of the backoff strategy, in seconds.
+
+        Raises:
+            ValueError: if an argument is out of range.
+        """
+        if slots < 1 or slot_size < 8:
+            raise ValueError("a ring needs at least one slot of at least 8 bytes")
+
+        if wait_strategy not in ("spin", "backoff"):
+            raise ValueError(f"unknown wait_strategy {wait_strategy}")
+
+        self.codec = codec
+        self.slots = slots
+        self.slot_size = slot_size
+        self.wait_strategy = wait_strategy
+        self.max_sleep = max_sleep
+        self._shm = shared_memory.SharedMemory(create=True, size=_DATA_OFFSET + slots * slot_size)
+        self._shm.buf[:_DATA_OFFSET] = bytes(_DATA_OFFSET)
+        self._owner = True
+        self._attach()
+
+    def _attach(self) -> None:
+        self._counters = self._shm.buf[:_DATA_OFFSET].cast("Q")
+        self._data = self._shm.buf[_DATA_OFFSET:]
+        self._capacity = self.slots * self.slot_size
+
+    def __getstate__(self):
+        state = {key: value for key, value in self.__dict__.items() if key not in ("_shm", "_counters", "_data")}
+        state["_name"] = self._shm.name
+        state["_owner"] = False
+        return state
+
+    def __setstate__(self, state):
+        name = state.pop("_name")
+        self.__dict__.update(state)
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._attach()
+
+    def _wait(self, attempt: int, deadline: float) -> None:
+        """
+        Waits once according to the wait strategy.
+
+        Raises:
+            TimeoutError: if the deadline has passed.
+        """
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError
+        if self.wait_strategy == "spin" or attempt < 100:
+            return
+        if attempt < 200:
+            time.sleep(0)
+        else:
+            time.sleep(min(self.max_sleep, 1e-6 * 2 ** min(attempt - 200, 20)))
+
+    def qsize(self) -> int:
+        """
+        Returns:
+            int: The number of slots currently in use.
+        """
+        return self._counters[_TAIL_INDEX] - self._counters[_HEAD_INDEX]
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def put(self, message, block: bool = True, timeout: float = None) -> None:
+        """
+        Encodes a message and writes it into the ring.
+
+        Args:
+            message: The message to write.
+            block (bool): Whether to wait for free slots when the ring is full.
+            timeout (float): The longest time to wait, in seconds, or None to wait forever.
+
+        Raises:
+            ValueError: if the encoded message does not fit in the ring at all.
+            queue.Full: if the ring stays full.
+        """
+        payload = self.codec.encode(message)
+        size = _LENGTH.size + len(payload)
+        needed = -(-size // self.slot_size)
+        if needed > self.slots:
+            raise ValueError("message is larger than the ring")
+
+        counters = self._counters
+        tail = counters[_TAIL_INDEX]
+        deadline = None if timeout is None or not block else time.monotonic() + timeout
+        attempt = 0
+        while tail + needed - counters[_HEAD_INDEX] > self.slots:
+            if not block:
+                raise queue.Full
+            try:
+                self._wait(attempt, deadline)
+            except TimeoutError:
+                raise queue.Full from None
+            attempt += 1
+
+        start = (tail % self.slots) * self.slot_size
+        _LENGTH.pack_into(self._data, start, len(payload))
+        self._copy_in(start + _LENGTH.size, payload)
+
+        # Publish the message only once its bytes are in place
+        counters[_TAIL_INDEX] = tail + needed
+
+    def put_nowait(self, message) -> None:
+        self.put(message, block=False)
+
+    def get(self, block: bool = True, timeout: float = None):
+        """
+        Reads the next message from the ring and decodes it.
+
+        Args:
+            block (bool): Whether to wait for a message when the ring is empty.
+            timeout (float): The longest time to wait, in seconds, or None to wait forever.
+
+        Returns:
+            The decoded message.
+
+        Raises:
+            queue.Empty: if no message arrives.
+        """
+        counters = self._counters
+        head = counters[_HEAD_INDEX]
+        deadline = None if timeout is None or not block else time.monotonic() + timeout
+        attempt = 0
+        while counters[_TAIL_INDEX] == head:
+            if not block:
+                raise queue.Empty
+            try:
+                self._wait(attempt, deadline)
+            except TimeoutError:
+                raise queue.Empty from None
+            attempt += 1
+
+        start = (head % self.slots) * self.slot_size
+        (length,) = _LENGTH.unpack_from(self._data, start)
+        payload = self._copy_out(start + _LENGTH.size, length)
+
+        # Release the slots before decoding so the producer can move on
+        counters[_HEAD_INDEX] = head + -(-(_LENGTH.size + length) // self.slot_size)
+        return self.codec.decode(payload)
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def _copy_in(self, offset: int, payload: bytes) -> None:
+        offset %= self._capacity
+        end = offset + len(payload)
+        if end <= self._capacity:
+            self._data[offset:end] = payload
+        else:
+            split = self._capacity - offset
+            self._data[offset:] = payload[:split]
+            self._data[:end - self._capacity] = payload[split:]
+
+    def _copy_out(self, offset: int, length: int) -> bytes:
+        offset %= self._capacity
+        end = offset + length
+        if end <= self._capacity:
+            return bytes(self._data[offset:end])
+        return bytes(self._data[offset:]) + bytes(self._data[:end - self._capacity])
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory segment, and removes it if this instance created it.
+        """
+        self._counters.release()
+        self._data.release()
+        self._counters = self._data = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
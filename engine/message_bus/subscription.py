@@ -0,0 +1,208 @@
+import multiprocessing
+import queue
+from collections import deque
+from typing import Callable, Hashable, List
+from ..events.event_batch import EventBatch
+from ..events.depth_update import DepthUpdate
+from .merged_channel import MergedChannel
+
+
+def conflation_key(message) -> Hashable:
+    """
+    Default conflation key: a conflating subscriber keeps the latest event of each type and symbol, and
+    the latest depth update of each price level, since a depth update only carries the level it changed.
+
+    Args:
+        message: The event to conflate.
+
+    Returns:
+        Hashable: The key of the event, (type, symbol), or (type, symbol, side, price) for a DepthUpdate.
+    """
+    if type(message) is DepthUpdate:
+        return DepthUpdate, message.symbol, message.side, message.price
+    return type(message), getattr(message, "symbol", None)
+
+
+class Subscription:
+    """
+    Represents one subscriber of the event channel, with its own channel(s) and slow-consumer policy.
+
+    Every subscription receives the full event stream. A subscription reads like a channel (get,
+    get_nowait, qsize, empty), while publishers go through publish, which applies the policy when the
+    subscriber falls behind and its channel is full:
+
+    - "block": the publisher waits for room, so a slow subscriber slows the publisher down.
+    - "drop_oldest": the publisher holds up to maxsize further events back and drops the oldest held
+      event when that backlog overflows.
+    - "conflate": the publisher holds back only the latest event per conflation key (by default type
+      and symbol, and price level for depth updates), the right trade-off for market data where only
+      the current state matters. Event batches are unpacked so every event is conflated on its own.
+
+    Held-back events live in the publishing process and are handed over as soon as the channel has
+    room again, on the next publish or flush. The counters of held-back and dropped events are shared
+    between processes, so the lag of a subscriber can be read from any of them.
+
+    Attributes:
+        name (str): The name of the subscriber.
+        channels (List): The channel of each publishing shard, or one channel shared by all shards.
+        policy (str): What to do when the subscriber falls behind: "block", "drop_oldest" or "conflate".
+        maxsize (int): The capacity of the channels and the largest drop_oldest backlog.
+        key (Callable): Maps an event to its conflation key.
+        reader: The channel the subscriber reads from, merging the shard channels if there are several.
+        _backlogs (List): Events held back for each channel, a deque or a dict keyed by conflation key.
+        _held (multiprocessing.Value): The number of events currently held back.
+        _dropped (multiprocessing.Value): The number of events dropped or conflated away.
+    """
+
+    def __init__(self, name: str, channels: List, policy: str = "block", maxsize: int = 0, key: Callable = conflation_key):
+        """
+        Initialize a new Subscription.
+
+        Args:
+            name (str): The name of the subscriber.
+            channels (List): The channel of each publishing shard, or one channel shared by all shards.
+            policy (str): What to do when the subscriber falls behind: "block", "drop_oldest" or "conflate".
+            maxsize (int): The capacity of the channels and the largest drop_oldest backlog.
+            key (Callable): Maps an event to its conflation key, must be picklable.
+
+        Raises:
+            ValueError: if the policy is unknown.
+        """
+        if policy not in ("block", "drop_oldest", "conflate"):
+            raise ValueError(f"unknown policy {policy}")
+
+        self.name = name
+        self.channels = channels
+        self.policy = policy
+        self.maxsize = maxsize
+        self.key = key
+        self.reader = channels[0] if len(channels) == 1 else MergedChannel(channels)
+        self._backlogs = [{} if policy == "conflate" else deque() for _ in channels]
+        self._held = multiprocessing.Value("q", 0)
+        self._dropped = multiprocessing.Value("q", 0)
+
+    def publish(self, message, shard: int = 0) -> None:
+        """
+        Delivers an event to the subscriber, applying the policy if it has fallen behind.
+
+        Args:
+            message: The event to deliver.
+            shard (int): The shard publishing the event.
+        """
+        index = shard if len(self.channels) > 1 else 0
+        channel = self.channels[index]
+        if self.policy == "block":
+            channel.put(message)
+            return
+
+        backlog = self._backlogs[index]
+        if not backlog:
+            try:
+                channel.put_nowait(message)
+                return
+            except queue.Full:
+                pass
+
+        # Slow path, the subscriber is behind
+        held = len(backlog)
+        dropped = self._hold(backlog, message)
+        self._drain(channel, backlog)
+        self._count(len(backlog) - held, dropped)
+
+    def flush(self, shard: int = 0) -> bool:
+        """
+        Hands held-back events over to the subscriber's channel while it has room.
+
+        Args:
+            shard (int): The shard publishing the events.
+
+        Returns:
+            bool: True if events are still held back.
+        """
+        index = shard if len(self.channels) > 1 else 0
+        backlog = self._backlogs[index]
+        if backlog:
+            held = len(backlog)
+            self._drain(self.channels[index], backlog)
+            self._count(len(backlog) - held, 0)
+        return bool(backlog)
+
+    def pending(self, shard: int = 0) -> bool:
+        """
+        Returns:
+            bool: True if the shard holds events back for this subscriber.
+        """
+        return bool(self._backlogs[shard if len(self.channels) > 1 else 0])
+
+    def _hold(self, backlog, message) -> int:
+        """
+        Holds an event back according to the policy.
+
+        Returns:
+            int: The number of events dropped to make room for it.
+        """
+        dropped = 0
+        if self.policy == "drop_oldest":
+            backlog.append(message)
+            if len(backlog) > self.maxsize:
+                backlog.popleft()
+                dropped += 1
+        else:
+            for event in message.events if isinstance(message, EventBatch) else (message,):
+                key = self.key(event)
+                # Re-insert so the backlog stays in the order of the latest updates
+                if backlog.pop(key, None) is not None:
+                    dropped += 1
+                backlog[key] = event
+        return dropped
+
+    def _drain(self, channel, backlog) -> None:
+        conflating = self.policy == "conflate"
+        try:
+            while backlog:
+                key = next(iter(backlog)) if conflating else 0
+                channel.put_nowait(backlog[key])
+                if conflating:
+                    del backlog[key]
+                else:
+                    backlog.popleft()
+        except queue.Full:
+            pass
+
+    def _count(self, held: int, dropped: int) -> None:
+        if held:
+            with self._held.get_lock():
+                self._held.value += held
+        if dropped:
+            with self._dropped.get_lock():
+                self._dropped.value += dropped
+
+    @property
+    def dropped(self) -> int:
+        """
+        Returns:
+            int: The number of events dropped or conflated away so far.
+        """
+        return self._dropped.value
+
+    def lag(self) -> int:
+        """
+        Gets how far the subscriber is behind the publishers.
+
+        Returns:
+            int: The number of events waiting in the channels (ring slots for shared memory) plus the
+            events held back by the publishers.
+        """
+        return self.reader.qsize() + self._held.value
+
+    def get(self, block: bool = True, timeout: float = None):
+        return self.reader.get(block, timeout)
+
+    def get_nowait(self):
+        return self.reader.get_nowait()
+
+    def qsize(self) -> int:
+        return self.reader.qsize()
+
+    def empty(self) -> bool:
+        return self.reader.empty()
@@ -0,0 +1,123 @@
+import bisect
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..orders.order import Order
+from .price_level import PriceLevel
+
+
+class BookSide:
+    """
+    Represents one side (bids or asks) of the order book as a sorted index of price levels.
+
+    Levels are stored in a dict keyed by price, next to a sorted list of level keys. Bids are keyed by
+    price and asks by negated price, so on both sides the best price is the last key. This keeps
+    best-price access O(1) and removing the best level an O(1) list pop.
+
+    Attributes:
+        side (str): The side of the book, either "buy" or "sell".
+        levels (Dict[int, PriceLevel]): Price levels keyed by price in ticks.
+        _keys (List[int]): Sorted level keys with the best price last.
+        _sign (int): 1 for bids, -1 for asks.
+    """
+
+    def __init__(self, side: str):
+        """
+        Initialize a new, empty BookSide.
+
+        Args:
+            side (str): The side of the book, either "buy" or "sell".
+        """
+        self.side = side
+        self.levels: Dict[int, PriceLevel] = {}
+        self._keys: List[int] = []
+        self._sign = 1 if side == "buy" else -1
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def best_level(self) -> Optional[PriceLevel]:
+        """
+        Gets the price level at the best price.
+
+        Returns:
+            Optional[PriceLevel]: The best price level, or None if this side is empty.
+        """
+        if self._keys:
+            return self.levels[self._keys[-1] * self._sign]
+        return None
+
+    def get_level(self, price: int) -> Optional[PriceLevel]:
+        """
+        Gets the price level at a given price.
+
+        Args:
+            price (int): The price of the level in ticks.
+
+        Returns:
+            Optional[PriceLevel]: The level at that price, or None if there is none.
+        """
+        return self.levels.get(price)
+
+    def add_order(self, order: Order) -> PriceLevel:
+        """
+        Appends an order to the back of the queue at its price, creating the level if needed.
+
+        Args:
+            order (Order): The order to add.
+
+        Returns:
+            PriceLevel: The level the order now rests on.
+        """
+        level = self.levels.get(order.price)
+        if level is None:
+            level = PriceLevel(order.price)
+            self.levels[order.price] = level
+            bisect.insort(self._keys, order.price * self._sign)
+        level.append(order)
+        return level
+
+    def remove_level(self, level: PriceLevel) -> None:
+        """
+        Removes an (empty) price level from the index.
+
+        Args:
+            level (PriceLevel): The level to remove.
+        """
+        del self.levels[level.price]
+        key = level.price * self._sign
+        if self._keys[-1] == key:
+            self._keys.pop()
+        else:
+            del self._keys[bisect.bisect_left(self._keys, key)]
+
+    def iter_levels(self) -> Iterator[PriceLevel]:
+        """
+        Iterates over the price levels from the best price to the worst.
+
+        Returns:
+            Iterator[PriceLevel]: The levels of this side in price priority.
+        """
+        for key in reversed(self._keys):
+            yield self.levels[key * self._sign]
+
+    def depth(self, n: int = None) -> List[Tuple[int, int]]:
+        """
+        Aggregated view of the best n price levels.
+
+        Args:
+            n (int): The number of price levels to retrieve, or None for all of them.
+
+        Returns:
+            List[Tuple[int, int]]: (price, aggregate quantity) pairs from the best price to the worst.
+        """
+        keys = self._keys if n is None else self._keys[-n:] if n > 0 else []
+        return [(key * self._sign, self.levels[key * self._sign].quantity) for key in reversed(keys)]
+
+    def validate_index(self) -> bool:
+        """
+        Checks that the key index is sorted and matches the stored levels.
+
+        Returns:
+            bool: True if the index is consistent with the levels.
+        """
+        keys_sorted = all(a < b for a, b in zip(self._keys, self._keys[1:]))
+        return keys_sorted and sorted(key * self._sign for key in self._keys) == sorted(self.levels)
@@ -0,0 +1,38 @@
+from array import array
+from .price_level import PriceLevel
+
+
+class LadderLevel(PriceLevel):
+    """
+    Represents a price level that lives in a slot of a LadderSide.
+
+    The level keeps its FIFO queue of orders like any PriceLevel, but its aggregate quantity is stored
+    in the ladder's preallocated quantity buffer, so depth reads can go straight to the buffer.
+
+    Attributes:
+        _quantities (array): The ladder's per-tick aggregate quantity buffer.
+        _index (int): The slot of this level in the buffer.
+    """
+
+    __slots__ = ("_quantities", "_index")
+
+    def __init__(self, price: int, quantities: array, index: int):
+        """
+        Initialize a new, empty LadderLevel.
+
+        Args:
+            price (int): The price of the level in ticks.
+            quantities (array): The ladder's per-tick aggregate quantity buffer.
+            index (int): The slot of this level in the buffer.
+        """
+        self._quantities = quantities
+        self._index = index
+        super().__init__(price)
+
+    @property
+    def quantity(self) -> int:
+        return self._quantities[self._index]
+
+    @quantity.setter
+    def quantity(self, value: int) -> None:
+        self._quantities[self._index] = value
@@ -0,0 +1,46 @@
+from .order_book import OrderBook
+from .ladder_side import LadderSide
+
+
+class LadderOrderBook(OrderBook):
+    """
+    Represents an Order Book for an instrument with a bounded price band, backed by preallocated
+    per-tick ladders instead of a sorted index of price levels.
+
+    Best-price lookup goes through an occupancy bitmap, and depth reads come straight from the
+    per-tick quantity buffers. Orders priced outside the band cannot rest in the book.
+
+    Attributes:
+        bids (LadderSide): Bid ladder (best price is the highest occupied tick)
+        asks (LadderSide): Ask ladder (best price is the lowest occupied tick)
+        min_price (int): The lowest price of the band in ticks.
+        max_price (int): The highest price of the band in ticks.
+    """
+
+    def __init__(self, min_price: int, max_price: int, depth_size: int = 10, timer_resolution: float = 1.0):
+        """
+        Initialize a new LadderOrderBook instance
+
+        Args:
+            min_price (int): The lowest price of the band in ticks.
+            max_price (int): The highest price of the band in ticks.
+            depth_size (int): The number of levels per side kept in the depth cache.
+            timer_resolution (float): The precision in seconds of order expiry times.
+        """
+        super().__init__(depth_size, timer_resolution)
+        self.min_price = min_price
+        self.max_price = max_price
+        self.bids = LadderSide("buy", min_price, max_price)
+        self.asks = LadderSide("sell", min_price, max_price)
+
+    def accepts_price(self, price: int) -> bool:
+        """
+        Checks whether an order at the given price can rest in this book.
+
+        Args:
+            price (int): The price in ticks.
+
+        Returns:
+            bool: True if the price lies inside the band.
+        """
+        return self.min_price <= price <= self.max_price
@@ -0,0 +1,230 @@
+from array import array
+from typing import Iterator, List, Optional, Tuple
+from ..orders.order import Order
+from .ladder_level import LadderLevel
+
+
+class LadderSide:
+    """
+    Represents one side of the order book as a preallocated ladder of ticks over a bounded price band.
+
+    Every tick in the band owns a slot in a quantity buffer and, once used, a LadderLevel holding its
+    order queue. A two-level occupancy bitmap (64-bit words plus a summary of non-empty words) finds
+    the best price, or the next price after it, without scanning empty ticks, so the cost does not
+    depend on how many orders are in the book.
+
+    Attributes:
+        side (str): The side of the book, either "buy" or "sell".
+        min_price (int): The lowest price of the band in ticks.
+        max_price (int): The highest price of the band in ticks.
+        quantities (array): Aggregate resting quantity per tick, indexed by price - min_price.
+        _levels (List[Optional[LadderLevel]]): The level owned by each tick, created on first use.
+        _words (array): Occupancy bitmap, one bit per tick.
+        _summary (int): Bitmap with one bit per non-empty word of _words.
+        _count (int): Number of occupied price levels.
+    """
+
+    def __init__(self, side: str, min_price: int, max_price: int):
+        """
+        Initialize a new, empty LadderSide.
+
+        Args:
+            side (str): The side of the book, either "buy" or "sell".
+            min_price (int): The lowest price of the band in ticks.
+            max_price (int): The highest price of the band in ticks.
+
+        Raises:
+            ValueError: if the band is empty.
+        """
+        if max_price < min_price:
+            raise ValueError("max_price must not be below min_price")
+
+        size = max_price - min_price + 1
+        self.side = side
+        self.min_price = min_price
+        self.max_price = max_price
+        self.quantities = array("q", bytes(8 * size))
+        self._levels: List[Optional[LadderLevel]] = [None] * size
+        self._words = array("Q", bytes(8 * ((size + 63) // 64)))
+        self._summary = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _highest(self, below: int) -> int:
+        """
+        Finds the highest occupied slot strictly below a given slot, or -1 if there is none.
+        """
+        word_index = below >> 6
+        word = self._words[word_index] & ((1 << (below & 63)) - 1) if word_index < len(self._words) else 0
+        if not word:
+            summary = self._summary & ((1 << word_index) - 1)
+            if not summary:
+                return -1
+            word_index = summary.bit_length() - 1
+            word = self._words[word_index]
+        return (word_index << 6) + word.bit_length() - 1
+
+    def _lowest(self, above: int) -> int:
+        """
+        Finds the lowest occupied slot strictly above a given slot, or -1 if there is none.
+        """
+        start = above + 1
+        word_index = start >> 6
+        if word_index >= len(self._words):
+            return -1
+        word = self._words[word_index] >> (start & 63) << (start & 63)
+        if not word:
+            summary = self._summary >> (word_index + 1) << (word_index + 1)
+            if not summary:
+                return -1
+            word_index = (summary & -summary).bit_length() - 1
+            word = self._words[word_index]
+        return (word_index << 6) + (word & -word).bit_length() - 1
+
+    def _best_index(self) -> int:
+        if self.side == "buy":
+            return self._highest(len(self._levels))
+        return self._lowest(-1)
+
+    def _next_index(self, index: int) -> int:
+        if self.side == "buy":
+            return self._highest(index)
+        return self._lowest(index)
+
+    def best_level(self) -> Optional[LadderLevel]:
+        """
+        Gets the price level at the best price.
+
+        Returns:
+            Optional[LadderLevel]: The best price level, or None if this side is empty.
+        """
+        if self._summary:
+            return self._levels[self._best_index()]
+        return None
+
+    def get_level(self, price: int) -> Optional[LadderLevel]:
+        """
+        Gets the price level at a given price.
+
+        Args:
+            price (int): The price of the level in ticks.
+
+        Returns:
+            Optional[LadderLevel]: The level at that price, or None if there is none.
+        """
+        index = price - self.min_price
+        if 0 <= index < len(self._levels):
+            level = self._levels[index]
+            if level is not None and level.orders:
+                return level
+        return None
+
+    def add_order(self, order: Order) -> LadderLevel:
+        """
+        Appends an order to the back of the queue at its price, marking the tick as occupied if needed.
+
+        Args:
+            order (Order): The order to add.
+
+        Returns:
+            LadderLevel: The level the order now rests on.
+
+        Raises:
+            ValueError: if the order's price is outside the band.
+        """
+        index = order.price - self.min_price
+        if not 0 <= index < len(self._levels):
+            raise ValueError("price is outside the price band of the book")
+
+        level = self._levels[index]
+        if level is None:
+            level = LadderLevel(order.price, self.quantities, index)
+            self._levels[index] = level
+
+        if not level.orders:
+            word_index = index >> 6
+            if not self._words[word_index]:
+                self._summary |= 1 << word_index
+            self._words[word_index] |= 1 << (index & 63)
+            self._count += 1
+
+        level.append(order)
+        return level
+
+    def remove_level(self, level: LadderLevel) -> None:
+        """
+        Marks an (empty) price level as unoccupied. The level object stays in its slot for reuse.
+
+        Args:
+            level (LadderLevel): The level to remove.
+        """
+        index = level.price - self.min_price
+        word_index = index >> 6
+        self._words[word_index] ^= 1 << (index & 63)
+        if not self._words[word_index]:
+            self._summary ^= 1 << word_index
+        self._count -= 1
+
+    def iter_levels(self) -> Iterator[LadderLevel]:
+        """
+        Iterates over the occupied price levels from the best price to the worst.
+
+        Returns:
+            Iterator[LadderLevel]: The levels of this side in price priority.
+        """
+        index = self._best_index() if self._summary else -1
+        while index >= 0:
+            yield self._levels[index]
+            index = self._next_index(index)
+
+    def depth(self, n: int = None) -> List[Tuple[int, int]]:
+        """
+        Aggregated view of the best n price levels, read from the quantity buffer.
+
+        Args:
+            n (int): The number of price levels to retrieve, or None for all of them.
+
+        Returns:
+            List[Tuple[int, int]]: (price, aggregate quantity) pairs from the best price to the worst.
+        """
+        result = []
+        index = self._best_index() if self._summary else -1
+        while index >= 0 and (n is None or len(result) < n):
+            result.append((index + self.min_price, self.quantities[index]))
+            index = self._next_index(index)
+        return result
+
+    def quantity_slice(self, low_price: int, high_price: int) -> array:
+        """
+        Aggregate quantity of every tick between two prices, empty ticks included.
+
+        Args:
+            low_price (int): The first price of the slice in ticks.
+            high_price (int): The last price of the slice in ticks (inclusive).
+
+        Returns:
+            array: The quantities, indexed by price - low_price.
+        """
+        low = max(low_price - self.min_price, 0)
+        high = min(high_price - self.min_price + 1, len(self._levels))
+        return self.quantities[low:high]
+
+    def validate_index(self) -> bool:
+        """
+        Checks that the occupancy bitmap and quantity buffer match the levels.
+
+        Returns:
+            bool: True if the index is consistent with the levels.
+        """
+        count = 0
+        for index, level in enumerate(self._levels):
+            occupied = bool(self._words[index >> 6] >> (index & 63) & 1)
+            has_orders = level is not None and bool(level.orders)
+            if occupied != has_orders or (not has_orders and self.quantities[index] != 0):
+                return False
+            count += occupied
+
+        summary = sum(1 << word_index for word_index, word in enumerate(self._words) if word)
+        return count == self._count and summary == self._summary
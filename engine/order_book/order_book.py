@@ -1,155 +1,418 @@
-import heapq
-from typing import List, Optional
+from itertools import chain, islice
+from typing import List, Optional, Tuple
 from ..orders.order import Order
-from ..requests.cancel_order_request import CancelOrderRequest
+from .book_side import BookSide
+from .price_level import PriceLevel
+from .stop_book import StopBook
+from .timer_wheel import TimerWheel
 
 class OrderBook:
     """
     Represents an Order Book (the main data structure to track bids and asks).
 
+    Each side is a sorted index of price levels, and each level holds a FIFO queue of orders, so
+    matching walks the book in price-time priority.
+
+    Every mutation records the (side, price) of the level it touched, so the engine can publish the
+    new aggregate quantity of each changed level once per request (see pop_changed_levels).
+
+    The aggregated top depth_size levels of each side are cached. A change only invalidates the cache
+    of its side when it touches a price inside the cached range, and the cache is rebuilt on the next
+    read, so repeated top-of-book depth reads cost a list copy.
+
     Attributes:
-        bids (list): Priority queue for bids (max heap)
-        asks (list): Priority queue for asks (min heap)
-        _bids_positions (dict): A dictionary that maps order_id's to position in the bids heap
-        _asks_positions (dict): A dictionary that maps order_id's to position in the asks heap
+        bids (BookSide): Bid price levels (best price is the highest)
+        asks (BookSide): Ask price levels (best price is the lowest)
+        stops (StopBook): Pending stop orders, held out of the book until a trade triggers them
+        expiries (TimerWheel): When the GTD and DAY orders of the book expire, resting and pending stops alike
+        _bids_positions (dict): A dictionary that maps order_id's to their price level in the bids
+        _asks_positions (dict): A dictionary that maps order_id's to their price level in the asks
+        changed_levels (dict): (side, price) of the levels changed since the last pop_changed_levels, in order of change
+        sequence (int): The sequence number of the last published depth update
+        execution_sequence (int): The sequence number of the last published execution
+        depth_size (int): The number of levels per side kept in the depth cache
+        _bid_depth (list): Cached top bid levels, or None when stale
+        _ask_depth (list): Cached top ask levels, or None when stale
+        _bid_depth_floor (float): Lowest bid price whose change invalidates the cached bid levels
+        _ask_depth_ceiling (float): Highest ask price whose change invalidates the cached ask levels
     """
 
-    def __init__(self):
+    def __init__(self, depth_size: int = 10, timer_resolution: float = 1.0):
         """
         Initialize a new OrderBook instance
+
+        Args:
+            depth_size (int): The number of levels per side kept in the depth cache.
+            timer_resolution (float): The precision in seconds of order expiry times.
         """
-        self.bids = []
-        self.asks = [] 
-        self._bids_positions = {} 
-        self._asks_positions = {} 
+        self.bids = BookSide("buy")
+        self.asks = BookSide("sell")
+        self.stops = StopBook()
+        self.expiries = TimerWheel(timer_resolution)
+        self._bids_positions = {}
+        self._asks_positions = {}
+        self.changed_levels = {}
+        self.sequence = 0
+        self.execution_sequence = 0
+        self.depth_size = depth_size
+        self._bid_depth = None
+        self._ask_depth = None
+        self._bid_depth_floor = float("inf")
+        self._ask_depth_ceiling = float("-inf")
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: The number of resting orders on both sides of the book.
+        """
+        return len(self._bids_positions) + len(self._asks_positions)
 
     def add_order(self, order: Order) -> None:
         """
-        Adds a single order to the order book
+        Adds a single order to the back of the queue at its price level
 
         Args:
             order (Order): Order object to add to book (either side)
         """
         if order.side == "buy":
-            heapq.heappush(self.bids, order)
-            self._bids_positions[order.order_id] = len(self.bids) - 1
+            self._bids_positions[order.order_id] = self.bids.add_order(order)
 
         elif order.side == "sell":
-            heapq.heappush(self.asks, order)
-            self._asks_positions[order.order_id] = len(self.asks) - 1
+            self._asks_positions[order.order_id] = self.asks.add_order(order)
+
+        self._level_changed(order.side, order.price)
 
     def remove_best_bid(self) -> Order:
         """
-        Removes the best bid order from the book.
+        Removes the best bid order (highest price, then oldest) from the book.
 
-        Returns: 
+        Returns:
             Order: returns the best bid order.
         """
-        if self.bids:
-            best_bid_order = heapq.heappop(self.bids)
+        level = self.bids.best_level()
+        if level is not None:
+            best_bid_order = level.popleft()
+            if not level:
+                self.bids.remove_level(level)
             del self._bids_positions[best_bid_order.order_id]
+            self._level_changed("buy", level.price)
             return best_bid_order
-    
+
     def remove_best_ask(self) -> Order:
         """
-        Removes the best ask order from the book.
+        Removes the best ask order (lowest price, then oldest) from the book.
 
         Returns:
             Order: returns the best ask order.
         """
-        if self.asks:
-            best_ask_order = heapq.heappop(self.asks)
+        level = self.asks.best_level()
+        if level is not None:
+            best_ask_order = level.popleft()
+            if not level:
+                self.asks.remove_level(level)
             del self._asks_positions[best_ask_order.order_id]
+            self._level_changed("sell", level.price)
             return best_ask_order
 
-    def delete_order(self, order_id: int) -> None:
+    def delete_order(self, order_id: int) -> Order:
         """
         Deletes a specific order from the book at any position (price level).
 
         Args:
             order_id (int): The order_id of the order to cancel.
+
+        Returns:
+            Order: The deleted order.
+
+        Raises:
+            KeyError: if the order_id is not resting in the book.
         """
 
-        # @NOTE We leverage a hashmap here to keep track of order_id's and their positions for O(log(n)) deletion, instead of O(n)
-        # @NOTE This is important since many requests in traditional markets are requests for deletions 
+        # @NOTE The positions hashmaps act as an order handle table: they lead straight to the order's price level,
+        # @NOTE where the order is unlinked from its queue in O(1) without touching the priority of any other order
+        # @NOTE This is important since many requests in traditional markets are requests for deletions
 
         if order_id in self._bids_positions:
-            position = self._bids_positions.pop(order_id)
-            if position < len(self.bids):
-                last_order = self.bids.pop()
-                if position != len(self.bids):
-                    self.bids[position] = last_order
-                    self._bids_positions[last_order.order_id] = position
-
+            side, level = self.bids, self._bids_positions.pop(order_id)
         elif order_id in self._asks_positions:
-            position = self._asks_positions.pop(order_id)
-            if position < len(self.asks):
-                last_order = self.asks.pop()
-                if position != len(self.asks):
-                    self.asks[position] = last_order
-                    self._asks_positions[last_order.order_id] = position
+            side, level = self.asks, self._asks_positions.pop(order_id)
         else:
             raise KeyError("order_id not found in order book")
-            
+
+        order = level.remove(order_id)
+        if not level:
+            side.remove_level(level)
+        self._level_changed(order.side, order.price)
+        return order
+
+    def reduce_order(self, order: Order, quantity: int) -> None:
+        """
+        Reduces the quantity of a resting order in place, keeping its time priority. The order is removed
+        from the book once its quantity reaches zero.
+
+        Args:
+            order (Order): The resting order to reduce.
+            quantity (int): The quantity to take off the order.
+        """
+        if order.side == "buy":
+            side, positions = self.bids, self._bids_positions
+        else:
+            side, positions = self.asks, self._asks_positions
+
+        level = positions[order.order_id]
+        order.quantity -= quantity
+        level.quantity -= quantity
+        self._level_changed(order.side, order.price)
+
+        if order.quantity <= 0:
+            del positions[order.order_id]
+            level.remove(order.order_id)
+            if not level:
+                side.remove_level(level)
+
+    def remove_best_level(self, side: str) -> List[Order]:
+        """
+        Removes the best price level of a side together with every order resting on it, in one step.
+
+        Args:
+            side (str): The side of the level, "buy" or "sell".
+
+        Returns:
+            List[Order]: The removed orders in time priority, empty if the side has no levels.
+        """
+        if side == "buy":
+            book_side, positions = self.bids, self._bids_positions
+        else:
+            book_side, positions = self.asks, self._asks_positions
+
+        level = book_side.best_level()
+        if level is None:
+            return []
+
+        orders = list(level.orders.values())
+        for order in orders:
+            del positions[order.order_id]
+        # Empty the level before unlinking it, ladder levels stay in their slot for reuse
+        level.orders.clear()
+        level.quantity = 0
+        book_side.remove_level(level)
+        self._level_changed(side, level.price)
+        return orders
+
+    def can_fill(self, side: str, quantity: int, price: int = None) -> bool:
+        """
+        Checks whether an incoming order could be filled in full right now, from the aggregate quantities
+        of the opposite levels and without touching any order.
+
+        Args:
+            side (str): The side of the incoming order, "buy" or "sell".
+            quantity (int): The quantity to fill.
+            price (int): The limit price in ticks, or None for a market order.
+
+        Returns:
+            bool: True if the opposite levels at or better than the price hold at least the quantity.
+        """
+        buying = side == "buy"
+        for level in (self.asks if buying else self.bids).iter_levels():
+            if price is not None and (level.price > price if buying else level.price < price):
+                return False
+            quantity -= level.quantity
+            if quantity <= 0:
+                return True
+        return False
+
+    def _level_changed(self, side: str, price: int) -> None:
+        """
+        Records a change of the level at a price, and drops the cached depth of its side if the level is
+        part of it (a stale cache has an infinite floor/ceiling, so it is not checked again).
+        """
+        self.changed_levels[(side, price)] = None
+        if side == "buy":
+            if price >= self._bid_depth_floor:
+                self._bid_depth = None
+                self._bid_depth_floor = float("inf")
+        elif price <= self._ask_depth_ceiling:
+            self._ask_depth = None
+            self._ask_depth_ceiling = float("-inf")
+
+    def pop_changed_levels(self) -> List[Tuple[str, int, int]]:
+        """
+        Collects the levels changed since the last call and forgets them.
+
+        Returns:
+            List[Tuple[str, int, int]]: (side, price, aggregate quantity) of every changed level in order of
+            first change, with a quantity of 0 for levels that no longer exist.
+        """
+        changes = []
+        for side_name, price in self.changed_levels:
+            level = (self.bids if side_name == "buy" else self.asks).get_level(price)
+            changes.append((side_name, price, level.quantity if level is not None else 0))
+        self.changed_levels.clear()
+        return changes
+
+    def get_order(self, order_id: int) -> Optional[Order]:
+        """
+        Looks up a resting order by its order_id.
+
+        Args:
+            order_id (int): The order_id of the order to look up.
+
+        Returns:
+            Optional[Order]: The resting order, or None if it is not in the book.
+        """
+        level = self._bids_positions.get(order_id)
+        if level is None:
+            level = self._asks_positions.get(order_id)
+        if level is not None:
+            return level.orders[order_id]
+        return None
 
     def get_best_bid(self) -> Optional[Order]:
         """
         Gets the current best bid from the order book.
 
         Returns:
-            Optional[Order]: The order object at the current best bid in the book
+            Optional[Order]: The oldest order at the current best bid price level
         """
-        if self.bids:
-            return self.bids[0]
+        level = self.bids.best_level()
+        if level is not None:
+            return level.head()
         return None
 
     def get_best_ask(self) -> Optional[Order]:
         """
-        Gets the current best asl from the order book.
+        Gets the current best ask from the order book.
 
         Returns:
-            Optional[Order]: The order object at the current best ask in the book
+            Optional[Order]: The oldest order at the current best ask price level
         """
-        if self.asks:
-            return self.asks[0]
+        level = self.asks.best_level()
+        if level is not None:
+            return level.head()
         return None
 
-    def get_bids(self, n: int = None) -> List[Order]:
+    def get_best_bid_level(self) -> Optional[PriceLevel]:
+        """
+        Gets the current best bid price level.
+
+        Returns:
+            Optional[PriceLevel]: The price level at the best bid, or None if there are no bids
+        """
+        return self.bids.best_level()
+
+    def get_best_ask_level(self) -> Optional[PriceLevel]:
         """
-        Read-only representation of the ordeer book on the bids side at depth of n
+        Gets the current best ask price level.
 
-        Args: 
-            n (int): the depth of the order book bids to retreive.
-        
-        Returns: 
-            List[Order]: A list of all bid orders, unless depth n is provided. 
+        Returns:
+            Optional[PriceLevel]: The price level at the best ask, or None if there are no asks
+        """
+        return self.asks.best_level()
 
+    def get_bids(self, n: int = None) -> List[Order]:
         """
-        if n == None: 
-            return sorted([bid for bid in self.bids], key=lambda order: order.price, reverse=True)
-        return sorted([bid for bid in self.bids[:n]], key=lambda order: order.price, reverse=True)
+        Read-only representation of the order book on the bids side at depth of n
 
+        Args:
+            n (int): the number of bid orders to retrieve.
+
+        Returns:
+            List[Order]: All bid orders in price-time priority, unless depth n is provided.
+
+        """
+        orders = chain.from_iterable(level.orders.values() for level in self.bids.iter_levels())
+        return list(islice(orders, n))
 
     def get_asks(self, n: int = None) -> List[Order]:
         """
-        Read-only representation of the ordeer book on the asks side at depth of n
-        
-        Args: 
-            n (int): the depth of the order book asks to retrieve.
-        
-        Returns: 
-            List[Order]: A list of all ask orders, unless depth n is provided. 
+        Read-only representation of the order book on the asks side at depth of n
+
+        Args:
+            n (int): the number of ask orders to retrieve.
+
+        Returns:
+            List[Order]: All ask orders in price-time priority, unless depth n is provided.
+        """
+        orders = chain.from_iterable(level.orders.values() for level in self.asks.iter_levels())
+        return list(islice(orders, n))
+
+    def get_bid_levels(self, n: int = None) -> List[Tuple[int, int]]:
+        """
+        Aggregated representation of the bids side at a depth of n price levels
+
+        Args:
+            n (int): the number of price levels to retrieve.
+
+        Returns:
+            List[Tuple[int, int]]: (price, aggregate quantity) pairs, best price first.
+        """
+        if n is None or n > self.depth_size:
+            return self.bids.depth(n)
+
+        if self._bid_depth is None:
+            self._bid_depth = self.bids.depth(self.depth_size)
+            # With fewer levels than the cache holds, any new bid belongs in it
+            self._bid_depth_floor = self._bid_depth[-1][0] if len(self._bid_depth) == self.depth_size else float("-inf")
+        return self._bid_depth[:n]
+
+    def get_ask_levels(self, n: int = None) -> List[Tuple[int, int]]:
+        """
+        Aggregated representation of the asks side at a depth of n price levels
+
+        Args:
+            n (int): the number of price levels to retrieve.
+
+        Returns:
+            List[Tuple[int, int]]: (price, aggregate quantity) pairs, best price first.
+        """
+        if n is None or n > self.depth_size:
+            return self.asks.depth(n)
+
+        if self._ask_depth is None:
+            self._ask_depth = self.asks.depth(self.depth_size)
+            # With fewer levels than the cache holds, any new ask belongs in it
+            self._ask_depth_ceiling = self._ask_depth[-1][0] if len(self._ask_depth) == self.depth_size else float("inf")
+        return self._ask_depth[:n]
+
+    def accepts_price(self, price: int) -> bool:
         """
-        if n == None: 
-            return sorted([ask for ask in self.asks], key=lambda order: order.price, reverse=True)
-        return sorted([ask for ask in self.asks[:n]], key=lambda order: order.price, reverse=True)
+        Checks whether an order at the given price can rest in this book.
+
+        Args:
+            price (int): The price in ticks.
+
+        Returns:
+            bool: True, the price levels of this book are unbounded.
+        """
+        return True
 
     def validate_book(self) -> bool:
         """
-        Checks if the heaps for ask and bids are their respective positions hashmaps
+        Checks that the price level index of each side is sorted, that every level's aggregate quantity
+        matches its orders, that the positions hashmaps point at the levels holding each order, that the
+        cached depth is up to date, and that the stop book is consistent.
 
         Returns:
-            bool: the result of: len(self.asks) == len(self._asks_positions.keys()) and len(self.bids) == len(self._bids_positions.keys())
+            bool: True if the book is internally consistent.
         """
-        return len(self.asks) == len(self._asks_positions.keys()) and len(self.bids) == len(self._bids_positions.keys())
-    
\ No newline at end of file
+        for side, positions in ((self.bids, self._bids_positions), (self.asks, self._asks_positions)):
+            if not side.validate_index():
+                return False
+
+            order_count = 0
+            for level in side.iter_levels():
+                if not level or level.quantity != sum(order.quantity for order in level.orders.values()):
+                    return False
+                for order_id, order in level.orders.items():
+                    if order.order_id != order_id or order.price != level.price or positions.get(order.order_id) is not level:
+                        return False
+                order_count += len(level)
+
+            if order_count != len(positions):
+                return False
+
+        for cache, side in ((self._bid_depth, self.bids), (self._ask_depth, self.asks)):
+            if cache is not None and cache != side.depth(self.depth_size):
+                return False
+
+        return self.stops.validate()
@@ -0,0 +1,186 @@
+import math
+from array import array
+from collections import deque
+from typing import Deque, List, Set, Tuple
+
+# A key sets 2 * _PATTERN_BITS bits of one 64 bit word: two patterns of _PATTERN_BITS bits each, picked
+# from two tables of 1 << _PATTERN_INDEX_BITS precomputed patterns by bits of the key's hash
+_PATTERN_BITS = 4
+_PATTERN_INDEX_BITS = 12
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _mix(x: int) -> int:
+    x = (x + _GOLDEN) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _patterns(seed: int) -> List[int]:
+    patterns = []
+    for index in range(1 << _PATTERN_INDEX_BITS):
+        x = _mix(seed << _PATTERN_INDEX_BITS | index)
+        pattern = 0
+        while bin(pattern).count("1") < _PATTERN_BITS:
+            pattern |= 1 << (x & 63)
+            x >>= 6
+            if not x:
+                x = _mix(pattern)
+        patterns.append(pattern)
+    return patterns
+
+
+_LOW_PATTERNS = _patterns(1)
+_HIGH_PATTERNS = _patterns(2)
+_PATTERN_MASK = (1 << _PATTERN_INDEX_BITS) - 1
+
+
+class _BloomFilter:
+    """
+    A fixed-size blocked Bloom filter over integers: every key sets and tests its bits in one 64 bit word,
+    so both take a single word access.
+
+    Attributes:
+        words (array): The 64 bit words.
+        shift (int): The right shift that turns a key's hash into its word index.
+        count (int): The number of keys added.
+    """
+
+    __slots__ = ("words", "shift", "count")
+
+    def __init__(self, word_bits: int, words: bytes = None, count: int = 0):
+        self.words = array("Q", bytes(8 << word_bits) if words is None else words)
+        self.shift = 64 - word_bits
+        self.count = count
+
+    def locate(self, key: int) -> Tuple[int, int]:
+        # Multiplicative hashing: the top bits index the word, and the low bits, folded with the high
+        # ones so that keys sharing their low bits spread too, pick the patterns
+        h = (key * _GOLDEN) & _MASK64
+        folded = h ^ (h >> 32)
+        return h >> self.shift, _LOW_PATTERNS[folded & _PATTERN_MASK] | _HIGH_PATTERNS[(folded >> _PATTERN_INDEX_BITS) & _PATTERN_MASK]
+
+    def add(self, key: int) -> None:
+        word, pattern = self.locate(key)
+        self.words[word] |= pattern
+        self.count += 1
+
+    def __contains__(self, key: int) -> bool:
+        word, pattern = self.locate(key)
+        return self.words[word] & pattern == pattern
+
+
+class OrderIdFilter:
+    """
+    Remembers the order_ids an engine has accepted in fixed memory, to reject duplicates and replays.
+
+    The most recent window order_ids are kept exactly, in a set. Older order_ids move into a Bloom filter
+    generation, and once a generation holds capacity order_ids it becomes the previous generation and a
+    new one is started, dropping the generation before it. An order_id is therefore remembered exactly
+    for the last window orders and probabilistically for the capacity to 2 * capacity orders before them,
+    after which it is forgotten. Memory is bounded by the window and the two generations, however long
+    the engine runs.
+
+    A Bloom filter has no false negatives, so a duplicate is never accepted while it is remembered, but
+    a new order_id that has never been seen is taken for a duplicate with a probability of error_rate.
+    Checking and adding are O(1): a set lookup, and one 64 bit word per generation (a blocked Bloom
+    filter, sized at twice the bits of a classic one to make up for the bits sharing a word).
+
+    Attributes:
+        window (int): The number of most recent order_ids kept exactly.
+        capacity (int): The number of order_ids per Bloom filter generation.
+        error_rate (float): The false positive rate of a full generation.
+        word_bits (int): The log2 of the number of 64 bit words of a generation.
+        _recent (Set[int]): The most recent order_ids.
+        _order (Deque[int]): The most recent order_ids, oldest first.
+        _generations (List[_BloomFilter]): The previous and current generations, current last.
+    """
+
+    def __init__(self, window: int = 100000, capacity: int = 1000000, error_rate: float = 0.0001):
+        """
+        Initialize a new, empty OrderIdFilter.
+
+        Args:
+            window (int): The number of most recent order_ids kept exactly.
+            capacity (int): The number of order_ids per Bloom filter generation.
+            error_rate (float): The false positive rate of a full generation, between 0 and 1.
+
+        Raises:
+            ValueError: if the window or capacity is not positive or the error rate is out of range.
+        """
+        if window < 1 or capacity < 1:
+            raise ValueError("window and capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.window = window
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # Twice the optimal size of a classic Bloom filter, rounded up to a power of two of 64 bit words
+        optimal_bits = -capacity * math.log(error_rate) / math.log(2) ** 2
+        self.word_bits = max(0, math.ceil(math.log2(2 * optimal_bits / 64)))
+        self._recent: Set[int] = set()
+        self._order: Deque[int] = deque()
+        self._generations: List[_BloomFilter] = [_BloomFilter(self.word_bits)]
+
+    def __contains__(self, order_id: int) -> bool:
+        """
+        Args:
+            order_id (int): The order_id to look up.
+
+        Returns:
+            bool: True if the order_id was seen, or taken for a seen one by a Bloom filter generation.
+        """
+        if order_id in self._recent:
+            return True
+        # The first generation is only empty while nothing has left the window yet
+        generations = self._generations
+        if generations[0].count:
+            for generation in generations:
+                if order_id in generation:
+                    return True
+        return False
+
+    def add(self, order_id: int) -> None:
+        """
+        Remembers an order_id, moving the oldest exact order_id to the Bloom filter past the window.
+
+        Args:
+            order_id (int): The order_id to remember.
+        """
+        self._recent.add(order_id)
+        self._order.append(order_id)
+        if len(self._order) > self.window:
+            oldest = self._order.popleft()
+            self._recent.discard(oldest)
+            current = self._generations[-1]
+            if current.count >= self.capacity:
+                current = _BloomFilter(self.word_bits)
+                self._generations = [self._generations[-1], current]
+            current.add(oldest)
+
+    def state(self) -> Tuple[List[int], List[Tuple[int, int, bytes]]]:
+        """
+        Lists the state of the filter, to save it.
+
+        Returns:
+            Tuple[List[int], List[Tuple[int, int, bytes]]]: The exact order_ids oldest first, and the
+            (word bits, count, words) of every generation, current last.
+        """
+        return list(self._order), [(64 - g.shift, g.count, g.words.tobytes()) for g in self._generations]
+
+    def restore(self, order_ids: List[int], generations: List[Tuple[int, int, bytes]]) -> None:
+        """
+        Restores a saved state into an empty filter. Saved generations keep their own size, so a filter
+        can be restored with a different capacity or error rate, which apply from the next generation on.
+
+        Args:
+            order_ids (List[int]): The exact order_ids, oldest first.
+            generations (List[Tuple[int, int, bytes]]): The generations as listed by state.
+        """
+        if generations:
+            self._generations = [_BloomFilter(word_bits, words, count) for word_bits, count, words in generations]
+        for order_id in order_ids:
+            self.add(order_id)
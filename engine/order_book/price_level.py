@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from ..orders.order import Order
+
+
+class PriceLevel:
+    """
+    Represents a single price level of the order book: a FIFO queue of the orders resting at one price.
+
+    The queue is an OrderedDict keyed by order_id, so besides O(1) append and pop from the front,
+    any order can be removed from the middle of the queue in O(1) without disturbing the others.
+
+    Attributes:
+        price (int): The price in ticks shared by every order at this level.
+        orders (OrderedDict): Resting orders keyed by order_id, in time priority (oldest first).
+        quantity (int): Aggregate quantity of all orders resting at this level.
+    """
+
+    __slots__ = ("price", "orders", "quantity")
+
+    def __init__(self, price: int):
+        """
+        Initialize a new, empty PriceLevel.
+
+        Args:
+            price (int): The price of the level in ticks.
+        """
+        self.price = price
+        self.orders = OrderedDict()
+        self.quantity = 0
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def append(self, order: Order) -> None:
+        """
+        Appends an order to the back of the queue (lowest time priority).
+
+        Args:
+            order (Order): The order to append.
+        """
+        self.orders[order.order_id] = order
+        self.quantity += order.quantity
+
+    def head(self) -> Order:
+        """
+        Gets the order with the highest time priority at this level.
+
+        Returns:
+            Order: The oldest order at this level.
+        """
+        return next(iter(self.orders.values()))
+
+    def popleft(self) -> Order:
+        """
+        Removes the order with the highest time priority from this level.
+
+        Returns:
+            Order: The removed order.
+        """
+        order = self.orders.popitem(last=False)[1]
+        self.quantity -= order.quantity
+        return order
+
+    def remove(self, order_id: int) -> Order:
+        """
+        Removes a specific order from this level.
+
+        Args:
+            order_id (int): The order_id of the order to remove.
+
+        Returns:
+            Order: The removed order.
+
+        Raises:
+            KeyError: if the order does not rest at this level.
+        """
+        order = self.orders.pop(order_id)
+        self.quantity -= order.quantity
+        return order
@@ -0,0 +1,136 @@
+from typing import Dict, List, Optional
+from ..orders.stop_loss_order import StopLossOrder
+from .stop_side import StopSide
+
+
+class StopBook:
+    """
+    Holds the pending stop orders of an instrument, out of the order book, in a trigger index per side.
+
+    Every trade is passed to trigger, which takes the stops it crossed off both sides without looking
+    at the others (see StopSide). The price of the last trade is kept, so a stop that arrives already
+    crossed can be triggered at once.
+
+    Attributes:
+        buys (StopSide): Pending buy stops (triggered at or above their stop price)
+        sells (StopSide): Pending sell stops (triggered at or below their stop price)
+        orders (Dict[int, StopLossOrder]): Every pending stop, keyed by order_id.
+        last_price (int): The price in ticks of the last trade, or None before the first trade.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new, empty StopBook.
+        """
+        self.buys = StopSide("buy")
+        self.sells = StopSide("sell")
+        self.orders: Dict[int, StopLossOrder] = {}
+        self.last_price: Optional[int] = None
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: The number of pending stops on both sides.
+        """
+        return len(self.orders)
+
+    def __contains__(self, order_id: int) -> bool:
+        return order_id in self.orders
+
+    def add(self, order: StopLossOrder) -> None:
+        """
+        Adds a stop order to the back of the queue at its stop price.
+
+        Args:
+            order (StopLossOrder): The stop order to add.
+        """
+        (self.buys if order.side == "buy" else self.sells).add(order)
+        self.orders[order.order_id] = order
+
+    def remove(self, order_id: int) -> StopLossOrder:
+        """
+        Removes a pending stop order.
+
+        Args:
+            order_id (int): The order_id of the stop to remove.
+
+        Returns:
+            StopLossOrder: The removed stop.
+
+        Raises:
+            KeyError: if the order_id is not a pending stop.
+        """
+        order = self.orders.pop(order_id)
+        (self.buys if order.side == "buy" else self.sells).remove(order)
+        return order
+
+    def get_order(self, order_id: int) -> Optional[StopLossOrder]:
+        """
+        Looks up a pending stop by its order_id.
+
+        Args:
+            order_id (int): The order_id of the stop to look up.
+
+        Returns:
+            Optional[StopLossOrder]: The pending stop, or None if there is none.
+        """
+        return self.orders.get(order_id)
+
+    def is_crossed(self, order: StopLossOrder) -> bool:
+        """
+        Checks whether the last trade already reached the stop price of an order.
+
+        Args:
+            order (StopLossOrder): The stop order.
+
+        Returns:
+            bool: True if the stop would have been triggered by the last trade.
+        """
+        return self.last_price is not None and order.crossed_by(self.last_price)
+
+    def trigger(self, trade_price: int) -> List[StopLossOrder]:
+        """
+        Records a trade and removes the stops it crossed.
+
+        Args:
+            trade_price (int): The price of the trade in ticks.
+
+        Returns:
+            List[StopLossOrder]: The triggered stops, buy stops before sell stops, each side in trigger
+            priority (see StopSide.trigger).
+        """
+        self.last_price = trade_price
+        if not self.orders:
+            return []
+
+        triggered = self.buys.trigger(trade_price) + self.sells.trigger(trade_price)
+        for order in triggered:
+            del self.orders[order.order_id]
+        return triggered
+
+    def get_stops(self) -> List[StopLossOrder]:
+        """
+        Returns:
+            List[StopLossOrder]: Every pending stop, the buy stops then the sell stops, each in trigger priority.
+        """
+        return list(self.buys.iter_orders()) + list(self.sells.iter_orders())
+
+    def validate(self) -> bool:
+        """
+        Checks that the trigger index of each side is consistent and holds exactly the pending stops.
+
+        Returns:
+            bool: True if the stop book is internally consistent.
+        """
+        count = 0
+        for side in (self.buys, self.sells):
+            if not side.validate_index():
+                return False
+            for stop_price, level in side.levels.items():
+                if not level:
+                    return False
+                for order_id, order in level.items():
+                    if order.order_id != order_id or order.stop_price != stop_price or order.side != side.side or self.orders.get(order_id) is not order:
+                        return False
+                count += len(level)
+        return count == len(self.orders)
@@ -0,0 +1,108 @@
+import bisect
+from collections import OrderedDict
+from typing import Dict, Iterator, List
+from ..orders.stop_loss_order import StopLossOrder
+
+
+class StopSide:
+    """
+    Represents the pending stop orders of one side, indexed by stop price.
+
+    Stops are grouped in FIFO queues per stop price, next to a sorted list of stop price keys. Buy stops
+    (triggered by trades at or above their stop price) are keyed by negated stop price and sell stops
+    (triggered at or below it) by stop price, so on both sides the stops crossed by a trade are a tail
+    of the keys. A trade finds them with one bisect and takes them off the end of the list, in
+    O(log n + k) for k triggered stop prices, however many stops are pending.
+
+    Attributes:
+        side (str): The side of the stops, either "buy" or "sell".
+        levels (Dict[int, OrderedDict]): Stop orders keyed by order_id, in arrival order, keyed by stop price in ticks.
+        _keys (List[int]): Sorted stop price keys, the first to trigger last.
+        _sign (int): -1 for buy stops, 1 for sell stops.
+    """
+
+    def __init__(self, side: str):
+        """
+        Initialize a new, empty StopSide.
+
+        Args:
+            side (str): The side of the stops, either "buy" or "sell".
+        """
+        self.side = side
+        self.levels: Dict[int, OrderedDict] = {}
+        self._keys: List[int] = []
+        self._sign = -1 if side == "buy" else 1
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def add(self, order: StopLossOrder) -> None:
+        """
+        Appends a stop order to the back of the queue at its stop price.
+
+        Args:
+            order (StopLossOrder): The stop order to add.
+        """
+        level = self.levels.get(order.stop_price)
+        if level is None:
+            level = self.levels[order.stop_price] = OrderedDict()
+            bisect.insort(self._keys, order.stop_price * self._sign)
+        level[order.order_id] = order
+
+    def remove(self, order: StopLossOrder) -> None:
+        """
+        Removes a pending stop order.
+
+        Args:
+            order (StopLossOrder): The stop order to remove.
+
+        Raises:
+            KeyError: if the order is not pending on this side.
+        """
+        level = self.levels[order.stop_price]
+        del level[order.order_id]
+        if not level:
+            del self.levels[order.stop_price]
+            del self._keys[bisect.bisect_left(self._keys, order.stop_price * self._sign)]
+
+    def trigger(self, trade_price: int) -> List[StopLossOrder]:
+        """
+        Removes the stops crossed by a trade.
+
+        Args:
+            trade_price (int): The price of the trade in ticks.
+
+        Returns:
+            List[StopLossOrder]: The triggered stops, those whose stop price the market reached first
+            (the lowest buy stops, the highest sell stops) first, and in arrival order at one stop price.
+        """
+        keys = self._keys
+        start = bisect.bisect_left(keys, trade_price * self._sign)
+        if start == len(keys):
+            return []
+
+        triggered = []
+        for key in reversed(keys[start:]):
+            triggered.extend(self.levels.pop(key * self._sign).values())
+        del keys[start:]
+        return triggered
+
+    def iter_orders(self) -> Iterator[StopLossOrder]:
+        """
+        Iterates over the pending stops in trigger priority.
+
+        Returns:
+            Iterator[StopLossOrder]: The stops of this side, the first to trigger first.
+        """
+        for key in reversed(self._keys):
+            yield from self.levels[key * self._sign].values()
+
+    def validate_index(self) -> bool:
+        """
+        Checks that the key index is sorted and matches the stored stop price queues.
+
+        Returns:
+            bool: True if the index is consistent with the queues.
+        """
+        keys_sorted = all(a < b for a, b in zip(self._keys, self._keys[1:]))
+        return keys_sorted and sorted(key * self._sign for key in self._keys) == sorted(self.levels)
@@ -0,0 +1,238 @@
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Each level of the wheel has 2 ** _SLOT_BITS slots, and the wheel has _LEVELS levels
+_SLOT_BITS = 8
+_SLOTS = 1 << _SLOT_BITS
+_MASK = _SLOTS - 1
+_LEVELS = 4
+
+
+class TimerWheel:
+    """
+    Schedules keys (order_ids) to expire at a point in time, in a hierarchical timing wheel.
+
+    Time moves in ticks of resolution seconds. The first level has one slot per tick for the next 256
+    ticks, and every level above has 256 slots as wide as the whole level below it. Keys are grouped in
+    one list per deadline, and a group goes to the slot of its deadline on the lowest level that reaches
+    that far. When the wheel turns to the start of a slot of a higher level, that slot is cascaded: its
+    groups move down to the level that now reaches them, whole, however many keys they hold.
+
+    Scheduling and cancelling are O(1), and advancing is O(1) amortized per tick and per deadline, so a
+    session close expiring hundreds of thousands of orders at once costs no more to reach than a single
+    order. Stretches of ticks with nothing scheduled on the lower levels are skipped.
+
+    Cancelling only forgets the deadline of a key. Stale entries are skipped when their group expires,
+    and expired keys are taken one at a time with pop_due, in the order they were scheduled, so the owner
+    can spread a large expiry over several steps.
+
+    Attributes:
+        resolution (float): The length of a tick in seconds.
+        current (int): The last tick the wheel has turned to.
+        now (float): The time the wheel was last advanced to, in seconds.
+        deadlines (Dict[int, int]): The tick at which every key expires, expired keys not taken yet included.
+        _due (Deque[Tuple[int, List[int]]]): Expired (deadline, keys) groups not fully taken yet.
+        _due_index (int): The position in the first due group of the next key to take.
+        _wheels (List[List[Dict[int, List[int]]]]): The slots of every level, each holding key groups keyed by deadline.
+        _counts (List[int]): The number of key groups on every level.
+    """
+
+    def __init__(self, resolution: float = 1.0):
+        """
+        Initialize a new, empty TimerWheel.
+
+        Args:
+            resolution (float): The length of a tick in seconds.
+
+        Raises:
+            ValueError: if the resolution is not positive.
+        """
+        if resolution <= 0:
+            raise ValueError("resolution must be positive")
+
+        self.resolution = resolution
+        self.current = 0
+        self.now = 0.0
+        self.deadlines: Dict[int, int] = {}
+        self._due: Deque[Tuple[int, List[int]]] = deque()
+        self._due_index = 0
+        self._wheels: List[List[Dict[int, List[int]]]] = [[{} for _ in range(_SLOTS)] for _ in range(_LEVELS)]
+        self._counts = [0] * _LEVELS
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            int: The number of keys scheduled or expired and not taken yet.
+        """
+        return len(self.deadlines)
+
+    @property
+    def has_due(self) -> bool:
+        """
+        Returns:
+            bool: Whether expired keys may be waiting to be taken (the groups may only hold cancelled keys).
+        """
+        return bool(self._due)
+
+    def schedule(self, key: int, when: float) -> None:
+        """
+        Schedules a key to expire at the first tick at or after a time, replacing its previous deadline.
+        A deadline the wheel has already passed expires the key at once.
+
+        Args:
+            key (int): The key to schedule.
+            when (float): When the key expires, in seconds.
+        """
+        self._schedule_tick(key, math.ceil(when / self.resolution))
+
+    def _schedule_tick(self, key: int, deadline: int) -> None:
+        # Re-insert the key, so the deadlines keep the order keys were scheduled in
+        self.deadlines.pop(key, None)
+        if deadline <= self.current:
+            self.deadlines[key] = self.current
+            if self._due and self._due[-1][0] == self.current:
+                self._due[-1][1].append(key)
+            else:
+                self._due.append((self.current, [key]))
+        else:
+            self.deadlines[key] = deadline
+            self._place(deadline, [key])
+
+    def _place(self, deadline: int, keys: List[int]) -> None:
+        delta = deadline - self.current
+        level = 0
+        while level < _LEVELS - 1 and delta >> (_SLOT_BITS * (level + 1)):
+            level += 1
+        slot = self._wheels[level][(deadline >> (_SLOT_BITS * level)) & _MASK]
+        group = slot.get(deadline)
+        if group is None:
+            slot[deadline] = keys
+            self._counts[level] += 1
+        else:
+            group.extend(keys)
+
+    def cancel(self, key: int) -> None:
+        """
+        Forgets a key, scheduled or expired.
+
+        Args:
+            key (int): The key to forget. Unknown keys are ignored.
+        """
+        self.deadlines.pop(key, None)
+
+    def advance(self, now: float) -> None:
+        """
+        Turns the wheel to a point in time, making the keys whose deadline has come due.
+
+        Args:
+            now (float): The time to advance to, in seconds. The wheel never turns back.
+        """
+        if now > self.now:
+            self.now = now
+        target = math.floor(self.now / self.resolution)
+        wheels = self._wheels
+        counts = self._counts
+
+        while self.current < target:
+            if not self.deadlines:
+                # Nothing is scheduled, skip ahead and drop the stale entries
+                if any(counts):
+                    for level in wheels:
+                        for slot in level:
+                            slot.clear()
+                    self._counts = counts = [0] * _LEVELS
+                self._due.clear()
+                self._due_index = 0
+                self.current = target
+                break
+
+            if not any(counts):
+                # Every key left has expired already
+                self.current = target
+                break
+
+            # Skip to the tick before the next slot of the lowest level holding keys
+            level = 0
+            while not counts[level]:
+                level += 1
+            if level:
+                width = _SLOT_BITS * level
+                self.current = min(target, (((self.current >> width) + 1) << width) - 1)
+                if self.current == target:
+                    break
+
+            self.current += 1
+            current = self.current
+
+            # Cascade the slots of the higher levels that start at this tick, the highest first
+            for level in range(_LEVELS - 1, 0, -1):
+                if not current & ((1 << (_SLOT_BITS * level)) - 1):
+                    slot = wheels[level][(current >> (_SLOT_BITS * level)) & _MASK]
+                    if slot:
+                        groups = list(slot.items())
+                        slot.clear()
+                        counts[level] -= len(groups)
+                        for deadline, keys in groups:
+                            self._place(deadline, keys)
+
+            keys = wheels[0][current & _MASK].pop(current, None)
+            if keys is not None:
+                counts[0] -= 1
+                self._due.append((current, keys))
+
+    def pop_due(self) -> Optional[int]:
+        """
+        Takes the next expired key.
+
+        Returns:
+            Optional[int]: The key, or None if no key is due.
+        """
+        deadlines = self.deadlines
+        due = self._due
+        while due:
+            deadline, keys = due[0]
+            index = self._due_index
+            while index < len(keys):
+                key = keys[index]
+                index += 1
+                if deadlines.get(key) == deadline:
+                    del deadlines[key]
+                    self._due_index = index
+                    return key
+            due.popleft()
+            self._due_index = 0
+        return None
+
+    def entries(self) -> List[Tuple[int, int]]:
+        """
+        Lists the state of every key, to save it.
+
+        Returns:
+            List[Tuple[int, int]]: (key, deadline tick) pairs, the expired keys first in the order they will
+            be taken, with the current tick as their deadline.
+        """
+        deadlines = self.deadlines
+        result = []
+        index = self._due_index
+        for deadline, keys in self._due:
+            for key in keys[index:]:
+                if deadlines.get(key) == deadline:
+                    result.append((key, self.current))
+            index = 0
+        result.extend((key, deadline) for key, deadline in deadlines.items() if deadline > self.current)
+        return result
+
+    def restore(self, now: float, current: int, entries: List[Tuple[int, int]]) -> None:
+        """
+        Restores a saved state into an empty wheel.
+
+        Args:
+            now (float): The time the wheel was advanced to, in seconds.
+            current (int): The tick the wheel was turned to.
+            entries (List[Tuple[int, int]]): (key, deadline tick) pairs as listed by entries.
+        """
+        self.now = now
+        self.current = current
+        for key, deadline in entries:
+            self._schedule_tick(key, deadline)
@@ -7,10 +7,13 @@ class Order:
         order_id (int): Unique identifier for the order.
         side (str): Order side, indicating whether it's a "buy" or "sell" order.
         quantity (int): Order quantity.
-        price (float): Order price level.
+        price (int): Order price level in ticks.
+        account (str): The account the order belongs to, "" for none.
     """
 
-    def __init__(self, order_id: int, side: str, quantity: int, price: float = None):
+    __slots__ = ("order_id", "side", "quantity", "price", "account")
+
+    def __init__(self, order_id: int, side: str, quantity: int, price: int = None, account: str = ""):
         """
         Initialize a new Order instance.
 
@@ -18,7 +21,8 @@ class Order:
             order_id (int): Unique identifier for the order.
             side (str): Order side, indicating whether this is a request "buy" or "sell" order.
             quantity (int): Order quantity.
-            price (float): Order price level.
+            price (int): Order price level in ticks.
+            account (str): The account the order belongs to, "" for none.
 
         Raises:
             TypeError: if any argument has an incorrect type.
@@ -33,38 +37,39 @@ class Order:
         if not isinstance(quantity, int):
             raise TypeError("quantity must be an integer")
         
-        if price and not isinstance(price, float):
-            raise TypeError("price must be a float")
+        if price is not None and not isinstance(price, int):
+            raise TypeError("price must be an integer number of ticks")
+
+        if not isinstance(account, str):
+            raise TypeError("account must be a string")
 
         self.order_id = order_id
         self.side = side
         self.quantity = quantity
         self.price = price
+        self.account = account
 
-
-    def __lt__(self, other) -> bool:
+    @classmethod
+    def trusted(cls, order_id: int, side: str, quantity: int, price: int = None, account: str = "") -> "Order":
         """
-        Compare two orders based on their prices and sides for priority in a priority queue.
+        Create a new Order without validating the arguments.
 
-        Args:
-            other (Order): The other order to compare with.
-
-        Returns:
-            bool: True if this order has higher priority, False otherwise.
-        """
-        if self.side == "buy":
-            return self.price > other.price  # For bids, higher price has higher priority
-        elif self.side == "sell":
-            return self.price < other.price  # For asks, lower price has higher priority
-
-    def __eq__(self, other) -> bool:
-        """
-        Compare two orders based on their prices for equality.
+        Only for use inside the engine, on values that were already validated at the system boundary.
 
         Args:
-            other (Order): The other order to compare with.
+            order_id (int): Unique identifier for the order.
+            side (str): Order side, either "buy" or "sell".
+            quantity (int): Order quantity.
+            price (int): Order price level in ticks.
+            account (str): The account the order belongs to, "" for none.
 
         Returns:
-            bool: True if the prices of the orders are equal, False otherwise.
+            Order: The new instance.
         """
-        return self.price == other.price
+        instance = cls.__new__(cls)
+        instance.order_id = order_id
+        instance.side = side
+        instance.quantity = quantity
+        instance.price = price
+        instance.account = account
+        return instance
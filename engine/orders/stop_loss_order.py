@@ -0,0 +1,91 @@
+from .order import Order
+
+
+class StopLossOrder(Order):
+
+    """
+    Represents a pending stop order, held out of the book until a trade reaches its stop price.
+
+    A buy stop triggers on a trade at or above its stop price, a sell stop on a trade at or below it.
+    Once triggered it enters matching as a market order (stop) or as a limit order at its price
+    (stop-limit), with its time in force.
+
+    Attributes:
+        order_id (int): Unique identifier for the order.
+        side (str): Order side, indicating whether it's a "buy" or "sell" order.
+        quantity (int): Order quantity.
+        price (int): Limit price in ticks once triggered, or None for a stop-market order.
+        stop_price (int): Trigger price in ticks.
+        time_in_force (str): The time in force of the order once triggered.
+        account (str): The account the order belongs to, "" for none.
+    """
+
+    __slots__ = ("stop_price", "time_in_force")
+
+    def __init__(self, order_id: int, side: str, quantity: int, stop_price: int, price: int = None, time_in_force: str = "GTC", account: str = ""):
+        """
+        Initialize a new StopLossOrder instance.
+
+        Args:
+            order_id (int): Unique identifier for the order.
+            side (str): Order side, indicating whether this is a request "buy" or "sell" order.
+            quantity (int): Order quantity.
+            stop_price (int): Trigger price in ticks.
+            price (int): Limit price in ticks once triggered, or None for a stop-market order.
+            time_in_force (str): The time in force of the order once triggered.
+            account (str): The account the order belongs to, "" for none.
+
+        Raises:
+            TypeError: if any argument has an incorrect type.
+        """
+        super().__init__(order_id, side, quantity, price, account)
+
+        if not isinstance(stop_price, int):
+            raise TypeError("stop_price must be an integer number of ticks")
+
+        if not isinstance(time_in_force, str):
+            raise TypeError("time_in_force must be a string")
+
+        self.stop_price = stop_price
+        self.time_in_force = time_in_force
+
+    @classmethod
+    def trusted(cls, order_id: int, side: str, quantity: int, stop_price: int, price: int = None, time_in_force: str = "GTC", account: str = "") -> "StopLossOrder":
+        """
+        Create a new StopLossOrder without validating the arguments.
+
+        Only for use inside the engine, on values that were already validated at the system boundary.
+
+        Args:
+            order_id (int): Unique identifier for the order.
+            side (str): Order side, either "buy" or "sell".
+            quantity (int): Order quantity.
+            stop_price (int): Trigger price in ticks.
+            price (int): Limit price in ticks once triggered, or None for a stop-market order.
+            time_in_force (str): The time in force of the order once triggered.
+            account (str): The account the order belongs to, "" for none.
+
+        Returns:
+            StopLossOrder: The new instance.
+        """
+        instance = cls.__new__(cls)
+        instance.order_id = order_id
+        instance.side = side
+        instance.quantity = quantity
+        instance.price = price
+        instance.stop_price = stop_price
+        instance.time_in_force = time_in_force
+        instance.account = account
+        return instance
+
+    def crossed_by(self, trade_price: int) -> bool:
+        """
+        Args:
+            trade_price (int): The price of a trade in ticks.
+
+        Returns:
+            bool: True if a trade at that price triggers this stop.
+        """
+        if self.side == "buy":
+            return trade_price >= self.stop_price
+        return trade_price <= self.stop_price
@@ -0,0 +1,133 @@
+import json
+import time
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+from ..instruments.instrument import Instrument
+from ..match_engine.match_engine import MatchEngine
+from ..message_bus.binary_codec import BinaryCodec
+from ..message_bus.local_message_bus import LocalMessageBus
+from ..stats.latency_histogram import LatencyHistogram
+
+
+class ReplayDriver:
+    """
+    Replays a stream of recorded requests through a MatchEngine and measures how fast it processes them.
+
+    The engine runs in the calling process on a LocalMessageBus, so the measurement covers matching and
+    event construction only, without inter-process communication. Requests are fed as fast as possible,
+    or at the pace of their recorded timestamps, and the processing time of every request is recorded
+    in a LatencyHistogram. Emitted events are written to an output file outside of the timed section,
+    as JSON lines for a .jsonl path and length-prefixed BinaryCodec frames otherwise.
+
+    Attributes:
+        engine (MatchEngine): The engine the requests are replayed through.
+        message_bus (LocalMessageBus): The in-process bus collecting the events of the engine.
+        output (str): The path of the event file, or None to discard the events.
+        pace (str): "max" to replay as fast as possible, "recorded" to follow the recorded timestamps.
+        histogram (LatencyHistogram): The processing time of every replayed request, in nanoseconds.
+        codec (BinaryCodec): The codec of binary event files.
+    """
+
+    def __init__(self, instruments: List[Instrument] = None, output: str = None, pace: str = "max", book_type: str = "price_level"):
+        """
+        Initialize a new ReplayDriver.
+
+        Args:
+            instruments (List[Instrument]): The instruments of the replayed requests, the default instrument if None.
+            output (str): The path of the event file, or None to discard the events.
+            pace (str): "max" to replay as fast as possible, "recorded" to follow the recorded timestamps.
+            book_type (str): The order book implementation of the engine.
+
+        Raises:
+            ValueError: if the pace is unknown.
+        """
+        if pace not in ("max", "recorded"):
+            raise ValueError(f"unknown pace {pace}")
+
+        self.message_bus = LocalMessageBus()
+        self.engine = MatchEngine(self.message_bus, instruments=instruments, book_type=book_type)
+        self.output = output
+        self.pace = pace
+        self.histogram = LatencyHistogram()
+        self.codec = BinaryCodec()
+
+    def run(self, requests: Iterable[Tuple[Optional[float], object]]) -> Dict:
+        """
+        Replays requests through the engine.
+
+        Args:
+            requests (Iterable[Tuple[Optional[float], object]]): (timestamp, request) pairs, such as a RequestReader.
+
+        Returns:
+            Dict: The number of messages and events, the elapsed seconds, the messages per second and the
+            latency summary in nanoseconds (see LatencyHistogram.summary).
+        """
+        engine = self.engine
+        events = self.message_bus.events
+        histogram = self.histogram
+        clock = time.perf_counter_ns
+        origin = None
+        messages = emitted = 0
+
+        stream = open(self.output, "w" if self.output.endswith(".jsonl") else "wb") if self.output else None
+        start = time.perf_counter()
+        try:
+            for timestamp, request in requests:
+                if self.pace == "recorded" and timestamp is not None:
+                    if origin is None:
+                        origin = (timestamp, time.perf_counter())
+                    else:
+                        self.wait_until(origin[1] + timestamp - origin[0])
+
+                # Looked up on every request, since a replayed ProfileRequest replaces it with a timed wrapper
+                begin = clock()
+                engine.process(request)
+                histogram.record(clock() - begin)
+                messages += 1
+
+                emitted += len(events)
+                if stream is not None:
+                    self.write_events(stream, events)
+                events.clear()
+        finally:
+            elapsed = time.perf_counter() - start
+            if stream is not None:
+                stream.close()
+
+        return {
+            "messages": messages,
+            "events": emitted,
+            "seconds": elapsed,
+            "messages_per_second": messages / elapsed if elapsed else 0.0,
+            "latency_ns": histogram.summary(),
+        }
+
+    @staticmethod
+    def wait_until(deadline: float) -> None:
+        """
+        Waits until a perf_counter deadline, sleeping through long waits and spinning through the last moments.
+
+        Args:
+            deadline (float): The perf_counter time to wait for.
+        """
+        remaining = deadline - time.perf_counter()
+        if remaining > 0.002:
+            time.sleep(remaining - 0.001)
+        while time.perf_counter() < deadline:
+            pass
+
+    def write_events(self, stream: BinaryIO, events: Iterable) -> None:
+        """
+        Writes events to the output file.
+
+        Args:
+            stream (BinaryIO): The output file, in text mode for JSON lines.
+            events (Iterable): The events to write.
+        """
+        if self.output.endswith(".jsonl"):
+            for event in events:
+                fields = {"type": type(event).__name__}
+                fields.update((name, getattr(event, name)) for name in type(event).__slots__)
+                stream.write(json.dumps(fields) + "\n")
+        else:
+            for event in events:
+                self.codec.write(stream, event)
@@ -0,0 +1,98 @@
+import json
+from typing import Iterator, Optional, Tuple
+from ..requests.add_order_request import AddOrderRequest
+from ..requests.cancel_order_request import CancelOrderRequest
+from ..requests.amend_order_request import AmendOrderRequest
+from ..requests.order_book_snapshot_request import OrderBookSnapshotRequest
+from ..requests.engine_stats_request import EngineStatsRequest
+from ..requests.profile_request import ProfileRequest
+from ..requests.timer_request import TimerRequest
+from ..message_bus.binary_codec import BinaryCodec
+from ..journal.journal import Journal
+
+# Request class of each "type" of a JSON line
+REQUEST_TYPES = {
+    "add": AddOrderRequest,
+    "cancel": CancelOrderRequest,
+    "amend": AmendOrderRequest,
+    "snapshot": OrderBookSnapshotRequest,
+    "stats": EngineStatsRequest,
+    "profile": ProfileRequest,
+    "timer": TimerRequest,
+}
+
+
+class RequestReader:
+    """
+    Streams the requests of a recorded request file, one at a time, without loading the file into memory.
+
+    Three formats are read:
+
+    - "jsonl": one JSON object per line with a "type" ("add", "cancel", "amend", "snapshot", "stats", "profile" or "timer"), the
+      arguments of the request class and an optional "timestamp" in seconds. Blank lines are skipped.
+    - "binary": requests encoded with BinaryCodec, each prefixed with its length (see BinaryCodec.write).
+    - "journal": the requests of a MatchEngine journal (see Journal), so production flow can be replayed.
+
+    The format is taken from the file extension (.jsonl, .journal, anything else is binary) unless given.
+
+    Attributes:
+        path (str): The path of the request file.
+        format (str): The format of the file, "jsonl", "binary" or "journal".
+        codec (BinaryCodec): The codec of binary and journal files.
+    """
+
+    def __init__(self, path: str, format: str = None, codec: BinaryCodec = None):
+        """
+        Initialize a new RequestReader.
+
+        Args:
+            path (str): The path of the request file.
+            format (str): The format of the file, or None to take it from the extension.
+            codec (BinaryCodec): The codec of binary and journal files.
+
+        Raises:
+            ValueError: if the format is unknown.
+        """
+        if format is None:
+            format = "jsonl" if path.endswith(".jsonl") else "journal" if path.endswith(".journal") else "binary"
+        if format not in ("jsonl", "binary", "journal"):
+            raise ValueError(f"unknown request file format {format}")
+
+        self.path = path
+        self.format = format
+        self.codec = codec if codec is not None else BinaryCodec()
+
+    def __iter__(self) -> Iterator[Tuple[Optional[float], object]]:
+        """
+        Streams the requests of the file.
+
+        Returns:
+            Iterator[Tuple[Optional[float], object]]: (timestamp, request) pairs in file order. Only JSONL
+            files record timestamps, the timestamp is None otherwise.
+
+        Raises:
+            ValueError: if a JSON line has an unknown request type.
+        """
+        if self.format == "journal":
+            request_types = tuple(REQUEST_TYPES.values())
+            for _, message in Journal.read(self.path, self.codec):
+                if isinstance(message, request_types):
+                    yield None, message
+            return
+
+        if self.format == "binary":
+            with open(self.path, "rb") as stream:
+                for message in self.codec.iter_messages(stream):
+                    yield None, message
+            return
+
+        with open(self.path, "r", encoding="utf-8") as stream:
+            for line in stream:
+                if not line.strip():
+                    continue
+                fields = json.loads(line)
+                timestamp = fields.pop("timestamp", None)
+                request_type = REQUEST_TYPES.get(fields.pop("type", None))
+                if request_type is None:
+                    raise ValueError(f"unknown request type in line {line.strip()}")
+                yield timestamp, request_type(**fields)
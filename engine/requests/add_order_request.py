@@ -1,17 +1,37 @@
 from .order_request import OrderRequest
 
+# Time in force of an order, in wire order:
+#   GTC  good till cancelled, the remainder of a limit order rests in the book
+#   IOC  immediate or cancel, whatever does not fill at once is cancelled
+#   FOK  fill or kill, the order fills in full at once or is cancelled without trading
+#   GTD  good till date, like GTC until its expire_time, when it is cancelled
+#   DAY  like GTC until the close of the engine's trading session, when it is cancelled
+TIME_IN_FORCE = ("GTC", "IOC", "FOK", "GTD", "DAY")
+
+
 class AddOrderRequest(OrderRequest):
     """
     Represents a request to add a new order.
 
+    An order without a price is a market order: it trades at any price and, whatever its time in force,
+    never rests in the book. An order with a stop price is a stop (or stop-limit, with a price) order:
+    it waits out of the book until a trade reaches its stop price, then enters matching.
+
     Attributes:
         order_id (int): Unique identifier for the order.
         side (str): Order side, indicating whether this is a request for a "buy" or "sell" order.
         quantity (int): Order quantity.
-        price (float): Order price level.
+        price (float): Order price level, or None for a market order.
+        symbol (str): Symbol of the instrument the order is for.
+        time_in_force (str): How long the order stays active, one of TIME_IN_FORCE.
+        stop_price (float): Trigger price of a stop order, or None.
+        expire_time (float): When a GTD order expires, in seconds since the epoch, or None.
+        account (str): The account the order is placed for, "" for none. Pre-trade risk limits apply per account.
     """
 
-    def __init__(self, order_id: int, side: str, quantity: int, price: float):
+    __slots__ = ("time_in_force", "stop_price", "expire_time", "account")
+
+    def __init__(self, order_id: int, side: str, quantity: int, price: float, symbol: str = "DEFAULT", time_in_force: str = "GTC", stop_price: float = None, expire_time: float = None, account: str = ""):
         """
         Initialize a new AddOrderRequest instance.
 
@@ -19,9 +39,39 @@ class AddOrderRequest(OrderRequest):
             order_id (int): Unique identifier for the order.
             side (str): Order side, indicating whether this is a request "buy" or "sell" order.
             quantity (int): Order quantity.
-            price (float): Order price level.
+            price (float): Order price level, or None for a market order.
+            symbol (str): Symbol of the instrument the order is for.
+            time_in_force (str): How long the order stays active, "GTC", "IOC", "FOK", "GTD" or "DAY".
+            stop_price (float): Trigger price of a stop order, or None.
+            expire_time (float): When a GTD order expires, in seconds since the epoch. Only for GTD orders.
+            account (str): The account the order is placed for, "" for none.
 
         Raises:
             TypeError: if any argument has an incorrect type.
+            ValueError: if the time in force is unknown, or the expire_time is missing for a GTD order or
+                given for another one.
         """
-        super().__init__(order_id, side, quantity, price)
\ No newline at end of file
+        super().__init__(order_id, side, quantity, price, symbol)
+
+        if not isinstance(time_in_force, str):
+            raise TypeError("time_in_force must be a string")
+
+        if time_in_force not in TIME_IN_FORCE:
+            raise ValueError(f"unknown time_in_force {time_in_force}")
+
+        if stop_price is not None and (isinstance(stop_price, bool) or not isinstance(stop_price, (int, float))):
+            raise TypeError("stop_price must be a float")
+
+        if expire_time is not None and (isinstance(expire_time, bool) or not isinstance(expire_time, (int, float))):
+            raise TypeError("expire_time must be a float")
+
+        if (expire_time is not None) != (time_in_force == "GTD"):
+            raise ValueError("expire_time is required for GTD orders and only for them")
+
+        if not isinstance(account, str):
+            raise TypeError("account must be a string")
+
+        self.time_in_force = time_in_force
+        self.stop_price = stop_price
+        self.expire_time = expire_time
+        self.account = account
@@ -0,0 +1,35 @@
+from .order_request import OrderRequest
+
+class AmendOrderRequest(OrderRequest):
+    """
+    Represents a request to amend a resting order.
+
+    Reducing the quantity at an unchanged price is applied in place and keeps the order's time priority.
+    Any other change (a new price or a larger quantity) cancels the order and replaces it at the back
+    of the queue, matching it first if the new price crosses the book.
+
+    Attributes:
+        order_id (int): Unique identifier for the order.
+        side (str): Order side, indicating whether this is a request for a "buy" or "sell" order.
+        quantity (int): New remaining quantity of the order.
+        price (float): New price level of the order, or None to keep the current price.
+        symbol (str): Symbol of the instrument the order is for.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, order_id: int, side: str, quantity: int, price: float = None, symbol: str = "DEFAULT"):
+        """
+        Initialize a new AmendOrderRequest instance.
+
+        Args:
+            order_id (int): Unique identifier for the order.
+            side (str): Order side, indicating whether this is a request "buy" or "sell" order.
+            quantity (int): New remaining quantity of the order.
+            price (float): New price level of the order, or None to keep the current price.
+            symbol (str): Symbol of the instrument the order is for.
+
+        Raises:
+            TypeError: if any argument has an incorrect type.
+        """
+        super().__init__(order_id, side, quantity, price, symbol)
@@ -9,9 +9,12 @@ class CancelOrderRequest(OrderRequest):
         side (str): Order side, indicating whether this is a request for a "buy" or "sell" order.
         quantity (int): Order quantity.
         price (float): Order price level.
+        symbol (str): Symbol of the instrument the order is for.
     """
 
-    def __init__(self, order_id: int, side: str, quantity: int, price: float):
+    __slots__ = ()
+
+    def __init__(self, order_id: int, side: str, quantity: int, price: float, symbol: str = "DEFAULT"):
         """
         Initialize a new AddOrderRequest instance.
 
@@ -20,8 +23,9 @@ class CancelOrderRequest(OrderRequest):
             side (str): Order side, indicating whether this is a request "buy" or "sell" order.
             quantity (int): Order quantity.
             price (float): Order price level.
+            symbol (str): Symbol of the instrument the order is for.
 
         Raises:
             TypeError: if any argument has an incorrect type.
         """
-        super().__init__(order_id, side, quantity, price)
\ No newline at end of file
+        super().__init__(order_id, side, quantity, price, symbol)
@@ -0,0 +1,27 @@
+class EngineStatsRequest:
+    """
+    Represents a request for the latency histograms and counters of a MatchEngine
+
+    The engine answers with an EngineStatsEvent. The symbol only routes the request to the engine that
+    hosts it (see EnginePool), the statistics cover every instrument of that engine.
+
+    Attributes:
+        symbol (str): Symbol of an instrument hosted by the engine to query.
+    """
+
+    __slots__ = ("symbol",)
+
+    def __init__(self, symbol: str = "DEFAULT"):
+        """
+        Initialize a new EngineStatsRequest instance.
+
+        Args:
+            symbol (str): Symbol of an instrument hosted by the engine to query.
+
+        Raises:
+            TypeError: if any argument has an incorrect type.
+        """
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+
+        self.symbol = symbol
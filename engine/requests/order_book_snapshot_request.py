@@ -1,12 +1,34 @@
-from .order_request import OrderRequest
-
 class OrderBookSnapshotRequest:
     """
     Represents a request to view a snapshot of the Order Book
+
+    Attributes:
+        symbol (str): Symbol of the instrument whose book to snapshot.
+        depth (int): The number of price levels per side to include, or None for the whole book.
     """
 
-    def __init__(self):
+    __slots__ = ("symbol", "depth")
+
+    def __init__(self, symbol: str = "DEFAULT", depth: int = None):
         """
         Initialize a new OrderBookSnapshotRequest instance.
+
+        Args:
+            symbol (str): Symbol of the instrument whose book to snapshot.
+            depth (int): The number of price levels per side to include, or None for the whole book.
+
+        Raises:
+            TypeError: if any argument has an incorrect type.
+            ValueError: if the depth is negative.
         """
-        pass
\ No newline at end of file
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+
+        if depth is not None and (not isinstance(depth, int) or isinstance(depth, bool)):
+            raise TypeError("depth must be an integer")
+
+        if depth is not None and depth < 0:
+            raise ValueError("depth must not be negative")
+
+        self.symbol = symbol
+        self.depth = depth
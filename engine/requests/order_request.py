@@ -9,9 +9,12 @@ class OrderRequest():
         side (str): Order side, indicating whether this is a request for a "buy" or "sell" order.
         quantity (int): Order quantity.
         price (float): Order price level.
+        symbol (str): Symbol of the instrument the order is for.
     """
 
-    def __init__(self, order_id: int, side: str, quantity: int, price: float = None):
+    __slots__ = ("order_id", "side", "quantity", "price", "symbol")
+
+    def __init__(self, order_id: int, side: str, quantity: int, price: float = None, symbol: str = "DEFAULT"):
         """
         Initialize a new OrderRequest instance.
 
@@ -20,6 +23,7 @@ class OrderRequest():
             side (str): Order side, indicating whether this is a request "buy" or "sell" order.
             quantity (int): Order quantity.
             price (float): Order price level.
+            symbol (str): Symbol of the instrument the order is for.
 
         Raises:
             TypeError: if any argument has an incorrect type.
@@ -33,11 +37,14 @@ class OrderRequest():
         if not isinstance(quantity, int):
             raise TypeError("quantity must be an integer")
         
-        if price and not isinstance(price, float):
+        if price is not None and (isinstance(price, bool) or not isinstance(price, (int, float))):
             raise TypeError("price must be a float")
-        
+
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+
         self.order_id = order_id
         self.side = side
         self.quantity = quantity
         self.price = price
-
+        self.symbol = symbol
@@ -0,0 +1,60 @@
+from typing import Optional
+
+
+class ProfileRequest:
+    """
+    Represents a request to start or stop profiling the matching engine process
+
+    The engine answers with a ProfileEvent, or an OrderRejectedEvent if the request cannot be honoured
+    (a profile is already running, or none is). The symbol only routes the request to the engine that
+    hosts it (see EnginePool).
+
+    Attributes:
+        action (str): "start" or "stop".
+        mode (str): The profiler to start, "cprofile" (deterministic) or "sample" (sampling).
+        seconds (float): How long to profile for, or None to profile until a "stop" request.
+        path (str): The file to save the profile to, relative to the profile directory of the engine,
+            or "" to name it after the shard and the time.
+        symbol (str): Symbol of an instrument hosted by the engine to profile.
+    """
+
+    __slots__ = ("action", "mode", "seconds", "path", "symbol")
+
+    def __init__(self, action: str = "start", mode: str = "cprofile", seconds: Optional[float] = None, path: str = "", symbol: str = "DEFAULT"):
+        """
+        Initialize a new ProfileRequest instance.
+
+        Args:
+            action (str): "start" or "stop".
+            mode (str): The profiler to start, "cprofile" or "sample".
+            seconds (float): How long to profile for, or None to profile until a "stop" request.
+            path (str): The file to save the profile to, or "" to name it after the shard and the time.
+            symbol (str): Symbol of an instrument hosted by the engine to profile.
+
+        Raises:
+            TypeError: if any argument has an incorrect type.
+            ValueError: if the action or mode is unknown, or seconds is not positive.
+        """
+        if not isinstance(action, str) or not isinstance(mode, str) or not isinstance(path, str):
+            raise TypeError("action, mode and path must be strings")
+
+        if action not in ("start", "stop"):
+            raise ValueError(f"unknown profile action {action}")
+
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"unknown profile mode {mode}")
+
+        if seconds is not None and (isinstance(seconds, bool) or not isinstance(seconds, (int, float))):
+            raise TypeError("seconds must be a float")
+
+        if seconds is not None and seconds <= 0:
+            raise ValueError("seconds must be positive")
+
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+
+        self.action = action
+        self.mode = mode
+        self.seconds = seconds
+        self.path = path
+        self.symbol = symbol
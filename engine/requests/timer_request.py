@@ -0,0 +1,34 @@
+class TimerRequest:
+    """
+    Represents a request to move the clock of a MatchEngine forward, and expire the orders whose time has come
+
+    The engine sends these requests to itself while it runs, so they go through its journal like any
+    other request and a replay expires the same orders at the same point of the request flow. The
+    symbol is unused, the clock is shared by every instrument of the engine.
+
+    Attributes:
+        now (float): The time to move the clock to, in seconds since the epoch.
+        symbol (str): Symbol of an instrument hosted by the engine.
+    """
+
+    __slots__ = ("now", "symbol")
+
+    def __init__(self, now: float, symbol: str = "DEFAULT"):
+        """
+        Initialize a new TimerRequest instance.
+
+        Args:
+            now (float): The time to move the clock to, in seconds since the epoch.
+            symbol (str): Symbol of an instrument hosted by the engine.
+
+        Raises:
+            TypeError: if any argument has an incorrect type.
+        """
+        if isinstance(now, bool) or not isinstance(now, (int, float)):
+            raise TypeError("now must be a float")
+
+        if not isinstance(symbol, str):
+            raise TypeError("symbol must be a string")
+
+        self.now = now
+        self.symbol = symbol
@@ -0,0 +1,25 @@
+class AccountExposure:
+    """
+    Represents the exposure of an account on one instrument, kept up to date as its orders rest, fill
+    and leave the book.
+
+    Attributes:
+        position (int): The net quantity the account bought, negative when it sold more than it bought.
+        open_buy (int): The quantity of the resting buy orders and pending buy stops of the account.
+        open_sell (int): The quantity of the resting sell orders and pending sell stops of the account.
+        open_notional (int): The value of the open orders of the account, in ticks times quantity.
+    """
+
+    __slots__ = ("position", "open_buy", "open_sell", "open_notional")
+
+    def __init__(self, position: int = 0):
+        """
+        Initialize a new AccountExposure, without open orders.
+
+        Args:
+            position (int): The net quantity the account bought.
+        """
+        self.position = position
+        self.open_buy = 0
+        self.open_sell = 0
+        self.open_notional = 0
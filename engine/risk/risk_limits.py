@@ -0,0 +1,37 @@
+class RiskLimits:
+    """
+    Represents the pre-trade risk limits of an account, per instrument. A limit of None is not checked.
+
+    Attributes:
+        max_order_quantity (int): The largest quantity of a single order.
+        price_collar (float): How far a limit order may be priced through the opposite best price, as a
+            fraction of it (0.05 for 5%). Without an opposite side the same side's best price is the reference.
+        max_open_notional (float): The largest total value of the resting orders and pending stops of the
+            account, in price units.
+        max_position (int): The largest absolute position the account may reach if all its open buy
+            orders, or all its open sell orders, fill.
+    """
+
+    __slots__ = ("max_order_quantity", "price_collar", "max_open_notional", "max_position")
+
+    def __init__(self, max_order_quantity: int = None, price_collar: float = None, max_open_notional: float = None, max_position: int = None):
+        """
+        Initialize a new RiskLimits instance.
+
+        Args:
+            max_order_quantity (int): The largest quantity of a single order.
+            price_collar (float): How far a limit order may be priced through the opposite best price, as a fraction of it.
+            max_open_notional (float): The largest total value of the open orders of the account, in price units.
+            max_position (int): The largest absolute position the account may reach if its open orders of a side fill.
+
+        Raises:
+            ValueError: if a limit is negative.
+        """
+        for limit in (max_order_quantity, price_collar, max_open_notional, max_position):
+            if limit is not None and limit < 0:
+                raise ValueError("risk limits cannot be negative")
+
+        self.max_order_quantity = max_order_quantity
+        self.price_collar = price_collar
+        self.max_open_notional = max_open_notional
+        self.max_position = max_position
@@ -0,0 +1,188 @@
+from typing import Dict, Iterator, Optional, Tuple
+from ..orders.order import Order
+from ..order_book.order_book import OrderBook
+from .account_exposure import AccountExposure
+from .risk_limits import RiskLimits
+
+
+class RiskManager:
+    """
+    Checks new orders against the pre-trade risk limits of their account, before they enter matching.
+
+    The checks read the exposure of the account on the order's instrument (see AccountExposure), which
+    the engine keeps up to date through the on_open, on_close and on_fill hooks as orders rest, leave
+    the book and trade. Nothing is ever recomputed from the book, so a check costs a few dictionary
+    lookups and comparisons whatever the size of the book.
+
+    An order is open from the moment it rests in the book or waits in the stop book, at its limit price
+    (the stop price of a stop-market order). Market, IOC and FOK orders are never open, only their fills
+    count, in the position.
+
+    Attributes:
+        limits (Dict[str, RiskLimits]): The limits of every account with its own.
+        default_limits (RiskLimits): The limits of the other accounts, or None to not check them.
+        exposures (Dict[str, Dict[str, AccountExposure]]): The exposure of every account, keyed by symbol then account.
+    """
+
+    def __init__(self, limits: Dict[str, RiskLimits] = None, default_limits: RiskLimits = None):
+        """
+        Initialize a new RiskManager without exposure.
+
+        Args:
+            limits (Dict[str, RiskLimits]): The limits of every account with its own.
+            default_limits (RiskLimits): The limits of the other accounts, or None to not check them.
+        """
+        self.limits = dict(limits) if limits is not None else {}
+        self.default_limits = default_limits
+        self.exposures: Dict[str, Dict[str, AccountExposure]] = {}
+
+    def exposure(self, symbol: str, account: str) -> AccountExposure:
+        """
+        Gets the exposure of an account on an instrument, created empty on first use.
+
+        Args:
+            symbol (str): The symbol of the instrument.
+            account (str): The account.
+
+        Returns:
+            AccountExposure: The exposure.
+        """
+        accounts = self.exposures.get(symbol)
+        if accounts is None:
+            accounts = self.exposures[symbol] = {}
+        exposure = accounts.get(account)
+        if exposure is None:
+            exposure = accounts[account] = AccountExposure()
+        return exposure
+
+    def check(self, symbol: str, account: str, side: str, quantity: int, price: Optional[int], book: OrderBook, tick_size: float, collar: bool = True, replacing: Order = None) -> Optional[str]:
+        """
+        Checks an order against the limits of its account.
+
+        Args:
+            symbol (str): The symbol of the instrument.
+            account (str): The account of the order.
+            side (str): The side of the order, "buy" or "sell".
+            quantity (int): The quantity of the order.
+            price (Optional[int]): The price of the order in ticks, the stop price of a stop-market order,
+                or None for a market order, which is valued at the opposite best price.
+            book (OrderBook): The order book of the instrument, for the best prices.
+            tick_size (float): The tick size of the instrument, to value orders in price units.
+            collar (bool): Whether the price collar applies, not to stops, whose price does not relate to the book.
+            replacing (Order): The open order the new order replaces, whose exposure is not counted.
+
+        Returns:
+            Optional[str]: Why the order is rejected, or None if it passes.
+        """
+        limits = self.limits.get(account, self.default_limits)
+        if limits is None:
+            return None
+
+        if limits.max_order_quantity is not None and quantity > limits.max_order_quantity:
+            return "order quantity exceeds the account limit"
+
+        buying = side == "buy"
+        if collar and limits.price_collar is not None and price is not None:
+            opposite, same = (book.asks, book.bids) if buying else (book.bids, book.asks)
+            level = opposite.best_level() or same.best_level()
+            if level is not None:
+                if buying and price > level.price * (1 + limits.price_collar):
+                    return "price is outside the price collar"
+                if not buying and price < level.price * (1 - limits.price_collar):
+                    return "price is outside the price collar"
+
+        if limits.max_open_notional is None and limits.max_position is None:
+            return None
+
+        exposure = self.exposure(symbol, account)
+        open_notional, open_buy, open_sell = exposure.open_notional, exposure.open_buy, exposure.open_sell
+        if replacing is not None:
+            open_notional -= replacing.quantity * replacing.price
+            if replacing.side == "buy":
+                open_buy -= replacing.quantity
+            else:
+                open_sell -= replacing.quantity
+
+        if limits.max_open_notional is not None:
+            value = price
+            if value is None:
+                level = (book.asks if buying else book.bids).best_level()
+                value = level.price if level is not None else None
+            if value is not None and (open_notional + quantity * value) * tick_size > limits.max_open_notional:
+                return "open notional exceeds the account limit"
+
+        if limits.max_position is not None:
+            if buying:
+                if exposure.position + open_buy + quantity > limits.max_position:
+                    return "position exceeds the account limit"
+            elif exposure.position - open_sell - quantity < -limits.max_position:
+                return "position exceeds the account limit"
+
+        return None
+
+    def on_open(self, symbol: str, order: Order) -> None:
+        """
+        Counts an order that rests in the book or waits in the stop book.
+
+        Args:
+            symbol (str): The symbol of the instrument.
+            order (Order): The order, with its open quantity.
+        """
+        exposure = self.exposure(symbol, order.account)
+        price = order.price if order.price is not None else order.stop_price
+        exposure.open_notional += order.quantity * price
+        if order.side == "buy":
+            exposure.open_buy += order.quantity
+        else:
+            exposure.open_sell += order.quantity
+
+    def on_close(self, symbol: str, order: Order, quantity: int) -> None:
+        """
+        Uncounts open quantity that leaves without trading: cancelled, expired, amended down or triggered.
+
+        Args:
+            symbol (str): The symbol of the instrument.
+            order (Order): The open order.
+            quantity (int): The quantity that leaves.
+        """
+        exposure = self.exposures[symbol][order.account]
+        price = order.price if order.price is not None else order.stop_price
+        exposure.open_notional -= quantity * price
+        if order.side == "buy":
+            exposure.open_buy -= quantity
+        else:
+            exposure.open_sell -= quantity
+
+    def on_fill(self, symbol: str, order: Order, quantity: int, resting: bool) -> None:
+        """
+        Counts a fill in the position of the order's account.
+
+        Args:
+            symbol (str): The symbol of the instrument.
+            order (Order): The order that traded.
+            quantity (int): The quantity that traded.
+            resting (bool): Whether the order was resting in the book, so the quantity is no longer open.
+        """
+        exposure = self.exposure(symbol, order.account)
+        if order.side == "buy":
+            exposure.position += quantity
+            if resting:
+                exposure.open_buy -= quantity
+                exposure.open_notional -= quantity * order.price
+        else:
+            exposure.position -= quantity
+            if resting:
+                exposure.open_sell -= quantity
+                exposure.open_notional -= quantity * order.price
+
+    def positions(self) -> Iterator[Tuple[str, str, int]]:
+        """
+        Lists the non-zero positions, to save them.
+
+        Returns:
+            Iterator[Tuple[str, str, int]]: (symbol, account, position) triples.
+        """
+        for symbol, accounts in self.exposures.items():
+            for account, exposure in accounts.items():
+                if exposure.position:
+                    yield symbol, account, exposure.position
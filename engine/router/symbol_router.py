@@ -0,0 +1,53 @@
+import zlib
+from typing import Dict
+
+
+class SymbolRouter:
+    """
+    Assigns symbols to MatchEngine shards.
+
+    Symbols listed in the assignments are pinned to their shard, every other symbol is placed by a
+    stable hash (CRC-32) of its name, so all processes agree on the placement without coordination.
+
+    Attributes:
+        num_shards (int): The number of MatchEngine shards.
+        assignments (Dict[str, int]): Symbols pinned to a specific shard.
+    """
+
+    def __init__(self, num_shards: int, assignments: Dict[str, int] = None):
+        """
+        Initialize a new SymbolRouter.
+
+        Args:
+            num_shards (int): The number of MatchEngine shards.
+            assignments (Dict[str, int]): Symbols pinned to a specific shard.
+
+        Raises:
+            ValueError: if there are no shards or an assignment is out of range.
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+
+        assignments = dict(assignments or {})
+        for symbol, shard in assignments.items():
+            if not 0 <= shard < num_shards:
+                raise ValueError(f"shard {shard} of {symbol} is out of range")
+
+        self.num_shards = num_shards
+        self.assignments = assignments
+
+    def shard_for(self, symbol: str) -> int:
+        """
+        Gets the shard that owns a symbol.
+
+        Args:
+            symbol (str): The symbol to route.
+
+        Returns:
+            int: The index of the shard.
+        """
+        shard = self.assignments.get(symbol)
+        if shard is None:
+            shard = zlib.crc32(symbol.encode("utf-8")) % self.num_shards
+            self.assignments[symbol] = shard
+        return shard
@@ -0,0 +1,157 @@
+import cProfile
+import collections
+import json
+import os
+import sys
+import threading
+import time
+from typing import Counter, Optional
+from .stage_timers import StageTimers
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class EngineProfiler:
+    """
+    Takes profiles of the matching process from the inside, for a window of time.
+
+    Two profilers are available:
+
+    - "cprofile": the deterministic cProfile profiler, saved in the pstats format (python -m pstats).
+    - "sample": a thread that samples the stack of the profiled thread every interval, saved as folded
+      stacks ("outer;inner count" lines, the input of flame graph tools). Samples are taken when the
+      profiled thread lets go of the GIL, so the effective rate is bounded by sys.getswitchinterval().
+
+    Alongside the profile, StageTimers time the stages of request processing, and their summary is
+    saved next to the profile with a .stages.json suffix.
+
+    Attributes:
+        mode (str): The profiler in use, None when no profile is being taken.
+        path (str): The file the current profile is saved to.
+        deadline (float): The time.monotonic() at which the current profile ends, or None.
+        interval (float): The sampling interval in seconds of the "sample" profiler.
+        timers (StageTimers): The stage timers of the current profile.
+        started (float): When the current profile started, as a time.monotonic() timestamp.
+        _profile (cProfile.Profile): The cProfile profiler, in "cprofile" mode.
+        _samples (Counter[str]): The number of samples of every folded stack, in "sample" mode.
+        _sampler (threading.Thread): The sampling thread, in "sample" mode.
+        _stop (threading.Event): Stops the sampling thread.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        """
+        Initialize a new, idle EngineProfiler.
+
+        Args:
+            interval (float): The sampling interval in seconds of the "sample" profiler.
+        """
+        self.mode: Optional[str] = None
+        self.path: Optional[str] = None
+        self.deadline: Optional[float] = None
+        self.interval = interval
+        self.timers: Optional[StageTimers] = None
+        self.started = 0.0
+        self._profile: Optional[cProfile.Profile] = None
+        self._samples: Counter[str] = collections.Counter()
+        self._sampler: Optional[threading.Thread] = None
+        self._stop: Optional[threading.Event] = None
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    def expired(self) -> bool:
+        """
+        Returns:
+            bool: True if the current profile has a deadline and it has passed.
+        """
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def start(self, mode: str, path: str, seconds: float = None) -> StageTimers:
+        """
+        Starts profiling the calling thread.
+
+        Args:
+            mode (str): The profiler to use, "cprofile" or "sample".
+            path (str): The file to save the profile to.
+            seconds (float): How long to profile for, or None to profile until stop is called.
+
+        Returns:
+            StageTimers: The stage timers of the profile, for the caller to install on the code to time.
+
+        Raises:
+            ValueError: if a profile is already being taken or the mode is unknown.
+        """
+        if self.active:
+            raise ValueError(f"a profile is already being taken to {self.path}")
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"unknown profile mode {mode}")
+
+        self.mode = mode
+        self.path = path
+        self.deadline = time.monotonic() + seconds if seconds is not None else None
+        self.timers = StageTimers()
+        self.started = time.monotonic()
+
+        if mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._samples.clear()
+            self._stop = threading.Event()
+            self._sampler = threading.Thread(target=self._sample, args=(threading.get_ident(),), name="engine-profiler", daemon=True)
+            self._sampler.start()
+
+        return self.timers
+
+    def stop(self) -> str:
+        """
+        Stops profiling and saves the profile and the stage timers.
+
+        Returns:
+            str: The path of the saved profile.
+
+        Raises:
+            ValueError: if no profile is being taken.
+        """
+        if not self.active:
+            raise ValueError("no profile is being taken")
+
+        elapsed = time.monotonic() - self.started
+        self.timers.uninstall()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if self.mode == "cprofile":
+            self._profile.disable()
+            self._profile.dump_stats(self.path)
+            self._profile = None
+            samples = None
+        else:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = self._stop = None
+            samples = sum(self._samples.values())
+            with open(self.path, "w") as stream:
+                for stack, count in self._samples.most_common():
+                    stream.write(f"{stack} {count}\n")
+
+        with open(self.path + ".stages.json", "w") as stream:
+            json.dump({"mode": self.mode, "seconds": elapsed, "samples": samples, "stages": self.timers.summary()}, stream, indent=2)
+
+        path = self.path
+        self.mode = self.path = self.deadline = self.timers = None
+        return path
+
+    def _sample(self, thread_id: int) -> None:
+        samples = self._samples
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                samples[";".join(reversed(stack))] += 1
@@ -0,0 +1,127 @@
+import json
+import time
+from typing import Dict, Tuple
+from .latency_histogram import LatencyHistogram
+
+# Stages of a request timed by the engine, in nanoseconds:
+#   wait     from dequeue to the start of processing (journaling, waiting for the rest of a batch)
+#   process  matching the request and emitting its events
+#   total    from dequeue until its events are handed to the message bus (a batch is published at its end)
+STAGES = ("wait", "process", "total")
+
+# Events counted under each counter name
+_COUNTED_EVENTS = {
+    "executions": ("ExecutionEvent",),
+    "cancels": ("OrderCancelEvent",),
+    "amends": ("OrderAmendedEvent",),
+    "rejects": ("OrderRejectedEvent",),
+    "triggers": ("OrderTriggeredEvent",),
+}
+
+
+class EngineStats:
+    """
+    Collects the latency histograms and counters of a MatchEngine.
+
+    Every request is timestamped when it is dequeued, when its processing starts and ends, and when its
+    events have been published. The stage latencies go into one LatencyHistogram per request type and
+    stage. Events are counted by type, and the depth of the request channel is sampled at every dequeue.
+
+    Attributes:
+        latency (Dict[str, Tuple[LatencyHistogram, ...]]): The histogram of every stage (see STAGES), keyed by request type.
+        requests (Dict[str, int]): The number of requests processed, keyed by request type.
+        events (Dict[str, int]): The number of events emitted, keyed by event type.
+        queue_depth (int): The number of requests waiting in the channel at the last dequeue.
+        max_queue_depth (int): The largest queue_depth seen.
+        started (float): When collection started, as a time.time() timestamp.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new, empty EngineStats.
+        """
+        self.latency: Dict[str, Tuple[LatencyHistogram, ...]] = {}
+        self.requests: Dict[str, int] = {}
+        self.events: Dict[str, int] = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.started = time.time()
+
+    def record_request(self, request, dequeued: int, started: int, finished: int, published: int) -> None:
+        """
+        Records the timestamps of one processed request.
+
+        Args:
+            request: The request.
+            dequeued (int): When the request was taken off the channel, in time.perf_counter_ns() nanoseconds.
+            started (int): When its processing started.
+            finished (int): When its processing finished.
+            published (int): When its events were handed to the message bus.
+        """
+        name = type(request).__name__
+        histograms = self.latency.get(name)
+        if histograms is None:
+            histograms = self.latency[name] = tuple(LatencyHistogram() for _ in STAGES)
+        wait, process, total = histograms
+        wait.record(started - dequeued)
+        process.record(finished - started)
+        total.record(published - dequeued)
+        self.requests[name] = self.requests.get(name, 0) + 1
+
+    def record_event(self, event) -> None:
+        """
+        Counts one emitted event.
+
+        Args:
+            event: The event.
+        """
+        name = type(event).__name__
+        self.events[name] = self.events.get(name, 0) + 1
+
+    def record_queue_depth(self, depth: int) -> None:
+        """
+        Records the number of requests waiting in the channel.
+
+        Args:
+            depth (int): The number of waiting requests.
+        """
+        self.queue_depth = depth
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def summary(self) -> Dict:
+        """
+        Summarizes the statistics.
+
+        Returns:
+            Dict: The uptime in seconds, the counters (orders, executions, cancels, amends, rejects, triggers), the
+            requests and events by type, the last and largest queue depth, and the latency summary of every
+            request type and stage in nanoseconds (see LatencyHistogram.summary).
+        """
+        counters = {"orders": self.requests.get("AddOrderRequest", 0)}
+        for counter, names in _COUNTED_EVENTS.items():
+            counters[counter] = sum(self.events.get(name, 0) for name in names)
+
+        return {
+            "uptime": time.time() - self.started,
+            "counters": counters,
+            "requests": dict(self.requests),
+            "events": dict(self.events),
+            "queue_depth": {"last": self.queue_depth, "max": self.max_queue_depth},
+            "latency_ns": {
+                name: {stage: histogram.summary() for stage, histogram in zip(STAGES, histograms)}
+                for name, histograms in self.latency.items()
+            },
+        }
+
+    @staticmethod
+    def dump(summary: Dict, path: str) -> None:
+        """
+        Writes a summary to a JSON file.
+
+        Args:
+            summary (Dict): The summary to write.
+            path (str): The path of the file, replaced if it exists.
+        """
+        with open(path, "w") as stream:
+            json.dump(summary, stream, indent=2)
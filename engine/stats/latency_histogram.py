@@ -0,0 +1,137 @@
+from typing import Dict, List
+
+# Values are counted in log-linear buckets: every power of two is split into 2 ** _SUB_BITS buckets, so
+# a bucket is at most 1/8 (12.5%) wide relative to its values, whatever their magnitude.
+_SUB_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BITS
+_BUCKETS = _SUB_BUCKETS * 62
+
+
+class LatencyHistogram:
+    """
+    Represents a histogram of latencies in nanoseconds with constant relative precision.
+
+    Recording a value is a couple of integer operations and a list increment, so the histogram can
+    sit on a hot path. Percentiles are read back from the buckets as the middle of their bucket, within
+    about 6% of the exact value, while the minimum, maximum and mean are exact.
+
+    Attributes:
+        counts (List[int]): The number of values recorded in each bucket.
+        count (int): The number of values recorded.
+        total (int): The sum of the values recorded.
+        min (int): The smallest value recorded.
+        max (int): The largest value recorded.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new, empty LatencyHistogram.
+        """
+        self.counts: List[int] = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket_of(value: int) -> int:
+        """
+        Gets the bucket of a value.
+
+        Args:
+            value (int): A non-negative value.
+
+        Returns:
+            int: The index of the bucket holding the value.
+        """
+        if value < _SUB_BUCKETS:
+            return value
+        exponent = value.bit_length() - 1
+        return _SUB_BUCKETS * (exponent - _SUB_BITS + 1) + ((value >> (exponent - _SUB_BITS)) & (_SUB_BUCKETS - 1))
+
+    @staticmethod
+    def lowest_of(bucket: int) -> int:
+        """
+        Gets the smallest value of a bucket.
+
+        Args:
+            bucket (int): The index of the bucket.
+
+        Returns:
+            int: The smallest value counted in the bucket.
+        """
+        if bucket < _SUB_BUCKETS:
+            return bucket
+        exponent = bucket // _SUB_BUCKETS + _SUB_BITS - 1
+        return (_SUB_BUCKETS + bucket % _SUB_BUCKETS) << (exponent - _SUB_BITS)
+
+    def record(self, value: int) -> None:
+        """
+        Records one value.
+
+        Args:
+            value (int): The latency in nanoseconds, negative values count as 0.
+        """
+        if value < 0:
+            value = 0
+        self.counts[self.bucket_of(value)] += 1
+        if self.count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Adds the values of another histogram to this one.
+
+        Args:
+            other (LatencyHistogram): The histogram to merge.
+        """
+        if other.count == 0:
+            return
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, percent: float) -> int:
+        """
+        Gets the value below which a given percentage of the recorded values fall.
+
+        Args:
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+            int: The middle of the bucket holding the percentile, kept within the exact minimum and maximum.
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                middle = (self.lowest_of(bucket) + self.lowest_of(bucket + 1) - 1) // 2
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarizes the histogram.
+
+        Returns:
+            Dict[str, float]: The count, and the min, mean, p50, p90, p99, p99.9 and max latencies in nanoseconds.
+        """
+        return {
+            "count": self.count,
+            "min": self.min,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "p99.9": self.percentile(99.9),
+            "max": self.max,
+        }
@@ -1,6 +1,7 @@
 """
 main.py: A driver program used to test the matching engine
 """
+import json
 import time
 import random
 import sys
@@ -9,23 +10,39 @@ from typing import Union, Any, List
 # requests
 from engine.requests.add_order_request import AddOrderRequest
 from engine.requests.cancel_order_request import CancelOrderRequest
+from engine.requests.amend_order_request import AmendOrderRequest
 from engine.requests.order_book_snapshot_request import OrderBookSnapshotRequest
+from engine.requests.engine_stats_request import EngineStatsRequest
 from engine.match_engine.match_engine import MatchEngine
+from engine.instruments.instrument import Instrument
 from engine.message_bus.message_bus import MessageBus
+from engine.message_bus.binary_codec import BinaryCodec
+from engine.replay.replay_driver import ReplayDriver
+from engine.replay.request_reader import RequestReader
+from engine.gateway.order_gateway import OrderGateway
 # events
-from engine.events.trade_event import TradeEvent
-from engine.events.order_fully_filled import OrderFullyFilled
-from engine.events.order_partially_filled import OrderPartiallyFilled
+from engine.events.execution_event import ExecutionEvent
 from engine.events.order_book_snapshot import OrderBookSnapshot
+from engine.events.depth_update import DepthUpdate
 from engine.events.order_cancel_event import OrderCancelEvent
+from engine.events.order_triggered_event import OrderTriggeredEvent
+from engine.events.order_amended_event import OrderAmendedEvent
+from engine.events.order_rejected_event import OrderRejectedEvent
+from engine.events.event_batch import EventBatch
+from engine.events.engine_stats_event import EngineStatsEvent
+from engine.events.profile_event import ProfileEvent
 
 class Driver:
 
-    def __init__(self, delay: int=1):
+    def __init__(self, delay: int=1, batch_size: int=1, codec: str=None, transport: str="queue", stats: bool=False):
         self.delay = delay
-        self.message_bus = MessageBus()
-        self.match_engine = MatchEngine(self.message_bus)
+        self.stats = stats
+        self.message_bus = MessageBus(codec=BinaryCodec() if codec == "binary" else None, transport=transport)
+        self.instrument = Instrument(symbol="DEFAULT", tick_size=0.01)
+        self.match_engine = MatchEngine(self.message_bus, self.instrument, batch_size=batch_size, stats=stats)
         self.match_engine.start()
+        # The engine rejects reused order_ids, random orders are numbered after the spec sheet's
+        self.last_order_id = 9
 
     def generate_initial_requests(self) -> List[Any]:
         """
@@ -64,7 +81,9 @@ class Driver:
             side = random.choice(["buy", "sell"])
             quantity = random.randint(1, max_quantity)
             price = random.uniform(1.0, max_price) if side == "buy" else random.uniform(max_price, max_price * 2)
-            order = AddOrderRequest(order_id=random.randint(1, 1000), side=side, quantity=quantity, price=price)
+            price = self.instrument.to_price(round(price / self.instrument.tick_size))
+            self.last_order_id += 1
+            order = AddOrderRequest(order_id=self.last_order_id, side=side, quantity=quantity, price=price)
             self.message_bus.publish("request", order)
 
 
@@ -85,6 +104,11 @@ class Driver:
 
         print("testing an aggressive buy order")
 
+        # Finish with a snapshot of the book, the depth updates show every change before it
+        requests.append(OrderBookSnapshotRequest())
+        if self.stats:
+            requests.append(EngineStatsRequest())
+
         # subscribe to the events channel
         responses = self.message_bus.subscribe("event")       
 
@@ -98,7 +122,6 @@ class Driver:
             except IndexError: 
                 pass
 
-            self.message_bus.publish("request", OrderBookSnapshotRequest())
             response = responses.get()
             self.print_event(response)
             time.sleep(self.delay)
@@ -120,6 +143,11 @@ class Driver:
 
         print("testing an aggressive buy order")
 
+        # Finish with a snapshot of the book, the depth updates show every change before it
+        requests.append(OrderBookSnapshotRequest())
+        if self.stats:
+            requests.append(EngineStatsRequest())
+
         # subscribe to the events channel
         responses = self.message_bus.subscribe("event")       
 
@@ -133,7 +161,6 @@ class Driver:
             except IndexError: 
                 pass
 
-            self.message_bus.publish("request", OrderBookSnapshotRequest())
             response = responses.get()
             self.print_event(response)
             time.sleep(self.delay)
@@ -157,6 +184,50 @@ class Driver:
                 CancelOrderRequest(order_id=3, side="sell", quantity=2, price=1025.0)
             )
 
+        # Finish with a snapshot of the book, the depth updates show every change before it
+        requests.append(OrderBookSnapshotRequest())
+        if self.stats:
+            requests.append(EngineStatsRequest())
+
+        # Subscribe to the events channel
+        responses = self.message_bus.subscribe("event")       
+
+        # Get responses
+        while True: 
+            
+            try: 
+                order = requests.pop(0)
+                self.message_bus.publish("request", order)
+
+            except IndexError: 
+                pass
+
+            response = responses.get()
+            self.print_event(response)
+            time.sleep(self.delay)
+
+    def test_amend_order(self, side: str) -> None:
+        """
+        Simulate an amendment of a resting order: a quantity reduction in place followed by a price change.
+
+        Returns:
+            None
+        """
+
+        requests = self.generate_initial_requests()
+
+        if side == "buy":
+            requests.append(AmendOrderRequest(order_id=5, side="buy", quantity=4))
+            requests.append(AmendOrderRequest(order_id=5, side="buy", quantity=4, price=1025.0))
+        elif side == "sell":
+            requests.append(AmendOrderRequest(order_id=2, side="sell", quantity=5))
+            requests.append(AmendOrderRequest(order_id=2, side="sell", quantity=5, price=1000.0))
+
+        # Finish with a snapshot of the book, the depth updates show every change before it
+        requests.append(OrderBookSnapshotRequest())
+        if self.stats:
+            requests.append(EngineStatsRequest())
+
         # Subscribe to the events channel
         responses = self.message_bus.subscribe("event")       
 
@@ -170,33 +241,51 @@ class Driver:
             except IndexError: 
                 pass
 
-            self.message_bus.publish("request", OrderBookSnapshotRequest())
             response = responses.get()
             self.print_event(response)
             time.sleep(self.delay)
 
-    def print_event(self, message: Union[TradeEvent, OrderPartiallyFilled, OrderFullyFilled, OrderBookSnapshot]) -> None:
+    def print_event(self, message: Union[ExecutionEvent, OrderCancelEvent, OrderBookSnapshot]) -> None:
         """
         Prints the message coming from the event bus in a readable format.
 
         Args:
-            message (Union[TradeEvent, OrderPartiallyFilled, OrderFullyFilled, OrderBookSnapshot]):
+            message (Union[ExecutionEvent, OrderCancelEvent, OrderBookSnapshot, DepthUpdate]):
                 The message type to print from the message_bus event channel.
 
         Returns:
             None
         """
         
-        if isinstance(message, TradeEvent):
-            print(f"[TRADE] price: {message.price}, quantity: {message.quantity})")
-        if isinstance(message, OrderCancelEvent):
-            print(f"[CANCEL] order_id: {message.order_id}, side: {message.side}, quantity: {message.quantity}, price: {message.price})")
-        elif isinstance(message, OrderPartiallyFilled):
-            print(f"[PARTIAL_FILL] order_id({message.order_id}, remaining_quantity: {message.remaining_quantity}")
-        elif isinstance(message, OrderFullyFilled):
-            print(f"[FULL_FILL]: order_id {message.order_id}")
+        if isinstance(message, ExecutionEvent):
+            print(f"[EXECUTION] #{message.sequence} aggressor: {message.aggressor_id} ({message.aggressor_remaining} left), resting: {message.resting_id} ({message.resting_remaining} left), price: {self.instrument.to_price(message.price)}, quantity: {message.quantity}")
+        elif isinstance(message, OrderCancelEvent):
+            price = self.instrument.to_price(message.price) if message.price is not None else "market"
+            print(f"[CANCEL] order_id: {message.order_id}, side: {message.side}, quantity: {message.quantity}, price: {price}, reason: {message.reason})")
+        elif isinstance(message, OrderTriggeredEvent):
+            price = self.instrument.to_price(message.price) if message.price is not None else "market"
+            print(f"[TRIGGER] order_id: {message.order_id}, side: {message.side}, quantity: {message.quantity}, price: {price}, stop_price: {self.instrument.to_price(message.stop_price)})")
+        elif isinstance(message, OrderAmendedEvent):
+            print(f"[AMEND] order_id: {message.order_id}, side: {message.side}, quantity: {message.quantity}, price: {self.instrument.to_price(message.price)})")
+        elif isinstance(message, OrderRejectedEvent):
+            print(f"[REJECT] order_id: {message.order_id}, reason: {message.reason}")
+        elif isinstance(message, DepthUpdate):
+            print(f"[DEPTH] #{message.sequence} {message.side} price: {self.instrument.to_price(message.price)}, quantity: {message.quantity}")
         elif isinstance(message, OrderBookSnapshot):
-            print(f"[BOOK_SNAPSHOT]: \n{message.snapshot}")
+            print(f"[BOOK_SNAPSHOT] #{message.sequence}:")
+            for price, quantity in reversed(message.asks):
+                print(f"S\t{self.instrument.to_price(price)}\t{quantity}")
+            print()
+            for price, quantity in message.bids:
+                print(f"B\t{self.instrument.to_price(price)}\t{quantity}")
+        elif isinstance(message, EngineStatsEvent):
+            print(f"[ENGINE_STATS] shard {message.shard}:")
+            print(json.dumps(message.stats, indent=2))
+        elif isinstance(message, ProfileEvent):
+            print(f"[PROFILE] {message.status}: {message.path}")
+        elif isinstance(message, EventBatch):
+            for event in message.events:
+                self.print_event(event)
         else: 
             raise TypeError("incorrect message type")
 
@@ -212,11 +301,20 @@ def main() -> None:
 
     parser = argparse.ArgumentParser(description="Driver program for Matching Engine. \nRun 'python3 main.py --test buy_partial' for base example")
     
-    tests = "buy_partial | buy_full | sell_partial | sell_full | cancel_buy | cancel_sell" 
+    tests = "buy_partial | buy_full | sell_partial | sell_full | cancel_buy | cancel_sell | amend_buy | amend_sell" 
 
     # Add your arguments here
     parser.add_argument("--test", type=str, help=f"The type of test to run [ {tests} ]")
-    parser.add_argument("--delay", type=str, help="The delay in seconds between event and requests parses (this does not block the actual MatchEngine class)")
+    parser.add_argument("--delay", type=float, help="The delay in seconds between event and requests parses (this does not block the actual MatchEngine class)")
+    parser.add_argument("--codec", type=str, choices=["binary"], help="Encode messages on the message bus with a binary codec instead of pickling them")
+    parser.add_argument("--transport", type=str, default="queue", choices=["queue", "shared_memory"], help="The message bus transport between the Driver and the MatchEngine")
+    parser.add_argument("--batch-size", type=int, default=1, help="The maximum number of requests the MatchEngine processes per batch")
+    parser.add_argument("--stats", action="store_true", help="Collect latency histograms and counters in the MatchEngine and print them after the test")
+    parser.add_argument("--gateway", type=str, help="Run a MatchEngine behind an order entry gateway listening on HOST:PORT, or on a Unix socket path")
+    parser.add_argument("--replay", type=str, help="Replay a request file (.jsonl, .journal or binary frames) through the MatchEngine and report its throughput")
+    parser.add_argument("--output", type=str, help="With --replay, the file to write the emitted events to (.jsonl or binary frames)")
+    parser.add_argument("--pace", type=str, default="max", choices=["max", "recorded"], help="With --replay, replay as fast as possible or at the recorded timestamps")
+    parser.add_argument("--symbols", type=str, default="DEFAULT", help="With --replay or --gateway, comma separated symbols of the instruments")
 
     args = parser.parse_args()
 
@@ -224,7 +322,7 @@ def main() -> None:
         
         delay = args.delay if args.delay is not None else 1
         # insantiate the driver
-        driver = Driver(delay)
+        driver = Driver(delay, args.batch_size, args.codec, args.transport, args.stats)
 
         # grab the argument for test type
         test_type = args.test
@@ -241,6 +339,30 @@ def main() -> None:
             driver.test_cancel_order(side="buy")
         elif test_type == "cancel_sell":
             driver.test_cancel_order(side="sell")
+        elif test_type == "amend_buy":
+            driver.test_amend_order(side="buy")
+        elif test_type == "amend_sell":
+            driver.test_amend_order(side="sell")
+    elif args.gateway is not None:
+        instruments = [Instrument(symbol=symbol, tick_size=0.01) for symbol in args.symbols.split(",")]
+        message_bus = MessageBus(codec=BinaryCodec() if args.codec == "binary" else None, transport=args.transport, default_subscription=False)
+        host, _, port = args.gateway.rpartition(":")
+        if port.isdigit():
+            gateway = OrderGateway(message_bus, host=host or "127.0.0.1", port=int(port), symbols=args.symbols.split(","))
+        else:
+            gateway = OrderGateway(message_bus, unix_path=args.gateway, symbols=args.symbols.split(","))
+        match_engine = MatchEngine(message_bus, instruments=instruments, batch_size=args.batch_size, stats=args.stats)
+        match_engine.start()
+        gateway.start()
+        print(f"gateway listening on {args.gateway}")
+        gateway.join()
+    elif args.replay is not None:
+        instruments = [Instrument(symbol=symbol, tick_size=0.01) for symbol in args.symbols.split(",")]
+        replay_driver = ReplayDriver(instruments, output=args.output, pace=args.pace)
+        report = replay_driver.run(RequestReader(args.replay))
+
+        print(f"{report['messages']} messages, {report['events']} events in {report['seconds']:.3f} s: {report['messages_per_second']:,.0f} messages/s")
+        print("latency (us): " + ", ".join(f"{name} {value / 1000:.2f}" for name, value in report["latency_ns"].items() if name != "count"))
     else:
         parser.print_help(sys.stderr)
 